@@ -0,0 +1,146 @@
+"""
+Check that in-page extraction matches the BeautifulSoup extractor.
+
+Loads archived tutorial pages into a headless browser, runs the in-page
+extractor (scraper/extract_tutorial.js) on them, and compares the result field
+by field with ContentExtractor.extract_tutorial on the same HTML.
+
+The content field is compared as normalized text, since Chromium and
+BeautifulSoup serialize the same markup slightly differently.
+
+Usage:
+    uv run python check_extraction_parity.py --vault-dir ./vault --limit 50
+"""
+
+import asyncio
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import click
+from playwright.async_api import async_playwright
+from rich.console import Console
+from rich.table import Table
+
+from scraper.archive import PageArchive
+from scraper.extractor import IN_PAGE_EXTRACTOR, ContentExtractor, normalize_content
+
+console = Console()
+
+
+def compare(expected: dict, actual: dict) -> list:
+    """
+    Compare two extractions.
+
+    Args:
+        expected: BeautifulSoup extraction as a dict
+        actual: In-page extraction as a dict
+
+    Returns:
+        List of (field, expected, actual) tuples for fields that differ
+    """
+    differences = []
+    for field_name, value in expected.items():
+        other = actual.get(field_name)
+        if field_name == "content":
+            value, other = normalize_content(value), normalize_content(other or "")
+        if value != other:
+            differences.append((field_name, value, other))
+    return differences
+
+
+def shorten(value, width: int = 80) -> str:
+    """Render a value for the report, truncated to a width."""
+    text = repr(value)
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+async def check_parity(vault_dir: Path, limit: int, show_diffs: bool) -> int:
+    """
+    Run both extractors on archived pages and report mismatches.
+
+    Args:
+        vault_dir: Vault whose page archive to read
+        limit: Maximum number of pages to check (0 for all)
+        show_diffs: Print the differing values, not just the field names
+
+    Returns:
+        Number of pages whose extractions differ
+    """
+    archive_dir = vault_dir / "_metadata" / "archive"
+    if not archive_dir.exists():
+        console.print(f"[red]No page archive at {archive_dir}; run the scraper with --archive first[/red]")
+        return 0
+
+    archive = PageArchive(archive_dir)
+    extractor = ContentExtractor()
+    urls = sorted(archive.urls())
+    if limit:
+        urls = urls[:limit]
+
+    field_mismatches = {}
+    mismatched_pages = 0
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        # Page scripts stay off so the DOM is exactly the archived markup
+        context = await browser.new_context(java_script_enabled=False)
+        await context.route("**/*", lambda route: route.abort())
+        page = await context.new_page()
+
+        for url in urls:
+            record = archive.latest(url)
+            html = archive.read(record)
+
+            expected = asdict(extractor.extract_tutorial(html, url))
+            await page.set_content(html, wait_until="domcontentloaded")
+            data = await page.evaluate(IN_PAGE_EXTRACTOR)
+            actual = asdict(extractor.from_page_data(data, url))
+
+            differences = compare(expected, actual)
+            if not differences:
+                continue
+
+            mismatched_pages += 1
+            console.print(f"[yellow]Mismatch:[/yellow] {url}")
+            for field_name, value, other in differences:
+                field_mismatches[field_name] = field_mismatches.get(field_name, 0) + 1
+                if show_diffs:
+                    console.print(f"  {field_name}:")
+                    console.print(f"    html:    {shorten(value)}")
+                    console.print(f"    in-page: {shorten(other)}")
+
+        await browser.close()
+    archive.close()
+
+    table = Table(title=f"Extraction parity ({len(urls)} pages)")
+    table.add_column("Field")
+    table.add_column("Pages differing", justify="right")
+    for field_name, count in sorted(field_mismatches.items()):
+        table.add_row(field_name, str(count))
+    console.print(table)
+
+    if mismatched_pages:
+        console.print(f"[red]{mismatched_pages} of {len(urls)} pages differ[/red]")
+    else:
+        console.print(f"[green]All {len(urls)} pages match[/green]")
+    return mismatched_pages
+
+
+@click.command()
+@click.option(
+    "--vault-dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=Path("./vault"),
+    help="Vault directory containing the page archive (default: ./vault)",
+)
+@click.option("--limit", type=int, default=0, help="Maximum number of archived pages to check (default: all)")
+@click.option("--show-diffs", is_flag=True, help="Print differing values for each mismatched field")
+def main(vault_dir: Path, limit: int, show_diffs: bool):
+    """Compare in-page extraction with the BeautifulSoup extractor on archived pages."""
+    mismatched = asyncio.run(check_parity(vault_dir, limit, show_diffs))
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
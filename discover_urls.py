@@ -0,0 +1,144 @@
+"""
+Discover every guide and tutorial URL and write a URL manifest.
+
+Reads the site's XML sitemaps when it has them, otherwise every page of the
+guide and tutorial search listings, then every guide page for its ordered
+tutorials. Requests are plain HTTP through a browser context (so exported
+cookies and Cloudflare clearance apply) and run concurrently within the
+request-rate budget. The output has the same shape as the manifest written by
+extract_urls.js, so it can be passed straight to `main.py --urls-file`.
+
+Usage:
+    uv run python discover_urls.py --output drupalize_urls.json
+    uv run python discover_urls.py --listings-only --max-rps 2
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+import click
+from rich.console import Console
+
+from scraper.browser import BrowserSession
+from scraper.discovery import DISCOVERY_CONCURRENCY, SiteDiscovery, http_fetcher
+from scraper.ratelimit import AIMDController, TokenBucket
+
+console = Console()
+
+
+def log_decision(message: str):
+    """Print a concurrency decision."""
+    console.print(f"[dim]{message}[/dim]")
+
+
+async def discover(
+    base_url: str,
+    output: Path,
+    cookies_file: Optional[Path],
+    cdp_url: Optional[str],
+    max_rps: float,
+    concurrency: int,
+    use_sitemap: bool,
+) -> dict:
+    """
+    Run discovery and write the manifest.
+
+    Args:
+        base_url: Site base URL
+        output: Manifest path
+        cookies_file: Optional cookies to import into the browser context
+        cdp_url: Optional CDP URL of a running Chrome to reuse
+        max_rps: Request-rate budget
+        concurrency: Ceiling on concurrent requests
+        use_sitemap: Try the XML sitemaps before the search listings
+
+    Returns:
+        The manifest
+    """
+    control = AIMDController("discovery", ceiling=concurrency, log=log_decision)
+    async with BrowserSession(cookies_file=cookies_file, cdp_url=cdp_url) as browser:
+        await browser.open_pages(1)
+
+        async def render(url: str):
+            async with browser.page_slot() as page:
+                return await browser.render(url, page=page)
+
+        discovery = SiteDiscovery(
+            base_url,
+            http_fetcher(browser, TokenBucket(max_rps), control),
+            render=render,
+            use_sitemap=use_sitemap,
+            console=console,
+        )
+        manifest = await discovery.discover()
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    console.print(f"[green]Discovery: {discovery.summary(manifest)}[/green]")
+    console.print(f"Concurrency: {control.summary()}")
+    for error in manifest["errors"]:
+        console.print(f"[yellow]  {error['type']}: {error['url']}: {error['error']}[/yellow]")
+    console.print(f"[green]Wrote {output}[/green]")
+    return manifest
+
+
+@click.command()
+@click.option(
+    "--output",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=Path("drupalize_urls.json"),
+    help="Manifest to write (default: drupalize_urls.json)",
+)
+@click.option(
+    "--base-url",
+    default="https://drupalize.me",
+    help="Base URL of Drupalize.me (default: https://drupalize.me)",
+)
+@click.option(
+    "--cookies-file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to JSON file with cookies to import (export from your browser)",
+)
+@click.option(
+    "--cdp-url",
+    default=None,
+    help="Connect to existing Chrome via CDP (e.g., http://localhost:9222)",
+)
+@click.option(
+    "--max-rps",
+    type=click.FloatRange(min=0, min_open=True),
+    default=5.0,
+    help="Maximum requests per second (default: 5)",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DISCOVERY_CONCURRENCY,
+    help=f"Maximum concurrent requests (default: {DISCOVERY_CONCURRENCY})",
+)
+@click.option(
+    "--sitemap/--listings-only",
+    default=True,
+    help="Use the XML sitemaps when available, or always read the search listings (default: sitemap)",
+)
+def main(
+    output: Path,
+    base_url: str,
+    cookies_file: Optional[Path],
+    cdp_url: Optional[str],
+    max_rps: float,
+    concurrency: int,
+    sitemap: bool,
+):
+    """Discover all guide and tutorial URLs into a drupalize_urls.json manifest."""
+    manifest = asyncio.run(discover(base_url, output, cookies_file, cdp_url, max_rps, concurrency, sitemap))
+    sys.exit(1 if not manifest["guides"] and not manifest["tutorials"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,8 +29,9 @@ async function loadUrlsFile() {
 (async function extractDrupalizeContent() {
     console.log('📂 Please select your drupalize_urls.json file...');
     const urlsData = await loadUrlsFile();
+    const tutorials = canonicalTutorials(urlsData);
     
-    console.log(`📚 Loaded ${urlsData.tutorials.length} tutorials to extract`);
+    console.log(`📚 Loaded ${urlsData.tutorials.length} tutorial links, ${tutorials.length} unique tutorials to extract`);
     
     const delay = (ms) => new Promise(resolve => setTimeout(resolve, ms));
     
@@ -42,9 +43,9 @@ async function loadUrlsFile() {
     const BATCH_SIZE = 50; // Save every 50 tutorials
     let batchNum = 0;
     
-    for (let i = 0; i < urlsData.tutorials.length; i++) {
-        const tutorial = urlsData.tutorials[i];
-        console.log(`[${i + 1}/${urlsData.tutorials.length}] ${tutorial.title}`);
+    for (let i = 0; i < tutorials.length; i++) {
+        const tutorial = tutorials[i];
+        console.log(`[${i + 1}/${tutorials.length}] ${tutorial.title}`);
         
         try {
             const response = await fetch(tutorial.url);
@@ -58,6 +59,7 @@ async function loadUrlsFile() {
                 title: tutorial.title,
                 guide: tutorial.guide,
                 guideUrl: tutorial.guideUrl,
+                guides: tutorial.guides,
                 extractedHtml: '',
                 videos: [],
                 images: [],
@@ -142,6 +144,75 @@ async function loadUrlsFile() {
     console.log('🎉 Extraction complete!');
 })();
 
+// Guide pages link tutorials with ?p=<guide>, so the same tutorial appears under
+// a different URL in every guide it belongs to
+function canonicalUrl(url) {
+    const parsed = new URL(url);
+    parsed.searchParams.delete('p');
+    parsed.hash = '';
+    return parsed.toString();
+}
+
+// Guide pages link a tutorial twice: a thumbnail link (?p=0) titled with the URL
+// slug, then the real entry in the guide's list (same rule as Frontier._has_real_title)
+function hasRealTitle(link) {
+    const title = link.title || '';
+    const slug = new URL(link.url).pathname.replace(/\/+$/, '').split('/').pop();
+    return title !== '' && title !== slug && !title.startsWith(slug + '?');
+}
+
+// One entry per tutorial in a guide's listing: a real title beats a slug title,
+// otherwise the later entry wins (same rule as Frontier._guide_listing)
+function guideListing(links) {
+    const kept = new Map();
+    links.forEach((link, index) => {
+        const entry = { ...link, position: link.position ?? index };
+        const key = canonicalUrl(link.url);
+        const current = kept.get(key);
+        if (!current || hasRealTitle(entry) || !hasRealTitle(current)) {
+            kept.set(key, entry);
+        }
+    });
+    return Array.from(kept.values()).sort((a, b) => a.position - b.position);
+}
+
+// One entry per tutorial, remembering every guide it belongs to and its order there
+function canonicalTutorials(urlsData) {
+    const byUrl = new Map();
+    const realTitles = new Set();
+    const add = (link, guide, guideUrl) => {
+        const url = canonicalUrl(link.url);
+        const tutorial = byUrl.get(url);
+        if (!tutorial) {
+            byUrl.set(url, {
+                url,
+                title: (link.title || '').replace(/\?p=\d*$/, ''),
+                guide,
+                guideUrl,
+                guides: []
+            });
+        } else if (hasRealTitle(link) && !realTitles.has(url)) {
+            tutorial.title = link.title;
+        }
+        if (hasRealTitle(link)) {
+            realTitles.add(url);
+        }
+        return byUrl.get(url);
+    };
+    
+    (urlsData.guides || []).forEach(guide => {
+        guideListing(guide.tutorials || []).forEach(link => {
+            const tutorial = add(link, guide.title, guide.url);
+            if (!tutorial.guides.some(g => g.guideUrl === guide.url)) {
+                tutorial.guides.push({ guide: guide.title, guideUrl: guide.url, order: link.position + 1 });
+            }
+        });
+    });
+    (urlsData.tutorials || []).forEach(link => add(link, link.guide, link.guideUrl));
+    
+    return Array.from(byUrl.values());
+}
+
 function saveBatch(tutorials, batchNum) {
     const data = {
         batch: batchNum,
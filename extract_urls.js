@@ -76,6 +76,7 @@
     
     // Step 2: For each guide, get all tutorial URLs
     console.log('📖 Fetching tutorials from each guide...');
+    const seenTutorials = new Set();
     
     for (let i = 0; i < results.guides.length; i++) {
         const guide = results.guides[i];
@@ -91,6 +92,7 @@
             // Note: URLs use /tutorial/ (singular), not /tutorials/
             const tutorialLinks = doc.querySelectorAll('a[href*="/tutorial/"]');
             guide.tutorials = [];
+            const guideUrls = new Set();
             
             tutorialLinks.forEach(link => {
                 const href = link.getAttribute('href');
@@ -98,15 +100,18 @@
                     const fullUrl = href.startsWith('http') ? href : `https://drupalize.me${href}`;
                     const title = link.textContent.trim();
                     
-                    // Avoid duplicates
-                    if (!guide.tutorials.some(t => t.url === fullUrl)) {
+                    // Avoid duplicates (links come in document order, so the first one is the guide position)
+                    if (!guideUrls.has(fullUrl)) {
+                        guideUrls.add(fullUrl);
                         guide.tutorials.push({
                             url: fullUrl,
-                            title: title || href.split('/').pop()
+                            title: title || href.split('/').pop(),
+                            position: guide.tutorials.length
                         });
                         
                         // Also add to flat tutorials list if not already there
-                        if (!results.tutorials.some(t => t.url === fullUrl)) {
+                        if (!seenTutorials.has(fullUrl)) {
+                            seenTutorials.add(fullUrl);
                             results.tutorials.push({
                                 url: fullUrl,
                                 title: title,
@@ -5,7 +5,11 @@ The issue: slugs generated from URLs don't always match actual filenames.
 Solution: Read actual files, extract their URLs, and build a proper mapping.
 
 Also rebuilds guide/tutorial ordering based on `drupalize_urls.json` (URL-only data),
-since extraction batch order does not match guide order.
+since extraction batch order does not match guide order. Vaults built by the
+scraper, or by process_extracted.py from the current extract_content.js output,
+don't need this pass: their notes already carry a top-level `order:` (the
+scraper writes the order in the tutorial's primary guide there, and every
+guide's order under `guides:`).
 
 Usage:
     uv run python fix_links.py --vault-dir ./vault --urls-file ./drupalize_urls.json
@@ -0,0 +1,52 @@
+"""
+Import a vault's progress.json into the SQLite progress backend.
+
+Vaults scraped before the SQLite backend existed keep their progress in
+_metadata/progress.json. This copies it into _metadata/progress.sqlite, after
+which `main.py` picks the SQLite backend automatically. Importing is
+idempotent: completed tutorials already in the database are kept, and
+progress.json is left in place.
+
+Usage:
+    uv run python import_progress.py --vault-dir ./vault
+"""
+
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from scraper.progress import SQLiteProgress
+
+console = Console()
+
+
+@click.command()
+@click.option(
+    "--vault-dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=Path("vault"),
+    help="Vault whose progress to import (default: ./vault)",
+)
+def main(vault_dir: Path):
+    """Import progress.json into progress.sqlite."""
+    metadata_dir = vault_dir / "_metadata"
+    progress_file = metadata_dir / "progress.json"
+    if not progress_file.exists():
+        console.print(f"[red]No progress file at {progress_file}[/red]")
+        sys.exit(1)
+
+    progress = SQLiteProgress(metadata_dir)
+    added = progress.import_json(progress_file)
+    imported = progress.load()
+    progress.close()
+
+    console.print(f"[green]Imported {added} completed tutorials into {progress.db_path}[/green]")
+    console.print(f"  Completed guides: {len(imported['completed_guides'])}")
+    console.print(f"  Completed tutorials: {len(imported['completed_tutorials'])}")
+    console.print(f"  Failed tutorials: {len(imported['failed_tutorials'])}")
+
+
+if __name__ == "__main__":
+    main()
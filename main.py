@@ -8,7 +8,10 @@ from typing import Optional
 import click
 from rich.console import Console
 
+from scraper.budget import PRIORITY_POLICIES, parse_duration, parse_size
+from scraper.progress import PROGRESS_BACKENDS
 from scraper.scraper import DrupalizeScraper
+from scraper.shards import SHARD_STRATEGIES, Shard
 
 
 @click.command()
@@ -45,7 +48,272 @@ from scraper.scraper import DrupalizeScraper
     default=None,
     help="Connect to existing Chrome via CDP (e.g., http://localhost:9222). Start Chrome first with --remote-debugging-port=9222",
 )
-def main(vault_dir: Path, headless: bool, delay: float, base_url: str, cookies_file: Optional[Path], cdp_url: Optional[str]):
+@click.option(
+    "--pages",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of browser pages to scrape with concurrently; the ceiling with --adaptive (default: 1)",
+)
+@click.option(
+    "--max-rps",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Maximum page requests per second across all pages (default: 1 / --delay)",
+)
+@click.option(
+    "--extract-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Concurrent workers for the HTML extraction stage (default: 1)",
+)
+@click.option(
+    "--media-workers",
+    type=click.IntRange(min=1),
+    default=5,
+    help="Concurrent background media downloads across all tutorials; the ceiling with --adaptive (default: 5)",
+)
+@click.option(
+    "--convert-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Concurrent workers for the Markdown conversion stage (default: 1)",
+)
+@click.option(
+    "--write-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Concurrent workers for the vault write stage (default: 1)",
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=8,
+    help="Maximum jobs waiting in front of each pipeline stage (default: 8)",
+)
+@click.option(
+    "--stats-interval",
+    type=click.FloatRange(min=0),
+    default=30.0,
+    help="Seconds between pipeline queue/throughput reports, 0 to disable (default: 30)",
+)
+@click.option(
+    "--parse-executor",
+    type=click.Choice(["thread", "process", "inline"]),
+    default="thread",
+    help="Run HTML extraction and Markdown conversion in a thread pool, process pool, or on the event loop (default: thread)",
+)
+@click.option(
+    "--parse-workers",
+    type=click.IntRange(min=1),
+    default=2,
+    help="Threads or processes for extraction and conversion (default: 2)",
+)
+@click.option(
+    "--urls-file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Seed the crawl frontier from a URL manifest (e.g. from discover_urls.py) instead of discovering URLs",
+)
+@click.option(
+    "--rediscover",
+    is_flag=True,
+    default=False,
+    help="Discover guides and tutorials again even if the frontier from an earlier run exists",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Re-check completed tutorials with conditional requests and rewrite only notes whose content changed",
+)
+@click.option(
+    "--archive/--no-archive",
+    default=True,
+    help="Store every fetched page in the compressed raw-page archive under _metadata/archive (default: on)",
+)
+@click.option(
+    "--replay",
+    is_flag=True,
+    default=False,
+    help="Rebuild the vault from the raw-page archive with no browser (e.g. after changing the converter)",
+)
+@click.option(
+    "--readiness",
+    type=click.Choice(["content", "article", "networkidle", "predicate"]),
+    default="content",
+    help="When a page counts as loaded: tutorial content selector, main <article>, network idle, or --ready-predicate (default: content)",
+)
+@click.option(
+    "--ready-predicate",
+    default=None,
+    help="JavaScript expression that is truthy once a page is ready; implies --readiness predicate",
+)
+@click.option(
+    "--block-resources/--no-block-resources",
+    default=True,
+    help="Abort images, media, fonts, stylesheets and third-party requests while rendering pages (default: on)",
+)
+@click.option(
+    "--block-type",
+    "block_types",
+    multiple=True,
+    type=click.Choice(["image", "media", "font", "stylesheet", "script", "xhr", "fetch", "other"]),
+    help="Resource type to block; repeat to override the default set",
+)
+@click.option(
+    "--allow-host",
+    "allow_hosts",
+    multiple=True,
+    help="Third-party host to always allow (subdomains included); repeatable",
+)
+@click.option(
+    "--fetch-mode",
+    type=click.Choice(["auto", "http", "render"]),
+    default="auto",
+    help="Fetch pages with plain HTTP using the browser's cookies, full rendering, or HTTP with render fallback (default: auto)",
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    help="Only re-process tutorials that failed in earlier runs; other guides are left untouched",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Fetch attempts per tutorial for timeouts, network errors, 429s and 5xx, with jittered exponential backoff (default: 3)",
+)
+@click.option(
+    "--shard",
+    default=None,
+    help="Scrape only shard i of K (e.g. 2/4) of the URL manifest into its own staging vault; "
+    "combine shards afterwards with merge_shards.py",
+)
+@click.option(
+    "--shard-by",
+    type=click.Choice(SHARD_STRATEGIES),
+    default="hash",
+    help="Split shards by hash of the canonical tutorial URL or by whole guides (default: hash)",
+)
+@click.option(
+    "--staging-dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=Path("shards"),
+    help="Directory holding shard staging vaults (default: ./shards)",
+)
+@click.option(
+    "--adaptive/--fixed-concurrency",
+    default=True,
+    help="Adapt page and media concurrency to server health (AIMD), with --pages and --media-workers "
+    "as ceilings (default: adaptive)",
+)
+@click.option(
+    "--capture-media/--no-capture-media",
+    default=False,
+    help="Save images and videos loaded while rendering pages instead of downloading them again; "
+    "stops blocking image and media requests (default: off)",
+)
+@click.option(
+    "--extract-in-page/--extract-from-html",
+    default=False,
+    help="Extract rendered tutorials inside the browser instead of re-parsing their HTML in Python (default: from HTML)",
+)
+@click.option(
+    "--max-duration",
+    default=None,
+    help="Stop starting new tutorials and downloads after this long (e.g. 45m, 2h, 1h30m); "
+    "work in progress finishes and the rest waits for the next run",
+)
+@click.option(
+    "--max-bytes",
+    default=None,
+    help="Stop starting new tutorials and downloads after transferring this much (e.g. 500MB, 2GB)",
+)
+@click.option(
+    "--priority",
+    type=click.Choice(PRIORITY_POLICIES),
+    default="guide-order",
+    help="Scrape in guide order, or by value: certification guides first, then the guides with the most "
+    "unscraped tutorials, deferring videos (default: guide-order)",
+)
+@click.option(
+    "--defer-videos/--fetch-videos",
+    default=None,
+    help="Leave videos for a later run (default: defer only with --priority value)",
+)
+@click.option(
+    "--progress-backend",
+    type=click.Choice(PROGRESS_BACKENDS),
+    default=None,
+    help="Store progress in progress.json, in progress.json plus an append-only journal (one fsynced line "
+    "per mark), or in a SQLite database safe for concurrent writers; switching to sqlite imports "
+    "progress.json once (default: whichever the vault already uses, else json)",
+)
+@click.option(
+    "--shutdown-grace",
+    type=click.FloatRange(min=0),
+    default=30.0,
+    help="On Ctrl-C or SIGTERM, seconds in-flight tutorials get to finish before they are cancelled; "
+    "a second Ctrl-C stops at once (default: 30)",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    default=False,
+    help="Dry run: print what would be fetched, converted and downloaded, with a time and transfer estimate "
+    "from earlier runs, then exit",
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    default=False,
+    help="With --plan, also list every tutorial to fetch (under its guide) and every deferred media file",
+)
+def main(
+    vault_dir: Path,
+    headless: bool,
+    delay: float,
+    base_url: str,
+    cookies_file: Optional[Path],
+    cdp_url: Optional[str],
+    pages: int,
+    max_rps: Optional[float],
+    extract_workers: int,
+    media_workers: int,
+    convert_workers: int,
+    write_workers: int,
+    queue_size: int,
+    stats_interval: float,
+    parse_executor: str,
+    parse_workers: int,
+    urls_file: Optional[Path],
+    rediscover: bool,
+    refresh: bool,
+    archive: bool,
+    replay: bool,
+    readiness: str,
+    ready_predicate: Optional[str],
+    block_resources: bool,
+    block_types: tuple,
+    allow_hosts: tuple,
+    fetch_mode: str,
+    extract_in_page: bool,
+    capture_media: bool,
+    adaptive: bool,
+    retry_failed: bool,
+    max_attempts: int,
+    shard: Optional[str],
+    shard_by: str,
+    staging_dir: Path,
+    max_duration: Optional[str],
+    max_bytes: Optional[str],
+    priority: str,
+    defer_videos: Optional[bool],
+    progress_backend: Optional[str],
+    shutdown_grace: float,
+    plan: bool,
+    verbose: bool,
+):
     """
     Scrape Drupalize.me content into an Obsidian vault.
 
@@ -60,14 +328,49 @@ def main(vault_dir: Path, headless: bool, delay: float, base_url: str, cookies_f
     """
     console = Console()
 
+    shard_spec = None
+    if shard:
+        try:
+            shard_spec = Shard.parse(shard, shard_by)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--shard")
+        urls_file = urls_file or Path("drupalize_urls.json")
+        if not urls_file.exists():
+            raise click.UsageError("--shard needs a URL manifest; pass --urls-file")
+        vault_dir = staging_dir / shard_spec.name
+
+    try:
+        duration_limit = parse_duration(max_duration) if max_duration else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-duration")
+    try:
+        bytes_limit = parse_size(max_bytes) if max_bytes else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-bytes")
+
     console.print("[bold cyan]Drupalize.me Scraper[/bold cyan]")
     console.print(f"Vault directory: {vault_dir.absolute()}")
     console.print(f"Headless mode: {headless}")
     console.print(f"Delay: {delay}s")
+    console.print(f"Pages: {pages}")
+    if ready_predicate:
+        readiness = "predicate"
+    console.print(f"Fetch mode: {fetch_mode}")
+    if retry_failed:
+        console.print("Mode: retry failed tutorials")
+    if shard_spec:
+        console.print(f"Shard: {shard_spec.index}/{shard_spec.count} by {shard_spec.strategy} ({urls_file})")
+    console.print(f"Readiness: {readiness}")
+    if max_rps is not None:
+        console.print(f"Max requests/s: {max_rps}")
+    if max_duration or max_bytes:
+        console.print(f"Budget: {max_duration or 'no time limit'}, {max_bytes or 'no transfer limit'}")
+    if priority != "guide-order":
+        console.print(f"Priority: {priority}")
     console.print("")
 
-    # Check if vault directory exists and warn if it has content
-    if vault_dir.exists() and any(vault_dir.iterdir()):
+    # Check if vault directory exists and warn if it has content (shard staging vaults just resume)
+    if not plan and not shard_spec and vault_dir.exists() and any(vault_dir.iterdir()):
         console.print(
             "[yellow]Warning: Vault directory already exists and contains files.[/yellow]"
         )
@@ -86,14 +389,59 @@ def main(vault_dir: Path, headless: bool, delay: float, base_url: str, cookies_f
             headless=headless,
             cookies_file=cookies_file,
             cdp_url=cdp_url,
+            pages=pages,
+            max_rps=max_rps,
+            stage_workers={
+                "extract": extract_workers,
+                "media": media_workers,
+                "convert": convert_workers,
+                "write": write_workers,
+            },
+            queue_size=queue_size,
+            stats_interval=stats_interval,
+            parse_executor=parse_executor,
+            parse_workers=parse_workers,
+            urls_file=urls_file,
+            rediscover=rediscover,
+            refresh=refresh,
+            archive=archive,
+            replay=replay,
+            readiness=readiness,
+            ready_predicate=ready_predicate,
+            block_resources=block_resources,
+            blocked_types=list(block_types) or None,
+            allowed_hosts=list(allow_hosts),
+            fetch_mode=fetch_mode,
+            extract_in_page=extract_in_page,
+            capture_media=capture_media,
+            adaptive=adaptive,
+            retry_failed=retry_failed,
+            max_attempts=max_attempts,
+            shard=shard_spec,
+            max_duration=duration_limit,
+            max_bytes=bytes_limit,
+            priority=priority,
+            defer_videos=defer_videos,
+            progress_backend=progress_backend,
+            shutdown_grace=shutdown_grace,
         )
 
+        if plan:
+            scraper.plan(verbose=verbose)
+            return
+
         console.print("[green]Starting scraper...[/green]")
         console.print("")
 
         # Run the scraper
         asyncio.run(scraper.scrape_all())
 
+        if scraper.stop_reason:
+            console.print("")
+            console.print(f"[yellow]Scraping stopped ({scraper.stop_reason}).[/yellow]")
+            console.print("[yellow]Progress has been saved. Run again to resume.[/yellow]")
+            sys.exit(1)
+
         console.print("")
         console.print("[bold green]Scraping completed![/bold green]")
         console.print(f"Vault created at: {vault_dir.absolute()}")
@@ -0,0 +1,60 @@
+"""
+Merge shard staging vaults into one vault.
+
+Each `main.py --shard i/K` run scrapes part of the URL manifest into its own
+staging vault (./shards/shard-<i>-of-<K> by default). This combines them:
+frontiers and progress files are merged, notes and assets are copied once
+(identical shared assets are deduplicated), and guide indexes are rebuilt.
+The result only depends on the staging vaults, not on the order shards
+finished in.
+
+Usage:
+    uv run python merge_shards.py --staging-dir ./shards --vault-dir ./vault
+"""
+
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from scraper.shards import merge_shards
+
+console = Console()
+
+
+@click.command()
+@click.option(
+    "--staging-dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=Path("shards"),
+    help="Directory holding shard staging vaults (default: ./shards)",
+)
+@click.option(
+    "--vault-dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=Path("vault"),
+    help="Vault to merge the shards into (default: ./vault)",
+)
+def main(staging_dir: Path, vault_dir: Path):
+    """Merge shard staging vaults into one Obsidian vault."""
+    shard_roots = sorted(path for path in staging_dir.glob("shard-*") if path.is_dir())
+    if not shard_roots:
+        console.print(f"[red]No shard staging vaults found in {staging_dir}[/red]")
+        sys.exit(1)
+
+    console.print(f"[cyan]Merging {len(shard_roots)} shards into {vault_dir}[/cyan]")
+    report = merge_shards(shard_roots, vault_dir)
+
+    console.print(f"[green]Merged {report.shards} shards: {report.tutorials} tutorials[/green]")
+    console.print(f"  Files copied: {report.files_copied}")
+    console.print(f"  Shared files deduplicated: {report.files_shared}")
+    console.print(f"  Duplicate notes skipped: {report.duplicate_notes}")
+    if report.conflicts:
+        console.print(f"[yellow]  {len(report.conflicts)} conflicting files kept from the first shard:[/yellow]")
+        for path in report.conflicts:
+            console.print(f"    {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -71,6 +71,18 @@ def create_frontmatter(content: dict) -> str:
     if content.get('guide'):
         fm.append(f"guide: \"[[{content['guide']}]]\"")
     
+    # Order within the note's own guide, plus every guide it belongs to (one note per tutorial)
+    own = [m for m in content.get('guides') or [] if m.get('guideUrl') == content.get('guideUrl')]
+    if own:
+        fm.append(f"order: {own[0]['order']}")
+    if content.get('guides'):
+        fm.append("guides:")
+        for membership in content['guides']:
+            # Same schema as the scraper's notes (scraper/converter.py), so both can be queried alike
+            fm.append(f"  - name: \"{membership['guide']}\"")
+            fm.append(f"    url: {membership['guideUrl']}")
+            fm.append(f"    order: {membership['order']}")
+    
     if content.get('topics'):
         topics = [f"  - \"{t}\"" for t in content['topics']]
         fm.append("topics:")
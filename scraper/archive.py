@@ -0,0 +1,210 @@
+"""Append-only, zstd-compressed archive of fetched HTML pages."""
+
+import sqlite3
+import time
+from compression import zstd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from scraper.urls import canonical_url
+
+# Pages archived before a dictionary exists; once reached, one is trained from them
+TRAIN_AFTER = 200
+DICT_SIZE = 112 * 1024
+COMPRESSION_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    status INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    dict_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at DESC);
+
+CREATE TABLE IF NOT EXISTS dictionaries (
+    dict_id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    samples INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class ArchivedPage:
+    """Index entry for one archived fetch."""
+
+    url: str
+    fetched_at: float
+    status: int
+    offset: int
+    length: int
+    raw_size: int
+    dict_id: int = 0
+
+
+class PageArchive:
+    """Stores every fetched page in an append-only log indexed by URL and fetch time."""
+
+    def __init__(self, archive_dir: Path, train_after: int = TRAIN_AFTER):
+        """
+        Initialize page archive.
+
+        Args:
+            archive_dir: Directory holding the log, index and trained dictionaries
+            train_after: Number of pages to collect before training a compression dictionary
+        """
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.archive_dir / "pages.zlog"
+        self.train_after = train_after
+
+        # The scraper calls into the archive from its own archive thread, one call at a time
+        self.conn = sqlite3.connect(self.archive_dir / "index.sqlite", check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        self._dicts: Dict[int, zstd.ZstdDict] = {}
+        row = self.conn.execute("SELECT dict_id FROM dictionaries ORDER BY created_at DESC LIMIT 1").fetchone()
+        self.current_dict_id = row["dict_id"] if row else 0
+
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def close(self):
+        """Close the index."""
+        self.conn.close()
+
+    def _dictionary(self, dict_id: int) -> Optional[zstd.ZstdDict]:
+        """Load (and cache) a trained dictionary by ID; 0 means no dictionary."""
+        if not dict_id:
+            return None
+        if dict_id not in self._dicts:
+            content = (self.archive_dir / f"dict-{dict_id}.zdict").read_bytes()
+            self._dicts[dict_id] = zstd.ZstdDict(content)
+        return self._dicts[dict_id]
+
+    def append(self, url: str, html: str, status: int = 200, fetched_at: Optional[float] = None) -> ArchivedPage:
+        """
+        Compress a fetched page and append it to the archive.
+
+        Args:
+            url: URL the page was fetched from
+            html: Page HTML
+            status: HTTP status of the response
+            fetched_at: Fetch time as a UNIX timestamp (default: now)
+
+        Returns:
+            Index entry for the new record
+        """
+        raw = html.encode("utf-8")
+        frame = zstd.compress(raw, level=COMPRESSION_LEVEL, zstd_dict=self._dictionary(self.current_dict_id))
+
+        with open(self.log_path, "ab") as f:
+            offset = f.tell()
+            f.write(frame)
+
+        record = ArchivedPage(
+            url=canonical_url(url),
+            fetched_at=fetched_at or time.time(),
+            status=status,
+            offset=offset,
+            length=len(frame),
+            raw_size=len(raw),
+            dict_id=self.current_dict_id,
+        )
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO pages (url, fetched_at, status, offset, length, raw_size, dict_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record.url, record.fetched_at, record.status, offset, record.length, record.raw_size, record.dict_id),
+            )
+        self.raw_bytes += record.raw_size
+        self.stored_bytes += record.length
+
+        if not self.current_dict_id and self.count() >= self.train_after:
+            self.train_dictionary()
+        return record
+
+    def read(self, record: ArchivedPage) -> str:
+        """
+        Decompress an archived page.
+
+        Args:
+            record: Index entry to read
+
+        Returns:
+            Page HTML
+        """
+        with open(self.log_path, "rb") as f:
+            f.seek(record.offset)
+            frame = f.read(record.length)
+        return zstd.decompress(frame, zstd_dict=self._dictionary(record.dict_id)).decode("utf-8")
+
+    def latest(self, url: str) -> Optional[ArchivedPage]:
+        """
+        Get the most recent archived fetch of a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Index entry, or None if the URL was never archived
+        """
+        row = self.conn.execute(
+            "SELECT url, fetched_at, status, offset, length, raw_size, dict_id FROM pages "
+            "WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+            (canonical_url(url),),
+        ).fetchone()
+        return ArchivedPage(**dict(row)) if row else None
+
+    def urls(self) -> Set[str]:
+        """Every URL with at least one archived fetch."""
+        return {row[0] for row in self.conn.execute("SELECT DISTINCT url FROM pages")}
+
+    def count(self) -> int:
+        """Number of archived fetches."""
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def train_dictionary(self, samples: int = TRAIN_AFTER, dict_size: int = DICT_SIZE) -> int:
+        """
+        Train a zstd dictionary on recently archived pages and use it for new records.
+
+        Args:
+            samples: Maximum number of pages to train on
+            dict_size: Maximum dictionary size in bytes
+
+        Returns:
+            ID of the new dictionary
+        """
+        rows = self.conn.execute(
+            "SELECT url, fetched_at, status, offset, length, raw_size, dict_id FROM pages "
+            "ORDER BY fetched_at DESC LIMIT ?",
+            (samples,),
+        ).fetchall()
+        pages: List[bytes] = [self.read(ArchivedPage(**dict(row))).encode("utf-8") for row in rows]
+        zdict = zstd.train_dict(pages, dict_size)
+
+        (self.archive_dir / f"dict-{zdict.dict_id}.zdict").write_bytes(zdict.dict_content)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dictionaries (dict_id, created_at, samples) VALUES (?, ?, ?)",
+                (zdict.dict_id, time.time(), len(pages)),
+            )
+        self._dicts[zdict.dict_id] = zdict
+        self.current_dict_id = zdict.dict_id
+        return zdict.dict_id
+
+    def summary(self) -> str:
+        """Human-readable summary of this run's archive writes."""
+        ratio = self.raw_bytes / self.stored_bytes if self.stored_bytes else 0.0
+        return (
+            f"{self.count()} pages archived, this run {self.raw_bytes / 1e6:.1f} MB -> "
+            f"{self.stored_bytes / 1e6:.1f} MB ({ratio:.1f}x, dictionary {self.current_dict_id or 'none'})"
+        )
@@ -2,12 +2,174 @@
 
 import asyncio
 import json
+import re
 import subprocess
 import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scraper.downloader import content_length
+from scraper.metrics import LatencyStats
+
+# Selectors that mark a page as ready under each readiness strategy
+READY_SELECTORS = {
+    "content": ".tutorial-content, .node__content, article, main",
+    "article": "main article, article",
+}
+READINESS_STRATEGIES = ["content", "article", "networkidle", "predicate"]
+
+# Markup that shows server-rendered HTML already carries the tutorial content. Only the tutorial
+# containers count: login, paywall and error pages have <main> and <article> too
+CONTENT_MARKER = re.compile(r"class=[\"'][^\"']*(?<![\w-])(?:tutorial-content|node__content)(?![\w-])", re.I)
+# Headers for plain HTTP fetches; Playwright decompresses the body transparently
+HTTP_FETCH_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
+# Resource types the scraper never needs: content comes from the HTML, media from MediaDownloader
+DEFAULT_BLOCKED_TYPES = ["image", "media", "font", "stylesheet"]
+# Third-party hosts that must still load (Cloudflare's challenge runs from here)
+DEFAULT_ALLOWED_HOSTS = ["challenges.cloudflare.com"]
+# Resource types capture mode needs the browser to load
+CAPTURED_RESOURCE_TYPES = ["image", "media"]
+# Response content type prefixes captured for the media store, by media type
+CAPTURED_CONTENT_TYPES = {"image/": "image", "video/": "video"}
+# Bodies larger than this (e.g. whole videos) are left to MediaDownloader instead of buffered in memory
+MAX_CAPTURE_BYTES = 50 * 1024 * 1024
+
+# Receives (url, media_type, read_body) for each captured media response
+MediaSink = Callable[[str, str, Callable[[], Awaitable[bytes]]], None]
+
+# Typical transfer sizes used to estimate the bandwidth saved by blocking, in bytes
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 40_000,
+}
+
+
+class BlockingProfile:
+    """Decides which subresource requests to abort while scraping."""
+
+    def __init__(
+        self,
+        first_party_host: str,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        allowed_hosts: Iterable[str] = DEFAULT_ALLOWED_HOSTS,
+        block_third_party: bool = True,
+    ):
+        """
+        Initialize blocking profile.
+
+        Args:
+            first_party_host: Site host (e.g. 'drupalize.me'); it and its subdomains are first-party
+            blocked_types: Playwright resource types to abort on every host
+            allowed_hosts: Hosts (and their subdomains) that are never blocked
+            block_third_party: Whether to abort all other requests to third-party hosts
+        """
+        self.first_party_host = first_party_host.lower()
+        self.blocked_types = set(blocked_types)
+        self.allowed_hosts = [host.lower() for host in allowed_hosts]
+        self.block_third_party = block_third_party
+
+    @staticmethod
+    def _matches(host: str, domain: str) -> bool:
+        """Whether host is domain or one of its subdomains."""
+        return host == domain or host.endswith("." + domain)
+
+    def should_block(self, resource_type: str, url: str, is_navigation: bool = False) -> bool:
+        """
+        Decide whether a request should be aborted.
+
+        Args:
+            resource_type: Playwright resource type (image, script, ...)
+            url: Request URL
+            is_navigation: Whether this is a navigation request (never blocked)
+
+        Returns:
+            True to abort the request
+        """
+        if is_navigation:
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        if any(self._matches(host, allowed) for allowed in self.allowed_hosts):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return self.block_third_party and not self._matches(host, self.first_party_host)
+
+
+class BlockingStats:
+    """Counts blocked requests per page and in total."""
+
+    def __init__(self):
+        """Initialize blocking counters."""
+        self.by_type: Dict[str, int] = {}
+        self.page_counts: Dict[int, int] = {}
+        self.page_bytes: Dict[int, int] = {}
+
+    def record(self, page: Page, resource_type: str):
+        """Record one blocked request on a page."""
+        key = id(page)
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+        self.page_counts[key] = self.page_counts.get(key, 0) + 1
+        self.page_bytes[key] = self.page_bytes.get(key, 0) + ESTIMATED_BYTES.get(resource_type, 5_000)
+
+    def reset_page(self, page: Page):
+        """Start counting a new navigation on a page."""
+        self.page_counts[id(page)] = 0
+        self.page_bytes[id(page)] = 0
+
+    def page_totals(self, page: Page) -> tuple:
+        """Blocked request count and estimated bytes saved for the page's current navigation."""
+        return self.page_counts.get(id(page), 0), self.page_bytes.get(id(page), 0)
+
+    def summary(self) -> str:
+        """Human-readable summary of everything blocked this run."""
+        total = sum(self.by_type.values())
+        saved = sum(count * ESTIMATED_BYTES.get(kind, 5_000) for kind, count in self.by_type.items())
+        kinds = ", ".join(f"{kind} {count}" for kind, count in sorted(self.by_type.items()))
+        return f"{total} requests blocked ({kinds or 'none'}), ~{saved / 1e6:.1f} MB saved (estimated)"
+
+
+@dataclass
+class FetchResult:
+    """HTML and response metadata for a fetched page."""
+
+    url: str
+    status: int
+    html: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    ready_seconds: Optional[float] = None
+    blocked_requests: int = 0
+    blocked_bytes: int = 0
+    rendered: bool = False
+    data: Optional[dict] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Whether a conditional request found the page unchanged."""
+        return self.status == 304
+
+    @property
+    def is_challenge(self) -> bool:
+        """Whether the response is a Cloudflare challenge instead of the real page."""
+        return "Just a moment" in self.html[:5000]
+
+    @property
+    def has_content(self) -> bool:
+        """Whether the HTML contains the tutorial content container (i.e. doesn't need JavaScript to render it)."""
+        return bool(CONTENT_MARKER.search(self.html))
 
 
 class BrowserSession:
@@ -20,6 +182,11 @@ class BrowserSession:
         cookies_file: Optional[Path] = None,
         cdp_url: Optional[str] = None,
         chrome_profile_path: Optional[Path] = None,
+        readiness: str = "content",
+        ready_predicate: Optional[str] = None,
+        ready_timeout: int = 15000,
+        blocking: Optional[BlockingProfile] = None,
+        capture_media: bool = False,
     ):
         """
         Initialize browser session manager.
@@ -30,16 +197,38 @@ class BrowserSession:
             cookies_file: Optional path to JSON file with cookies to import
             cdp_url: Connect to existing Chrome via Chrome DevTools Protocol (e.g., "http://localhost:9222")
             chrome_profile_path: Path to your Chrome user data directory to use your real profile
+            readiness: When a rendered page counts as ready: 'content' (tutorial content selector),
+                'article' (main <article>), 'networkidle' (no network for 500 ms) or 'predicate'
+            ready_predicate: JavaScript expression that is truthy once the page is ready ('predicate' strategy)
+            ready_timeout: Milliseconds to wait for readiness before using the page as it is
+            blocking: Optional profile of subresource requests to abort on pooled pages
+            capture_media: Hand image and video responses received by pooled pages to media_sink
         """
         self.user_data_dir = user_data_dir or Path.home() / ".drupalize_scraper"
         self.headless = headless
         self.cookies_file = cookies_file
         self.cdp_url = cdp_url
         self.chrome_profile_path = chrome_profile_path
+        if readiness not in READINESS_STRATEGIES:
+            raise ValueError(f"Unknown readiness strategy: {readiness}")
+        if readiness == "predicate" and not ready_predicate:
+            raise ValueError("The 'predicate' readiness strategy needs a ready_predicate")
+        self.readiness = readiness
+        self.ready_predicate = ready_predicate
+        self.ready_timeout = ready_timeout
+        self.ready_stats = LatencyStats(f"time-to-ready ({readiness})")
+        self.ready_timeouts = 0
+        self.blocking = blocking
+        self.block_stats = BlockingStats()
+        self.capture_media = capture_media
+        self.media_sink: Optional[MediaSink] = None
+        self.captured_responses = 0
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.pages: List[Page] = []
+        self._page_pool: Optional[asyncio.Queue] = None
         self._owns_browser = True  # Whether we launched the browser ourselves
 
     async def __aenter__(self):
@@ -147,12 +336,13 @@ class BrowserSession:
 
         await self._inject_stealth_scripts()
 
-    async def _inject_stealth_scripts(self):
+    async def _inject_stealth_scripts(self, page: Optional[Page] = None):
         """Inject scripts to make the browser less detectable."""
-        if not self.page:
+        page = page or self.page
+        if not page:
             return
 
-        await self.page.add_init_script("""
+        await page.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
             Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
             Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
@@ -217,6 +407,83 @@ class BrowserSession:
             json.dump(cookies, f, indent=2, ensure_ascii=False)
         return cookies
 
+    async def open_pages(self, count: int) -> List[Page]:
+        """
+        Open a pool of pages in the current browser context.
+
+        The session's main page is always the first member of the pool, so a
+        pool of one behaves exactly like the single-page session.
+
+        Args:
+            count: Number of pages to keep in the pool
+
+        Returns:
+            List of pooled pages
+        """
+        if not self.context or not self.page:
+            raise RuntimeError("Browser session not started. Call start() first.")
+
+        self.pages = [self.page]
+        while len(self.pages) < max(count, 1):
+            page = await self.context.new_page()
+            if self._owns_browser and not self.chrome_profile_path:
+                await self._inject_stealth_scripts(page)
+            self.pages.append(page)
+
+        if self.blocking:
+            for page in self.pages:
+                await self._install_blocking(page)
+        if self.capture_media:
+            for page in self.pages:
+                self._install_capture(page)
+
+        self._page_pool = asyncio.Queue()
+        for page in self.pages:
+            self._page_pool.put_nowait(page)
+        return self.pages
+
+    async def _install_blocking(self, page: Page):
+        """Route a page's requests through the blocking profile."""
+
+        async def handle(route, request):
+            # Only the page's own navigation is exempt; iframe navigations (video players) can be blocked
+            is_main_navigation = request.is_navigation_request() and request.frame.parent_frame is None
+            if self.blocking.should_block(request.resource_type, request.url, is_main_navigation):
+                self.block_stats.record(page, request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+
+        await page.route("**/*", handle)
+
+    def _install_capture(self, page: Page):
+        """Pass a page's successful image and video responses to the media sink."""
+
+        def handle(response):
+            if self.media_sink is None or response.status != 200:
+                return
+            content_type = response.headers.get("content-type", "").lower()
+            media_type = next(
+                (kind for prefix, kind in CAPTURED_CONTENT_TYPES.items() if content_type.startswith(prefix)), None
+            )
+            if media_type is None or (content_length(response.headers) or 0) > MAX_CAPTURE_BYTES:
+                return
+            self.captured_responses += 1
+            self.media_sink(response.url, media_type, response.body)
+
+        page.on("response", handle)
+
+    @asynccontextmanager
+    async def page_slot(self) -> AsyncIterator[Page]:
+        """Borrow a page from the pool for the duration of the block."""
+        if self._page_pool is None:
+            await self.open_pages(1)
+        page = await self._page_pool.get()
+        try:
+            yield page
+        finally:
+            self._page_pool.put_nowait(page)
+
     async def close(self):
         """Close the browser session."""
         # Don't close if we connected to an existing browser
@@ -226,24 +493,113 @@ class BrowserSession:
         if self.playwright:
             await self.playwright.stop()
 
-    async def navigate(self, url: str, wait_until: str = "networkidle", timeout: int = 60000) -> Page:
+    async def navigate(
+        self, url: str, wait_until: str = "networkidle", timeout: int = 60000, page: Optional[Page] = None
+    ) -> Page:
         """Navigate to a URL and wait for page load."""
-        if not self.page:
+        page = page or self.page
+        if not page:
             raise RuntimeError("Browser session not started. Call start() first.")
-        await self.page.goto(url, wait_until=wait_until, timeout=timeout)
-        return self.page
+        await page.goto(url, wait_until=wait_until, timeout=timeout)
+        return page
 
-    async def get_content(self, url: str) -> str:
+    async def get_content(self, url: str, page: Optional[Page] = None) -> str:
         """Get HTML content from a URL."""
-        page = await self.navigate(url)
+        page = await self.navigate(url, page=page)
         return await page.content()
 
-    async def wait_for_cloudflare(self, timeout: int = 30000):
+    async def render(
+        self, url: str, page: Optional[Page] = None, extract_script: Optional[str] = None, keep_html: bool = True
+    ) -> FetchResult:
+        """
+        Fully render a page and return its HTML with the navigation response's metadata.
+
+        Args:
+            url: URL to render
+            page: Optional pooled page to render on (defaults to the main page)
+            extract_script: Optional JavaScript function evaluated in the page; its result is returned as data
+            keep_html: Whether to serialize the page HTML when extract_script is given
+
+        Returns:
+            FetchResult for the rendered page
+        """
+        page = page or self.page
+        if not page:
+            raise RuntimeError("Browser session not started. Call start() first.")
+        started = time.monotonic()
+        self.block_stats.reset_page(page)
+        wait_until = "networkidle" if self.readiness == "networkidle" else "domcontentloaded"
+        response = await page.goto(url, wait_until=wait_until, timeout=60000)
+        await self.wait_for_cloudflare(page=page)
+        await self._wait_until_ready(page)
+        ready_seconds = time.monotonic() - started
+        self.ready_stats.record(ready_seconds)
+        blocked_requests, blocked_bytes = self.block_stats.page_totals(page)
+        data = await page.evaluate(extract_script) if extract_script else None
+        return FetchResult(
+            url=url,
+            status=response.status if response else 200,
+            html=await page.content() if keep_html or not extract_script else "",
+            headers=response.headers if response else {},
+            ready_seconds=ready_seconds,
+            blocked_requests=blocked_requests,
+            blocked_bytes=blocked_bytes,
+            rendered=True,
+            data=data,
+        )
+
+    async def _wait_until_ready(self, page: Page):
+        """Wait for the configured readiness condition, falling back to the page as-is on timeout."""
+        try:
+            if self.readiness == "predicate":
+                await page.wait_for_function(self.ready_predicate, timeout=self.ready_timeout)
+            elif self.readiness in READY_SELECTORS:
+                await page.wait_for_selector(
+                    READY_SELECTORS[self.readiness], state="attached", timeout=self.ready_timeout
+                )
+        except PlaywrightTimeoutError:
+            self.ready_timeouts += 1
+
+    def readiness_summary(self) -> str:
+        """Human-readable summary of time-to-ready across rendered pages."""
+        return f"{self.ready_stats.summary()}, {self.ready_timeouts} readiness timeouts"
+
+    async def request(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30000) -> FetchResult:
+        """
+        Send a plain HTTP GET through the browser context, reusing its cookies, without rendering.
+
+        Args:
+            url: URL to request
+            headers: Extra request headers (e.g. conditional request validators)
+            timeout: Request timeout in milliseconds
+
+        Returns:
+            FetchResult with the raw response body
+        """
+        if not self.context:
+            raise RuntimeError("Browser session not started. Call start() first.")
+        started = time.monotonic()
+        response = await self.context.request.get(
+            url, headers={**HTTP_FETCH_HEADERS, **(headers or {})}, timeout=timeout
+        )
+        try:
+            body = "" if response.status == 304 else await response.text()
+            return FetchResult(
+                url=url,
+                status=response.status,
+                html=body,
+                headers=response.headers,
+                ready_seconds=time.monotonic() - started,
+            )
+        finally:
+            await response.dispose()
+
+    async def wait_for_cloudflare(self, timeout: int = 30000, page: Optional[Page] = None):
         """Wait for Cloudflare verification to complete if present."""
-        if not self.page:
+        page = page or self.page
+        if not page:
             return
         try:
-            await self.page.wait_for_selector("text=Just a moment", state="hidden", timeout=timeout)
+            await page.wait_for_selector("text=Just a moment", state="hidden", timeout=timeout)
         except Exception:
             pass
-        await asyncio.sleep(2)
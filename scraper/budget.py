@@ -0,0 +1,154 @@
+"""Run budgets (wall-clock time and bytes) and work prioritization."""
+
+import re
+import time
+from typing import Dict, List, Optional
+
+# Work orders: 'guide-order' walks guides as listed; 'value' takes certification
+# guides first, then the guides with the most unscraped tutorials, deferring videos
+PRIORITY_POLICIES = ["guide-order", "value"]
+# Guides preparing for a certification exam
+CERTIFICATION_PATTERN = re.compile(r"certif|exam", re.I)
+# Priority bonus that puts every certification guide ahead of all others
+CERTIFICATION_BONUS = 1_000_000
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+SIZE_UNITS = {"": 1, "b": 1, "k": 10**3, "m": 10**6, "g": 10**9, "t": 10**12}
+
+
+def parse_duration(text: str) -> float:
+    """
+    Parse a duration such as '90', '45m', '2h' or '1h30m'.
+
+    Args:
+        text: Duration; a bare number is seconds
+
+    Returns:
+        Seconds
+
+    Raises:
+        ValueError: If the text isn't a duration
+    """
+    text = text.strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", text):
+        return float(text)
+    parts = re.findall(r"(\d+(?:\.\d+)?)([smhd])", text)
+    if not parts or "".join(number + unit for number, unit in parts) != text:
+        raise ValueError(f"Invalid duration '{text}', expected e.g. 90, 45m, 2h or 1h30m")
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a byte size such as '500MB', '2GB' or '1048576'.
+
+    Args:
+        text: Size with an optional decimal unit (B, KB, MB, GB, TB; the B may be left out)
+
+    Returns:
+        Bytes
+
+    Raises:
+        ValueError: If the text isn't a size
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([kmgt]?b?)", text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid size '{text}', expected e.g. 500MB or 2GB")
+    unit = match.group(2)
+    return int(float(match.group(1)) * SIZE_UNITS[unit[:-1] if len(unit) == 2 else unit])
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. '1h05m' or '42s'."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class RunBudget:
+    """Wall-clock and transfer limits for one run."""
+
+    def __init__(self, max_duration: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize run budget.
+
+        Args:
+            max_duration: Seconds the run may take, or None for no limit
+            max_bytes: Bytes the run may transfer (pages and media), or None for no limit
+        """
+        self.max_duration = max_duration
+        self.max_bytes = max_bytes
+        self.started = time.monotonic()
+        self.bytes = 0
+        self._exhausted: Optional[str] = None
+
+    @property
+    def limited(self) -> bool:
+        """Whether any limit is set."""
+        return self.max_duration is not None or self.max_bytes is not None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        return time.monotonic() - self.started
+
+    def start(self):
+        """Start the clock."""
+        self.started = time.monotonic()
+
+    def add_bytes(self, count: int):
+        """Record bytes transferred."""
+        self.bytes += count
+
+    def exhausted(self) -> Optional[str]:
+        """
+        Check the limits.
+
+        Once a limit is hit the budget stays exhausted for the rest of the run.
+
+        Returns:
+            Why the budget ran out, or None while work may still start
+        """
+        if self._exhausted is None:
+            if self.max_duration is not None and self.elapsed >= self.max_duration:
+                self._exhausted = f"time limit of {format_duration(self.max_duration)} reached"
+            elif self.max_bytes is not None and self.bytes >= self.max_bytes:
+                self._exhausted = f"transfer limit of {self.max_bytes / 1e6:g} MB reached"
+        return self._exhausted
+
+    def summary(self) -> str:
+        """Human-readable budget usage."""
+        parts = [f"{format_duration(self.elapsed)} elapsed"]
+        if self.max_duration is not None:
+            parts[0] += f" of {format_duration(self.max_duration)}"
+        parts.append(f"{self.bytes / 1e6:.1f} MB transferred")
+        if self.max_bytes is not None:
+            parts[1] += f" of {self.max_bytes / 1e6:g} MB"
+        if self._exhausted:
+            parts.append(f"stopped early: {self._exhausted}")
+        return ", ".join(parts)
+
+
+def guide_priorities(guides: List[Dict], policy: str) -> Dict[str, int]:
+    """
+    Score guides under a priority policy.
+
+    Args:
+        guides: Guides with 'url', 'name' and 'open' (unscraped tutorial count), as from Frontier.guides()
+        policy: One of PRIORITY_POLICIES
+
+    Returns:
+        Priority by guide URL; higher is scraped first
+    """
+    if policy == "guide-order":
+        return {guide["url"]: 0 for guide in guides}
+    if policy != "value":
+        raise ValueError(f"Unknown priority policy: {policy}")
+    priorities = {}
+    for guide in guides:
+        certification = CERTIFICATION_PATTERN.search(f"{guide['name']} {guide['url']}")
+        priorities[guide["url"]] = guide["open"] + (CERTIFICATION_BONUS if certification else 0)
+    return priorities
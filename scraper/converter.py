@@ -3,7 +3,7 @@
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 from markdownify import markdownify as md
@@ -26,19 +26,22 @@ class MarkdownConverter:
         self.images_dir = self.assets_dir / "images"
         self.videos_dir = self.assets_dir / "videos"
 
-    def convert_tutorial(self, tutorial: TutorialContent, guide_path: Path = None) -> str:
+    def convert_tutorial(
+        self, tutorial: TutorialContent, guide_path: Path = None, guides: Optional[List[Dict]] = None
+    ) -> str:
         """
         Convert tutorial content to Markdown.
 
         Args:
             tutorial: TutorialContent object to convert
             guide_path: Optional path to guide directory for relative links
+            guides: Optional guide memberships ({'name', 'url', 'order'}) to record in the frontmatter
 
         Returns:
             Markdown string
         """
         # Build frontmatter
-        frontmatter = self._build_frontmatter(tutorial)
+        frontmatter = self._build_frontmatter(tutorial, guides)
 
         # Convert content sections
         sections = []
@@ -84,8 +87,8 @@ class MarkdownConverter:
 
         return markdown
 
-    def _build_frontmatter(self, tutorial: TutorialContent) -> str:
-        """Build YAML frontmatter for the tutorial."""
+    def _build_frontmatter(self, tutorial: TutorialContent, guides: Optional[List[Dict]] = None) -> str:
+        """Build YAML frontmatter for the tutorial, listing every guide it belongs to and its order there."""
         frontmatter_lines = [
             "---",
             f'title: "{tutorial.title}"',
@@ -101,6 +104,15 @@ class MarkdownConverter:
             versions_str = ", ".join([f'"{v}"' for v in tutorial.drupal_versions])
             frontmatter_lines.append(f"drupal_versions: [{versions_str}]")
 
+        if guides:
+            # Order in the primary (first) guide at the top level too, where the other vault tools read it
+            frontmatter_lines.append(f"order: {guides[0]['order']}")
+            frontmatter_lines.append("guides:")
+            for guide in guides:
+                frontmatter_lines.append(f'  - name: "{guide["name"]}"')
+                frontmatter_lines.append(f"    url: {guide['url']}")
+                frontmatter_lines.append(f"    order: {guide['order']}")
+
         frontmatter_lines.append("---")
         return "\n".join(frontmatter_lines)
 
@@ -0,0 +1,406 @@
+"""URL discovery from the site's XML sitemaps or its paginated search listings."""
+
+import asyncio
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, Tag
+from rich.console import Console
+
+from scraper.browser import BrowserSession, FetchResult
+from scraper.ratelimit import AIMDController, TokenBucket
+from scraper.urls import canonical_url
+
+# Search listing filter for each content type
+LISTING_TYPES = {"guide": "type%3Aguide", "tutorial": "type%3Atutorial"}
+# Path prefix of each content type's pages
+CONTENT_PATHS = {"guide": "/guide/", "tutorial": "/tutorial/"}
+# Pager links carry the zero-based page number in the query string
+PAGE_NUMBER = re.compile(r"[?&]page=(\d+)")
+# Guard against runaway pagination
+MAX_LISTING_PAGES = 500
+# Ceiling on concurrent discovery requests (the rate limit still applies)
+DISCOVERY_CONCURRENCY = 8
+# Headings that start a section of a guide page, and the ones that don't name a section
+SECTION_HEADINGS = {"h2", "h3", "h4"}
+GENERIC_HEADINGS = {"", "tutorials", "lessons", "content"}
+# Elements whose preceding heading names the section of the links inside them
+CONTAINERS = {"section", "div", "li"}
+
+Fetcher = Callable[[str], Awaitable[FetchResult]]
+
+
+def http_fetcher(browser: BrowserSession, rate_limiter: TokenBucket, control: AIMDController) -> Fetcher:
+    """
+    Build a plain HTTP fetch through the browser context, behind a rate limit and a concurrency controller.
+
+    Args:
+        browser: Started browser session (its cookies are reused)
+        rate_limiter: Shared request-rate budget
+        control: Concurrency controller for in-flight requests
+
+    Returns:
+        Coroutine function fetching one URL
+    """
+
+    async def fetch(url: str) -> FetchResult:
+        await rate_limiter.acquire()
+        async with control.slot() as outcome:
+            result = await browser.request(url)
+            outcome.status = result.status
+        return result
+
+    return fetch
+
+
+def extract_guide_overview(soup: BeautifulSoup) -> str:
+    """Extract guide overview/description."""
+    main_content = soup.find("main") or soup.find("article") or soup
+
+    # Try to find overview section
+    overview_elem = main_content.find("div", class_=re.compile(r"overview|description|intro", re.I))
+    if overview_elem:
+        return overview_elem.get_text(separator="\n", strip=True)
+
+    # Fallback: get first paragraph
+    first_p = main_content.find("p")
+    if first_p:
+        return first_p.get_text(strip=True)
+
+    return ""
+
+
+def extract_guide_tutorials(soup: BeautifulSoup, base_url: str) -> List[tuple]:
+    """
+    Extract tutorial links from a guide page in one document-order walk.
+
+    A tutorial's subfolder is the last section heading before its enclosing
+    section, div or li (generic headings like "Tutorials" don't count), so the
+    walk remembers the heading current when it entered each container.
+    Duplicate links keep their first position. The walk doesn't descend into
+    links, so the heading of a card-style link (<a><h3>Title</h3></a>) is part
+    of the link's name and never a section heading.
+
+    Args:
+        soup: Parsed guide page
+        base_url: Site base URL to resolve links against
+
+    Returns:
+        List of (canonical url, name, subfolder, position) tuples in guide order
+    """
+    main_content = soup.find("main") or soup.find("article") or soup
+    tutorials: Dict[str, tuple] = {}  # Ordered set keyed by URL
+    current_heading: List[Optional[str]] = [None]
+
+    def walk(node: Tag, container_heading: Optional[str]):
+        for child in node.children:
+            if not isinstance(child, Tag):
+                continue
+            if child.name in SECTION_HEADINGS:
+                heading_text = child.get_text(strip=True)
+                current_heading[0] = heading_text if heading_text.lower() not in GENERIC_HEADINGS else None
+            elif child.name == "a":
+                href = child.get("href", "")
+                if href.startswith("/tutorial/"):
+                    url = canonical_url(urljoin(base_url, href))
+                    name = child.get_text(strip=True)
+                    if name and url not in tutorials:
+                        tutorials[url] = (url, name, container_heading, len(tutorials))
+                continue
+            walk(child, current_heading[0] if child.name in CONTAINERS else container_heading)
+
+    walk(main_content, None)
+    return list(tutorials.values())
+
+
+def _local_name(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+class SiteDiscovery:
+    """
+    Builds a URL manifest in drupalize_urls.json format.
+
+    Guide and tutorial URLs come from the XML sitemaps listed in robots.txt
+    (or /sitemap.xml) when the site has them, otherwise from every page of the
+    search listings. Listing pages, sitemaps and guide pages are all fetched
+    concurrently; the fetch callable is expected to apply the rate limit.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        fetch: Fetcher,
+        render: Optional[Fetcher] = None,
+        use_sitemap: bool = True,
+        console: Optional[Console] = None,
+    ):
+        """
+        Initialize discovery.
+
+        Args:
+            base_url: Site base URL
+            fetch: Plain HTTP fetch (e.g. BrowserSession.request behind a rate limiter)
+            render: Optional full-render fetch for HTML pages the plain fetch can't get (challenges, errors)
+            use_sitemap: Try the XML sitemaps before the search listings
+            console: Console for progress output
+        """
+        self.base_url = base_url.rstrip("/")
+        self.host = urlparse(base_url).hostname or ""
+        self.fetch = fetch
+        self.render = render
+        self.use_sitemap = use_sitemap
+        self.console = console or Console()
+        self.errors: List[Dict] = []
+        self.sources: Dict[str, str] = {}
+        self.requests = 0
+        self.seconds = 0.0
+
+    async def discover(self) -> Dict:
+        """
+        Discover all guides and tutorials.
+
+        Returns:
+            Manifest with 'extractedAt', 'guides' (each with its ordered 'tutorials'),
+            'tutorials' (flat; entries without 'guideUrl' are standalone) and 'errors'.
+            Guides also carry their 'overview' and tutorials their guide 'subfolder'.
+        """
+        started = time.monotonic()
+        sitemap = await self._read_sitemaps() if self.use_sitemap else {}
+        guide_list, tutorial_list = await asyncio.gather(
+            self._content_urls("guide", sitemap), self._content_urls("tutorial", sitemap)
+        )
+        self.console.print(
+            f"[green]Found {len(guide_list)} guides ({self.sources['guide']}) and "
+            f"{len(tutorial_list)} tutorials ({self.sources['tutorial']})[/green]"
+        )
+
+        guides = [
+            guide
+            for guide in await asyncio.gather(*(self._read_guide(url, title) for url, title in guide_list))
+            if guide is not None
+        ]
+
+        tutorials = []
+        seen = set()
+        for guide in guides:
+            for tutorial in guide["tutorials"]:
+                if tutorial["url"] not in seen:
+                    seen.add(tutorial["url"])
+                    tutorials.append(
+                        {
+                            "url": tutorial["url"],
+                            "title": tutorial["title"],
+                            "guide": guide["title"],
+                            "guideUrl": guide["url"],
+                        }
+                    )
+        for url, title in tutorial_list:
+            if url not in seen:
+                seen.add(url)
+                tutorials.append({"url": url, "title": title})
+
+        self.seconds = time.monotonic() - started
+        return {
+            "extractedAt": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "guides": guides,
+            "tutorials": tutorials,
+            "errors": self.errors,
+        }
+
+    def summary(self, manifest: Dict) -> str:
+        """Human-readable summary of a discovery run."""
+        standalone = sum(1 for tutorial in manifest["tutorials"] if not tutorial.get("guideUrl"))
+        return (
+            f"{len(manifest['guides'])} guides, {len(manifest['tutorials'])} tutorials "
+            f"({standalone} standalone), {len(manifest['errors'])} errors; "
+            f"{self.requests} requests in {self.seconds:.1f}s"
+        )
+
+    def _canonical(self, url: str) -> Optional[str]:
+        """Site URL with the configured scheme and host, or None for other hosts."""
+        parts = urlparse(urljoin(self.base_url + "/", url.strip()))
+        if parts.hostname and parts.hostname != self.host:
+            return None
+        return canonical_url(self.base_url + parts.path + (f"?{parts.query}" if parts.query else ""))
+
+    def _content_type(self, url: str) -> Optional[str]:
+        """'guide', 'tutorial' or None, by URL path."""
+        path = urlparse(url).path
+        for content_type, prefix in CONTENT_PATHS.items():
+            if path.startswith(prefix) and len(path) > len(prefix):
+                return content_type
+        return None
+
+    async def _get(self, url: str, html: bool = True) -> Optional[str]:
+        """
+        Fetch a document body.
+
+        Args:
+            url: URL to fetch
+            html: Whether this is an HTML page (rendered as a fallback when the plain fetch is unusable)
+
+        Returns:
+            The body, or None if it couldn't be fetched
+        """
+        self.requests += 1
+        try:
+            result = await self.fetch(url)
+            if result.status == 200 and not result.is_challenge:
+                return result.html
+            if not html:
+                return None  # A missing robots.txt or sitemap just means there is none
+            if self.render:
+                self.requests += 1
+                result = await self.render(url)
+                if result.status == 200 and not result.is_challenge:
+                    return result.html
+            raise RuntimeError(f"HTTP {result.status}" + (" (challenge)" if result.is_challenge else ""))
+        except Exception as e:
+            self.errors.append({"type": "fetch", "url": url, "error": str(e) or type(e).__name__})
+            return None
+
+    async def _read_sitemaps(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Read the site's sitemaps, following sitemap indexes.
+
+        Returns:
+            Content URLs by type, in sitemap order; empty if the site has no usable sitemap
+        """
+        robots = await self._get(f"{self.base_url}/robots.txt", html=False)
+        queue = []
+        for line in (robots or "").splitlines():
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sitemap" and value.strip():
+                queue.append(value.strip())
+        queue = queue or [f"{self.base_url}/sitemap.xml"]
+
+        found: Dict[str, List[Tuple[str, str]]] = {"guide": [], "tutorial": []}
+        seen_urls = set()
+        seen_sitemaps = set(queue)
+        while queue:
+            bodies = await asyncio.gather(*(self._get(url, html=False) for url in queue))
+            next_queue = []
+            for sitemap_url, body in zip(queue, bodies):
+                if not body:
+                    continue
+                try:
+                    root = ET.fromstring(body.encode("utf-8"))
+                except ET.ParseError as e:
+                    self.errors.append({"type": "sitemap", "url": sitemap_url, "error": str(e)})
+                    continue
+                locs = [elem.text.strip() for elem in root.iter() if _local_name(elem.tag) == "loc" and elem.text]
+                if _local_name(root.tag) == "sitemapindex":
+                    for loc in locs:
+                        if loc not in seen_sitemaps:
+                            seen_sitemaps.add(loc)
+                            next_queue.append(loc)
+                    continue
+                for loc in locs:
+                    url = self._canonical(loc)
+                    content_type = url and self._content_type(url)
+                    if content_type and url not in seen_urls:
+                        seen_urls.add(url)
+                        found[content_type].append((url, ""))
+            queue = next_queue
+        return found if any(found.values()) else {}
+
+    async def _content_urls(self, content_type: str, sitemap: Dict) -> List[Tuple[str, str]]:
+        """URLs of one content type from the sitemap, or from the search listing if the sitemap has none."""
+        if sitemap.get(content_type):
+            self.sources[content_type] = "sitemap"
+            return sitemap[content_type]
+        self.sources[content_type] = "listing"
+        return await self._read_listing(content_type)
+
+    def _listing_url(self, content_type: str, page: int) -> str:
+        """URL of one page of a search listing."""
+        url = f"{self.base_url}/search?f%5B0%5D={LISTING_TYPES[content_type]}"
+        return f"{url}&page={page}" if page else url
+
+    def _parse_listing(self, html: str, content_type: str) -> Tuple[List[Tuple[str, str]], set]:
+        """
+        Parse one listing page.
+
+        Returns:
+            ((url, title) items in page order, page numbers linked from the pager)
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        items: Dict[str, str] = {}
+        pages = set()
+        for link in soup.find_all("a", href=True):
+            href = link["href"]
+            match = PAGE_NUMBER.search(href)
+            if match and "/search" in href:
+                pages.add(int(match.group(1)))
+                continue
+            url = self._canonical(href)
+            if not url or self._content_type(url) != content_type:
+                continue
+            title = link.get_text(strip=True)
+            # Result teasers often link twice (image, then title); keep the first position and a non-empty title
+            if title or url not in items:
+                items[url] = items.get(url) or title
+        return list(items.items()), pages
+
+    async def _read_listing(self, content_type: str) -> List[Tuple[str, str]]:
+        """
+        Read every page of a search listing.
+
+        The first page's pager reveals further page numbers; each round fetches
+        all newly revealed pages concurrently, so a pager that only shows a
+        window of pages is still followed to the end.
+
+        Returns:
+            (url, title) pairs in listing order
+        """
+        pages: Dict[int, List[Tuple[str, str]]] = {}
+        fetched = set()
+        pending = {0}
+        while pending and len(fetched) < MAX_LISTING_PAGES:
+            batch = sorted(pending)[: MAX_LISTING_PAGES - len(fetched)]
+            fetched.update(batch)
+            bodies = await asyncio.gather(*(self._get(self._listing_url(content_type, page)) for page in batch))
+            pending = set()
+            for page, body in zip(batch, bodies):
+                if body is None:
+                    continue
+                pages[page], linked = self._parse_listing(body, content_type)
+                pending.update(number for number in linked if number not in fetched)
+
+        items = {}
+        for page in sorted(pages):
+            for url, title in pages[page]:
+                items.setdefault(url, title)
+        self.console.print(f"  {content_type} listing: {len(pages)} pages, {len(items)} {content_type}s")
+        return list(items.items())
+
+    async def _read_guide(self, url: str, title: str) -> Optional[Dict]:
+        """
+        Read a guide page's title, overview and ordered tutorials.
+
+        Returns:
+            Guide manifest entry, or None if the page couldn't be fetched
+        """
+        html = await self._get(url)
+        if html is None:
+            return None
+        soup = BeautifulSoup(html, "html.parser")
+        if not title:
+            heading = soup.find("h1")
+            title = heading.get_text(strip=True) if heading else ""
+        title = title or urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+        return {
+            "url": url,
+            "title": title,
+            "overview": extract_guide_overview(soup),
+            "tutorials": [
+                {"url": tutorial_url, "title": name, "subfolder": subfolder, "position": position}
+                for tutorial_url, name, subfolder, position in extract_guide_tutorials(soup, self.base_url)
+            ],
+        }
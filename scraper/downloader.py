@@ -2,14 +2,126 @@
 
 import asyncio
 import hashlib
+import os
+import uuid
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Mapping, Optional
 from urllib.parse import urlparse
 
 import aiofiles
 import aiohttp
 from rich.progress import Progress, TaskID
 
+from scraper.ratelimit import RequestOutcome
+
+# Suffix of files still being written; renamed into place only once complete
+PART_SUFFIX = ".part"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+class ConnectionStats:
+    """Counts new versus reused pooled connections and DNS cache hits."""
+
+    def __init__(self):
+        """Initialize connection counters."""
+        self.created = 0
+        self.reused = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build an aiohttp trace config that updates these counters.
+
+        Returns:
+            TraceConfig to pass to a ClientSession
+        """
+
+        async def on_create(session, context, params):
+            self.created += 1
+
+        async def on_reuse(session, context, params):
+            self.reused += 1
+
+        async def on_dns_hit(session, context, params):
+            self.dns_hits += 1
+
+        async def on_dns_miss(session, context, params):
+            self.dns_misses += 1
+
+        config = aiohttp.TraceConfig()
+        config.on_connection_create_end.append(on_create)
+        config.on_connection_reuseconn.append(on_reuse)
+        config.on_dns_cache_hit.append(on_dns_hit)
+        config.on_dns_cache_miss.append(on_dns_miss)
+        return config
+
+    @property
+    def reuse_rate(self) -> float:
+        """Fraction of requests served on an already-open connection."""
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+    def summary(self) -> str:
+        """Human-readable summary of connection reuse."""
+        return (
+            f"{self.created + self.reused} requests, {self.created} new connections, "
+            f"{self.reused} reused ({self.reuse_rate:.0%} reuse), "
+            f"{self.dns_hits} DNS cache hits / {self.dns_misses} lookups"
+        )
+
+
+def content_length(headers: Mapping[str, str]) -> Optional[int]:
+    """
+    Parse a response's Content-Length header.
+
+    Args:
+        headers: Response headers (Playwright's lower-case dict or aiohttp's case-insensitive mapping)
+
+    Returns:
+        Size in bytes, or None if the header is missing or malformed
+    """
+    try:
+        length = int(headers.get("content-length", "").strip())
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def create_session(
+    stats: Optional[ConnectionStats] = None,
+    limit: int = 32,
+    limit_per_host: int = 8,
+    dns_cache_ttl: int = 600,
+    keepalive_timeout: float = 60.0,
+) -> aiohttp.ClientSession:
+    """
+    Create a connection-pooled HTTP session meant to live for a whole run.
+
+    Args:
+        stats: Optional ConnectionStats to record connection reuse into
+        limit: Maximum open connections in the pool
+        limit_per_host: Maximum open connections per host
+        dns_cache_ttl: Seconds to cache DNS lookups
+        keepalive_timeout: Seconds to keep idle connections open for reuse
+
+    Returns:
+        aiohttp ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=300),  # 5 minute timeout for videos
+        headers={"User-Agent": USER_AGENT},
+        trace_configs=[stats.trace_config()] if stats else None,
+    )
+
 
 class MediaDownloader:
     """Downloads images and videos asynchronously."""
@@ -20,6 +132,7 @@ class MediaDownloader:
         videos_dir: Path,
         session: Optional[aiohttp.ClientSession] = None,
         max_concurrent: int = 5,
+        on_bytes: Optional[Callable[[int], None]] = None,
     ):
         """
         Initialize media downloader.
@@ -29,11 +142,13 @@ class MediaDownloader:
             videos_dir: Directory to save videos
             session: Optional aiohttp session (will create one if not provided)
             max_concurrent: Maximum concurrent downloads
+            on_bytes: Optional callback receiving the size of every chunk downloaded or body saved
         """
         self.images_dir = Path(images_dir)
         self.videos_dir = Path(videos_dir)
         self.session = session
         self.max_concurrent = max_concurrent
+        self.on_bytes = on_bytes
         self._own_session = session is None
 
         # Create directories
@@ -43,12 +158,7 @@ class MediaDownloader:
     async def __aenter__(self):
         """Async context manager entry."""
         if self._own_session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=300),  # 5 minute timeout for videos
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                },
-            )
+            self.session = create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -86,61 +196,143 @@ class MediaDownloader:
 
         return filename
 
+    def _get_filepath(self, url: str, media_type: str = "image") -> Path:
+        """Local path for a media URL in the matching assets directory."""
+        target_dir = self.videos_dir if media_type == "video" else self.images_dir
+        return target_dir / self._get_filename(url, media_type)
+
+    @staticmethod
+    def _part_path(filepath: Path) -> Path:
+        """Unique .part file next to a target, for one write of it."""
+        return filepath.with_name(f"{filepath.name}.{uuid.uuid4().hex[:12]}{PART_SUFFIX}")
+
     async def download_file(
-        self, url: str, filepath: Path, progress: Optional[Progress] = None, task_id: Optional[TaskID] = None
+        self,
+        url: str,
+        filepath: Path,
+        progress: Optional[Progress] = None,
+        task_id: Optional[TaskID] = None,
+        outcome: Optional[RequestOutcome] = None,
     ) -> bool:
         """
         Download a single file.
 
+        The body is written to a .part file next to the target and renamed into
+        place once complete, so the target only ever exists whole. The .part file
+        has a name of its own, so concurrent downloads of URLs with the same file
+        name never share one, and is removed if the download fails or is cancelled.
+
         Args:
             url: URL to download
             filepath: Path to save the file
             progress: Optional Rich progress bar
             task_id: Optional task ID for progress tracking
+            outcome: Optional outcome to report the response status or failure to
 
         Returns:
             True if successful, False otherwise
         """
+        part = self._part_path(filepath)
         try:
             async with self.session.get(url) as response:
+                if outcome:
+                    outcome.status = response.status
                 if response.status != 200:
                     return False
 
-                # Get file size if available
-                total_size = int(response.headers.get("Content-Length", 0))
-
+                # Get file size if available (a malformed header just leaves the progress bar open-ended)
                 if progress and task_id:
-                    progress.update(task_id, total=total_size)
+                    progress.update(task_id, total=content_length(response.headers))
 
                 # Download in chunks
-                async with aiofiles.open(filepath, "wb") as f:
+                async with aiofiles.open(part, "wb") as f:
                     downloaded = 0
                     async for chunk in response.content.iter_chunked(8192):
                         await f.write(chunk)
                         downloaded += len(chunk)
+                        if self.on_bytes:
+                            self.on_bytes(len(chunk))
                         if progress and task_id:
                             progress.update(task_id, advance=len(chunk))
+                os.replace(part, filepath)
 
                 return True
 
         except Exception as e:
             print(f"Error downloading {url}: {e}")
+            if outcome:
+                outcome.error = True
             return False
+        finally:
+            part.unlink(missing_ok=True)
 
-    async def download_images(
-        self, image_urls: List[str], progress: Optional[Progress] = None
-    ) -> Dict[str, str]:
+    async def download_media(
+        self,
+        url: str,
+        media_type: str = "image",
+        progress: Optional[Progress] = None,
+        outcome: Optional[RequestOutcome] = None,
+    ) -> Optional[str]:
         """
-        Download multiple images.
+        Download a single image or video into the matching assets directory.
 
         Args:
-            image_urls: List of image URLs
+            url: Media URL
+            media_type: Type of media ('image' or 'video')
             progress: Optional Rich progress bar
+            outcome: Optional outcome to report the response status or failure to
 
         Returns:
-            Dictionary mapping original URLs to local file paths
+            Local file path, or None if the download failed
         """
-        if not image_urls:
+        filepath = self._get_filepath(url, media_type)
+        filename = filepath.name
+
+        # Skip if already downloaded (files only appear under their final name once complete)
+        if filepath.exists():
+            return str(filepath)
+
+        task_id = None
+        if progress:
+            task_id = progress.add_task(f"Downloading {filename}", total=None)
+
+        success = await self.download_file(url, filepath, progress, task_id, outcome)
+        if success:
+            return str(filepath)
+        if task_id:
+            progress.remove_task(task_id)
+        return None
+
+    async def save_media(self, url: str, body: bytes, media_type: str = "image") -> str:
+        """
+        Store media bytes obtained without downloading (e.g. captured from the browser).
+
+        Args:
+            url: Media URL the bytes were fetched from
+            body: File contents
+            media_type: Type of media ('image' or 'video')
+
+        Returns:
+            Local file path
+        """
+        filepath = self._get_filepath(url, media_type)
+        if self.on_bytes:
+            self.on_bytes(len(body))
+        if not filepath.exists():
+            part = self._part_path(filepath)
+            try:
+                async with aiofiles.open(part, "wb") as f:
+                    await f.write(body)
+                os.replace(part, filepath)
+            finally:
+                part.unlink(missing_ok=True)
+        return str(filepath)
+
+    async def _download_many(
+        self, urls: List[str], media_type: str, progress: Optional[Progress] = None
+    ) -> Dict[str, str]:
+        """Download several files of one media type with bounded concurrency."""
+        if not urls:
             return {}
 
         semaphore = asyncio.Semaphore(self.max_concurrent)
@@ -148,28 +340,29 @@ class MediaDownloader:
 
         async def download_one(url: str):
             async with semaphore:
-                filename = self._get_filename(url, "image")
-                filepath = self.images_dir / filename
+                path = await self.download_media(url, media_type, progress)
+                if path:
+                    results[url] = path
 
-                # Skip if already exists
-                if filepath.exists():
-                    results[url] = str(filepath)
-                    return
+        tasks = [download_one(url) for url in urls]
+        await asyncio.gather(*tasks)
 
-                task_id = None
-                if progress:
-                    task_id = progress.add_task(f"Downloading {filename}", total=None)
+        return results
 
-                success = await self.download_file(url, filepath, progress, task_id)
-                if success:
-                    results[url] = str(filepath)
-                elif task_id:
-                    progress.remove_task(task_id)
+    async def download_images(
+        self, image_urls: List[str], progress: Optional[Progress] = None
+    ) -> Dict[str, str]:
+        """
+        Download multiple images.
 
-        tasks = [download_one(url) for url in image_urls]
-        await asyncio.gather(*tasks)
+        Args:
+            image_urls: List of image URLs
+            progress: Optional Rich progress bar
 
-        return results
+        Returns:
+            Dictionary mapping original URLs to local file paths
+        """
+        return await self._download_many(image_urls, "image", progress)
 
     async def download_videos(
         self, video_urls: List[str], progress: Optional[Progress] = None
@@ -184,36 +377,7 @@ class MediaDownloader:
         Returns:
             Dictionary mapping original URLs to local file paths
         """
-        if not video_urls:
-            return {}
-
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-        results = {}
-
-        async def download_one(url: str):
-            async with semaphore:
-                filename = self._get_filename(url, "video")
-                filepath = self.videos_dir / filename
-
-                # Skip if already exists
-                if filepath.exists():
-                    results[url] = str(filepath)
-                    return
-
-                task_id = None
-                if progress:
-                    task_id = progress.add_task(f"Downloading {filename}", total=None)
-
-                success = await self.download_file(url, filepath, progress, task_id)
-                if success:
-                    results[url] = str(filepath)
-                elif task_id:
-                    progress.remove_task(task_id)
-
-        tasks = [download_one(url) for url in video_urls]
-        await asyncio.gather(*tasks)
-
-        return results
+        return await self._download_many(video_urls, "video", progress)
 
     async def download_all(
         self, images: List[str], videos: List[str], progress: Optional[Progress] = None
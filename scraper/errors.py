@@ -0,0 +1,310 @@
+"""Failure classification, retries and per-host circuit breaking."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+T = TypeVar("T")
+
+# Failure categories
+TIMEOUT = "timeout"
+HTTP_STATUS = "http_status"
+CHALLENGE = "challenge"
+NETWORK = "network"
+PARSE = "parse"
+WRITE = "write"
+
+# Statuses worth retrying besides server errors: request timeouts and rate limiting.
+# 403 is not among them: a forbidden page stays forbidden, and Cloudflare challenges
+# (often served as 403) are told apart by their content and raised as ChallengeError.
+TRANSIENT_STATUSES = {408, 429}
+
+
+class ScrapeError(Exception):
+    """A classified tutorial failure."""
+
+    category = NETWORK
+    retryable = True
+    attempts = 1
+
+    def __init__(self, message: str, url: Optional[str] = None):
+        """
+        Initialize scrape error.
+
+        Args:
+            message: Error message
+            url: URL being processed, if known
+        """
+        super().__init__(message)
+        self.url = url
+
+
+class FetchTimeoutError(ScrapeError):
+    """A page or download timed out."""
+
+    category = TIMEOUT
+
+
+class HTTPStatusError(ScrapeError):
+    """The server answered with an error status."""
+
+    category = HTTP_STATUS
+
+    def __init__(self, status: int, message: str = "", url: Optional[str] = None):
+        """
+        Initialize HTTP status error.
+
+        Args:
+            status: HTTP status code
+            message: Optional detail (defaults to the status)
+            url: URL that returned the status
+        """
+        super().__init__(message or f"HTTP {status}", url)
+        self.status = status
+        self.retryable = status in TRANSIENT_STATUSES or status >= 500
+
+
+class ChallengeError(ScrapeError):
+    """
+    The server answered with a Cloudflare challenge instead of the page.
+
+    Retryable: the challenge usually clears once the browser has solved it or
+    the host has cooled down, and repeated challenges trip the circuit breaker.
+    """
+
+    category = CHALLENGE
+
+
+class ParseError(ScrapeError):
+    """Content could not be extracted or converted."""
+
+    category = PARSE
+    retryable = False
+
+
+class WriteError(ScrapeError):
+    """A note could not be written to the vault."""
+
+    category = WRITE
+    retryable = False
+
+
+def classify(error: BaseException, stage: str) -> ScrapeError:
+    """
+    Turn an exception raised by a pipeline stage into a classified error.
+
+    Args:
+        error: Exception raised by the stage
+        stage: Name of the stage that raised it
+
+    Returns:
+        The error itself if already classified, otherwise a ScrapeError wrapping its message
+    """
+    if isinstance(error, ScrapeError):
+        return error
+    message = str(error) or type(error).__name__
+    if isinstance(error, (asyncio.TimeoutError, PlaywrightTimeoutError)):
+        classified = FetchTimeoutError(message)
+    elif stage in ("extract", "convert"):
+        classified = ParseError(message)
+    elif stage == "write" or (isinstance(error, OSError) and stage != "fetch"):
+        classified = WriteError(message)
+    else:
+        classified = ScrapeError(message)
+    classified.__cause__ = error
+    return classified
+
+
+@dataclass
+class _HostState:
+    """Circuit state of one host."""
+
+    failures: int = 0
+    open_until: float = 0.0
+    trial: Optional[asyncio.Event] = None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After a run of consecutive transient failures a host's circuit opens and
+    every request to it waits out a cooldown. The first request after the
+    cooldown is a trial: if it succeeds the circuit closes, otherwise it opens
+    again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, log: Optional[Callable[[str], None]] = None):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            threshold: Consecutive failures that open a host's circuit
+            cooldown: Seconds an open circuit holds requests back
+            log: Optional callback receiving a message whenever a circuit opens or closes
+        """
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self.log = log
+        self.trips = 0
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        """Get (or create) a host's state."""
+        return self._hosts.setdefault(host, _HostState())
+
+    async def before(self, host: str) -> Optional[asyncio.Event]:
+        """
+        Wait until a request to the host may be sent.
+
+        Args:
+            host: Request host
+
+        Returns:
+            The trial if this request is the half-open trial (pass it to end_trial once
+            the request is over), otherwise None
+        """
+        state = self._state(host)
+        while True:
+            now = time.monotonic()
+            if state.open_until > now:
+                await asyncio.sleep(state.open_until - now)
+            elif state.trial is not None:
+                await state.trial.wait()
+            else:
+                if state.failures >= self.threshold:
+                    state.trial = asyncio.Event()  # Half-open: this request is the trial
+                    return state.trial
+                return None
+
+    def end_trial(self, host: str, trial: asyncio.Event):
+        """
+        Release the requests waiting on a trial, whether or not its outcome was recorded.
+
+        A trial cancelled before record() would otherwise hold every waiter forever;
+        after this the next waiter becomes the trial. A no-op once record() has ended it.
+
+        Args:
+            host: Request host
+            trial: Trial returned by before()
+        """
+        state = self._state(host)
+        if state.trial is trial:
+            state.trial = None
+        trial.set()
+
+    def record(self, host: str, success: bool):
+        """
+        Record the outcome of a request to the host.
+
+        Args:
+            host: Request host
+            success: False for a transient failure (timeout, network error, challenge, 429/5xx)
+        """
+        state = self._state(host)
+        if success:
+            if state.failures >= self.threshold and self.log:
+                self.log(f"Circuit for {host} closed")
+            state.failures = 0
+        else:
+            state.failures += 1
+            if state.failures >= self.threshold:
+                state.open_until = time.monotonic() + self.cooldown
+                self.trips += 1
+                if self.log:
+                    self.log(f"Circuit for {host} open for {self.cooldown:.0f}s after {state.failures} failures")
+        if state.trial is not None:
+            state.trial.set()
+            state.trial = None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, guarded by a per-host circuit breaker."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Attempts per operation, including the first
+            base_delay: Backoff ceiling in seconds after the first failure; doubles per attempt
+            max_delay: Upper bound on the backoff ceiling
+            breaker: Optional circuit breaker consulted before every attempt
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.retries = 0
+
+    def delay(self, attempt: int) -> float:
+        """
+        Backoff before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far
+
+        Returns:
+            Seconds to wait, drawn uniformly up to the exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        host: str,
+        stage: str,
+        on_retry: Optional[Callable[[int, ScrapeError, float], None]] = None,
+    ) -> T:
+        """
+        Run an operation, retrying transient failures.
+
+        Args:
+            operation: Coroutine function performing one attempt
+            host: Host the operation talks to (for the circuit breaker)
+            stage: Pipeline stage name, used to classify failures
+            on_retry: Optional callback receiving (attempt, error, delay) before each retry
+
+        Returns:
+            The operation's result
+
+        Raises:
+            ScrapeError: The classified error once attempts run out or the failure isn't retryable
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = await self.breaker.before(host) if self.breaker else None
+            try:
+                result = await operation()
+            except Exception as e:
+                error = classify(e, stage)
+                error.attempts = attempt
+                if self.breaker:
+                    self.breaker.record(host, not error.retryable)
+                if not error.retryable or attempt >= self.max_attempts:
+                    raise error
+            else:
+                if self.breaker:
+                    self.breaker.record(host, True)
+                return result
+            finally:
+                # Covers cancellation too, which record() never sees
+                if trial is not None:
+                    self.breaker.end_trial(host, trial)
+            delay = self.delay(attempt)
+            self.retries += 1
+            if on_retry:
+                on_retry(attempt, error, delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,205 @@
+/**
+ * In-page tutorial extractor.
+ *
+ * Evaluated by Playwright on a rendered tutorial page. Mirrors
+ * ContentExtractor.extract_tutorial (scraper/extractor.py) selector for selector,
+ * but runs against the live DOM and returns only a compact JSON object shaped
+ * like TutorialContent instead of the whole serialized page.
+ *
+ * Media and resource URLs are returned as raw attribute values; Python resolves
+ * them with urljoin so both extraction paths produce identical URLs. Videos are
+ * {src, embed} pairs because iframe embeds are the one URL kind left unresolved.
+ *
+ * Keep this in sync with the BeautifulSoup extractor; check_extraction_parity.py
+ * compares the two on archived pages, tests/test_extraction_parity.py on the
+ * tutorial pages in tests/fixtures.
+ */
+() => {
+    // Work on a copy so the page itself is left untouched
+    const doc = document.cloneNode(true);
+
+    const HEADINGS = ['H1', 'H2', 'H3', 'H4', 'H5', 'H6'];
+    const TOP_HEADINGS = ['H1', 'H2', 'H3'];
+    const SKIPPED_TEXT_PARENTS = ['SCRIPT', 'STYLE', 'TEMPLATE'];
+    const VERSION_PATTERN = /(?:Drupal\s+)?(\d+\.\d+\.x|\d+\.\d+)/i;
+
+    // Text nodes under a node, like BeautifulSoup's strings (script/style excluded)
+    const strings = (node) => {
+        const out = [];
+        const walker = doc.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const parent = walker.currentNode.parentNode;
+            if (parent && SKIPPED_TEXT_PARENTS.includes(parent.nodeName.toUpperCase())) continue;
+            out.push(walker.currentNode.data);
+        }
+        return out;
+    };
+
+    // Equivalent of get_text(separator, strip=True)
+    const text = (node, separator = '') => strings(node)
+        .map((s) => s.trim())
+        .filter(Boolean)
+        .join(separator);
+
+    const isHeading = (el, names = HEADINGS) => names.includes(el.nodeName.toUpperCase());
+    const addUnique = (list, value) => {
+        if (value && !list.includes(value)) list.push(value);
+    };
+    const linksMatching = (scope, pattern) => Array.from(scope.querySelectorAll('a[href]'))
+        .filter((a) => pattern.test(a.getAttribute('href')));
+
+    const extractTitle = () => {
+        const selectors = ['h1', 'article h1', 'main h1', '[role="article"] h1', '.field--name-title'];
+        for (const selector of selectors) {
+            const el = doc.querySelector(selector);
+            if (el) {
+                const title = text(el);
+                if (title) return title;
+            }
+        }
+        const titleTag = doc.querySelector('title');
+        if (titleTag) return text(titleTag).replace(/\s*\|\s*Drupalize\.Me.*$/i, '');
+        return 'Untitled Tutorial';
+    };
+
+    const extractSection = (scope, name) => {
+        for (const heading of scope.querySelectorAll('h1, h2, h3, h4, h5, h6')) {
+            if (!text(heading).toLowerCase().includes(name.toLowerCase())) continue;
+            const parts = [];
+            for (let el = heading.nextElementSibling; el && !isHeading(el); el = el.nextElementSibling) {
+                parts.push(el);
+            }
+            if (parts.length) {
+                return parts.flatMap(strings).map((s) => s.trim()).filter(Boolean).join('\n');
+            }
+        }
+        return null;
+    };
+
+    // First <ul> sibling after a heading
+    const listAfter = (heading) => {
+        let el = heading.nextElementSibling;
+        while (el && el.nodeName.toUpperCase() !== 'UL') el = el.nextElementSibling;
+        return el;
+    };
+
+    const directItems = (list) => Array.from(list.children).filter((el) => el.nodeName.toUpperCase() === 'LI');
+
+    const extractPrerequisites = (scope) => {
+        const prerequisites = [];
+        if (!extractSection(scope, 'Prerequisite')) return prerequisites;
+        const heading = Array.from(scope.querySelectorAll('h2, h3'))
+            .find((h) => text(h).toLowerCase().includes('prerequisite'));
+        const list = heading ? listAfter(heading) : null;
+        if (list) {
+            for (const li of directItems(list)) {
+                const link = li.querySelector('a');
+                if (link) {
+                    const title = text(link);
+                    if (title) prerequisites.push(title);
+                }
+            }
+        }
+        return prerequisites;
+    };
+
+    const extractMainContent = (scope) => {
+        const inner = scope.querySelector('main') || scope.querySelector('article') || scope;
+
+        inner.querySelectorAll('nav, header, footer, aside').forEach((el) => el.remove());
+
+        // Remove sections extracted separately, up to the next h1-h3
+        const keywords = ['goal', 'prerequisite', 'recap', 'further', 'additional resource'];
+        for (const heading of inner.querySelectorAll('h1, h2, h3')) {
+            if (!doc.contains(heading)) continue;  // Removed along with an earlier section
+            const headingText = text(heading).toLowerCase();
+            if (!keywords.some((keyword) => headingText.includes(keyword))) continue;
+            let current = heading;
+            while (current) {
+                const next = current.nextElementSibling;
+                if (isHeading(current, TOP_HEADINGS) && current !== heading) break;
+                current.remove();
+                current = next;
+                if (current && isHeading(current, TOP_HEADINGS)) break;
+            }
+        }
+        return inner === doc ? doc.documentElement.outerHTML : inner.outerHTML;
+    };
+
+    const extractAdditionalResources = (scope) => {
+        const resources = [];
+        if (!extractSection(scope, 'Additional resource')) return resources;
+        for (const heading of scope.querySelectorAll('h2, h3')) {
+            if (!text(heading).toLowerCase().includes('additional resource')) continue;
+            const list = listAfter(heading);
+            if (!list) continue;
+            for (const li of directItems(list)) {
+                const link = li.querySelector('a');
+                if (link) resources.push({ text: text(link), url: link.getAttribute('href') || '' });
+            }
+        }
+        return resources;
+    };
+
+    const extractVideos = () => {
+        const videos = [];
+        const add = (src, embed = false) => {
+            if (src) videos.push({ src, embed });
+        };
+        for (const video of doc.querySelectorAll('video')) {
+            add(video.getAttribute('src'));
+            for (const source of video.querySelectorAll('source')) add(source.getAttribute('src'));
+        }
+        for (const iframe of doc.querySelectorAll('iframe')) {
+            const src = iframe.getAttribute('src') || '';
+            if (['youtube', 'vimeo', 'dailymotion', 'video'].some((domain) => src.includes(domain))) add(src, true);
+        }
+        for (const link of linksMatching(doc, /\.(mp4|webm|ogg|mov|avi)$/i)) add(link.getAttribute('href'));
+        return videos;
+    };
+
+    const main = doc.querySelector('main') || doc.querySelector('article') || doc;
+
+    const title = extractTitle();
+
+    const topics = [];
+    for (const link of linksMatching(main, /\/topic\/|\/tag\//)) addUnique(topics, text(link));
+    for (const meta of doc.querySelectorAll('meta[property]')) {
+        if (/topic|tag/i.test(meta.getAttribute('property'))) addUnique(topics, (meta.getAttribute('content') || '').trim());
+    }
+
+    const drupalVersions = [];
+    for (const link of linksMatching(main, /\/version\/|\/drupal-\d+/)) {
+        const match = text(link).match(VERSION_PATTERN);
+        if (match) addUnique(drupalVersions, match[1]);
+    }
+    for (const match of strings(main).join('').matchAll(new RegExp(VERSION_PATTERN.source, 'gi'))) {
+        addUnique(drupalVersions, match[1]);
+    }
+
+    // Same order as the Python extractor: the main content pass removes the
+    // goal/recap/... sections, which affects everything extracted after it
+    const goal = extractSection(main, 'Goal');
+    const prerequisites = extractPrerequisites(main);
+    const content = extractMainContent(main);
+    const recap = extractSection(main, 'Recap');
+    const furtherUnderstanding = extractSection(main, 'Further your understanding');
+    const additionalResources = extractAdditionalResources(main);
+
+    const images = [];
+    for (const img of doc.querySelectorAll('img')) addUnique(images, img.getAttribute('src') || img.getAttribute('data-src'));
+
+    return {
+        title,
+        topics,
+        drupal_versions: drupalVersions,
+        goal,
+        prerequisites,
+        content,
+        recap,
+        further_understanding: furtherUnderstanding,
+        additional_resources: additionalResources,
+        images,
+        videos: extractVideos(),
+    };
+}
@@ -1,12 +1,24 @@
 """HTML content extraction from Drupalize.me pages."""
 
+import hashlib
+import json
 import re
-from dataclasses import dataclass, field
-from typing import List, Optional
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
 
+# JavaScript function that runs the extractor's selector logic inside a rendered page
+IN_PAGE_EXTRACTOR = (Path(__file__).parent / "extract_tutorial.js").read_text(encoding="utf-8")
+
+
+def normalize_content(html: str) -> str:
+    """Reduce content HTML to its whitespace-normalized text."""
+    text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+    return re.sub(r"\s+", " ", text)
+
 
 @dataclass
 class TutorialContent:
@@ -25,6 +37,18 @@ class TutorialContent:
     images: List[str] = field(default_factory=list)  # List of image URLs
     videos: List[str] = field(default_factory=list)  # List of video URLs
 
+    def fingerprint(self) -> str:
+        """
+        Hash of the extracted content, used to detect tutorials that changed.
+
+        The content is hashed as normalized text, so the same page extracted
+        in-page (Chromium's serialization) or from HTML (BeautifulSoup's) has
+        the same fingerprint.
+        """
+        fields = {**asdict(self), "content": normalize_content(self.content)}
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class ContentExtractor:
     """Extracts content from Drupalize.me HTML pages."""
@@ -100,6 +124,45 @@ class ContentExtractor:
             videos=videos,
         )
 
+    def from_page_data(self, data: dict, url: str) -> TutorialContent:
+        """
+        Build tutorial content from the JSON returned by the in-page extractor.
+
+        The in-page extractor returns raw attribute values for links and media;
+        they are resolved here the same way extract_tutorial resolves them.
+
+        Args:
+            data: Result of evaluating IN_PAGE_EXTRACTOR on the tutorial page
+            url: URL of the tutorial page
+
+        Returns:
+            TutorialContent object with extracted data
+        """
+        # Iframe embeds are kept as-is, like the HTML path does
+        videos = [video["src"] if video["embed"] else urljoin(url, video["src"]) for video in data.get("videos", [])]
+        return TutorialContent(
+            title=data["title"],
+            url=url,
+            topics=data.get("topics", []),
+            drupal_versions=data.get("drupal_versions", []),
+            goal=data.get("goal"),
+            prerequisites=data.get("prerequisites", []),
+            content=data.get("content", ""),
+            recap=data.get("recap"),
+            further_understanding=data.get("further_understanding"),
+            additional_resources=[
+                {"text": resource["text"], "url": urljoin(self.base_url, resource["url"])}
+                for resource in data.get("additional_resources", [])
+            ],
+            images=self._unique(urljoin(url, src) for src in data.get("images", [])),
+            videos=self._unique(videos),
+        )
+
+    @staticmethod
+    def _unique(urls: Iterable[str]) -> List[str]:
+        """Deduplicate URLs, keeping their first-seen order."""
+        return list(dict.fromkeys(urls))
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract tutorial title."""
         # Try multiple selectors for title
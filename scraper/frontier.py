@@ -0,0 +1,677 @@
+"""Persistent SQLite crawl frontier."""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scraper.storage import connect_readonly
+from scraper.urls import canonical_url
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tutorials (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    error_category TEXT,
+    note_path TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    claimed_from TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tutorials_claim ON tutorials (state, priority DESC);
+
+CREATE TABLE IF NOT EXISTS guides (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS memberships (
+    tutorial_url TEXT NOT NULL REFERENCES tutorials (url),
+    guide_url TEXT NOT NULL REFERENCES guides (url),
+    subfolder TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tutorial_url, guide_url)
+);
+CREATE INDEX IF NOT EXISTS idx_memberships_guide ON memberships (guide_url, position);
+"""
+
+# Per-tutorial columns that travel with the surviving copy when duplicate rows are merged
+RESULT_COLUMNS = [
+    "state", "title", "note_path", "etag", "last_modified", "content_hash", "last_error", "error_category",
+]
+
+# Columns added after the first release, created on older databases by _migrate
+MIGRATED_COLUMNS = {
+    "tutorials": {
+        "etag": "TEXT",
+        "last_modified": "TEXT",
+        "content_hash": "TEXT",
+        "error_category": "TEXT",
+        "claimed_from": "TEXT",
+    },
+}
+
+
+@dataclass
+class GuideMembership:
+    """A tutorial's place in one guide."""
+
+    guide_url: str
+    guide_name: str
+    subfolder: Optional[str] = None
+    position: int = 0
+
+
+@dataclass
+class FrontierEntry:
+    """A tutorial claimed from the frontier."""
+
+    url: str
+    title: str
+    priority: int = 0
+    attempts: int = 0
+    memberships: List[GuideMembership] = field(default_factory=list)
+    note_path: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+class Frontier:
+    """Durable work queue of tutorials keyed by canonical URL."""
+
+    def __init__(self, db_path: Path, readonly: bool = False):
+        """
+        Initialize frontier.
+
+        Args:
+            db_path: Path to the SQLite database file
+            readonly: Open an existing database for queries only, creating and migrating nothing (dry runs)
+        """
+        self.db_path = Path(db_path)
+        if readonly:
+            self.conn = connect_readonly(self.db_path)
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def copy(self) -> "Frontier":
+        """
+        Open an in-memory copy of the frontier, migrated like a newly opened one.
+
+        Writes to the copy never reach this frontier's database, which may be open read-only.
+
+        Returns:
+            The copy
+        """
+        copy = Frontier(Path(":memory:"))
+        self.conn.backup(copy.conn)
+        copy._create_schema()
+        return copy
+
+    def _create_schema(self):
+        """Migrate an existing database, then create any missing tables and indexes."""
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        for table, columns in MIGRATED_COLUMNS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if not existing:
+                continue  # Table doesn't exist yet; SCHEMA creates it with every column
+            for column, column_type in columns.items():
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Frontier key for a URL (the same for every ?p= variant of a tutorial)."""
+        return canonical_url(url)
+
+    def canonicalize(self) -> Tuple[int, List[str]]:
+        """
+        Merge tutorials stored under non-canonical URLs by older runs into one row each.
+
+        Every guide membership is kept (the first position wins when a tutorial
+        was listed twice in one guide). If only one of the duplicates was done,
+        its state, note and validators survive; otherwise the first row does.
+
+        Returns:
+            (number of rows merged away, note paths no surviving tutorial points to)
+        """
+        merged = 0
+        dropped_notes = set()
+        with self._transaction():
+            rows = self.conn.execute("SELECT * FROM tutorials WHERE url LIKE '%?%' ORDER BY rowid").fetchall()
+            for row in rows:
+                key = self.key(row["url"])
+                if key == row["url"]:
+                    continue
+                existing = self.conn.execute("SELECT * FROM tutorials WHERE url = ?", (key,)).fetchone()
+                if existing is None:
+                    self.conn.execute("UPDATE tutorials SET url = ? WHERE url = ?", (key, row["url"]))
+                else:
+                    loser = row
+                    if row["state"] == DONE and existing["state"] != DONE:
+                        assignments = ", ".join(f"{column} = ?" for column in RESULT_COLUMNS)
+                        self.conn.execute(
+                            f"UPDATE tutorials SET {assignments} WHERE url = ?",
+                            [row[column] for column in RESULT_COLUMNS] + [key],
+                        )
+                        loser = existing
+                    if loser["note_path"]:
+                        dropped_notes.add(loser["note_path"])
+                    self.conn.execute("DELETE FROM tutorials WHERE url = ?", (row["url"],))
+                    merged += 1
+                self.conn.execute(
+                    "UPDATE OR IGNORE memberships SET tutorial_url = ? WHERE tutorial_url = ?", (key, row["url"])
+                )
+                self.conn.execute("DELETE FROM memberships WHERE tutorial_url = ?", (row["url"],))
+
+            kept_notes = {
+                row[0] for row in self.conn.execute("SELECT note_path FROM tutorials WHERE note_path IS NOT NULL")
+            }
+        return merged, sorted(dropped_notes - kept_notes)
+
+    def is_seeded(self) -> bool:
+        """Whether any work has been discovered yet."""
+        return self.conn.execute("SELECT 1 FROM tutorials LIMIT 1").fetchone() is not None
+
+    def add_guide(self, url: str, name: str, position: int = 0):
+        """
+        Record a guide.
+
+        Args:
+            url: Guide URL
+            name: Guide name
+            position: Order of the guide in the listing
+        """
+        self.conn.execute(
+            "INSERT INTO guides (url, name, position) VALUES (?, ?, ?) "
+            "ON CONFLICT (url) DO UPDATE SET name = excluded.name",
+            (self.key(url), name, position),
+        )
+
+    def add_tutorials(self, tutorials: Iterable[Dict], completed: Optional[Set[str]] = None) -> int:
+        """
+        Add discovered tutorials in one transaction, ignoring ones already known.
+
+        Each dictionary has 'url' and optionally 'title', 'priority', 'guide_url',
+        'subfolder' and 'position'. A tutorial seen again under another guide only
+        gains the extra membership, and its real title if it was first seen as a
+        slug-titled thumbnail link.
+
+        Args:
+            tutorials: Tutorials to add
+            completed: Keys of tutorials already completed by earlier runs
+
+        Returns:
+            Number of tutorials that were new to the frontier
+        """
+        completed = completed or set()
+        added = 0
+        now = time.time()
+        with self._transaction():
+            for tutorial in tutorials:
+                key = self.key(tutorial["url"])
+                state = DONE if key in completed else PENDING
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO tutorials (url, title, state, priority, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, tutorial.get("title") or "", state, tutorial.get("priority", 0), now),
+                )
+                added += cursor.rowcount
+                if not cursor.rowcount and self._has_real_title(tutorial):
+                    slug = self._slug(tutorial["url"])
+                    self.conn.execute(
+                        "UPDATE tutorials SET title = ? WHERE url = ? AND state != ? "
+                        "AND (title = '' OR title = ? OR substr(title, 1, ?) = ?)",
+                        (tutorial["title"], key, DONE, slug, len(slug) + 1, slug + "?"),
+                    )
+                if tutorial.get("guide_url"):
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO memberships (tutorial_url, guide_url, subfolder, position) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, self.key(tutorial["guide_url"]), tutorial.get("subfolder"), tutorial.get("position", 0)),
+                    )
+        return added
+
+    def reset_in_flight(self) -> int:
+        """
+        Return tutorials claimed by an interrupted run to the state they were claimed from.
+
+        Tutorials claimed out of the failed state by --retry-failed go back to
+        failed, keeping their error, and ones a refresh claimed go back to done;
+        everything else goes back to pending.
+
+        Returns:
+            Number of tutorials reset
+        """
+        cursor = self.conn.execute(
+            "UPDATE tutorials SET state = COALESCE(claimed_from, ?), claimed_from = NULL WHERE state = ?",
+            (PENDING, IN_FLIGHT),
+        )
+        return cursor.rowcount
+
+    def claim_batch(
+        self, limit: int, state: str = PENDING, done_before: Optional[float] = None
+    ) -> List[FrontierEntry]:
+        """
+        Atomically claim up to limit pending tutorials, highest priority first, then in discovery order.
+
+        A refresh also claims done tutorials straight from the done state, so
+        those it never gets to (budget, shutdown) stay done; a claim that is
+        released or interrupted returns to the state it was claimed from.
+
+        Args:
+            limit: Maximum number of tutorials to claim
+            state: State to claim tutorials from (FAILED to retry failures)
+            done_before: Also claim done tutorials last updated before this time (a refresh's start)
+
+        Returns:
+            Claimed entries with their guide memberships
+        """
+        if done_before is None:
+            where, params = "state = ?", [state]
+        else:
+            where, params = "state = ? OR (state = ? AND COALESCE(updated_at, 0) < ?)", [state, DONE, done_before]
+        with self._transaction():
+            rows = self.conn.execute(
+                "UPDATE tutorials SET state = ?, claimed_from = state, attempts = attempts + 1, updated_at = ? "
+                f"WHERE url IN (SELECT url FROM tutorials WHERE {where} ORDER BY priority DESC, rowid LIMIT ?) "
+                "RETURNING rowid, url, title, priority, attempts, note_path, etag, last_modified, content_hash",
+                (IN_FLIGHT, time.time(), *params, limit),
+            ).fetchall()
+        # RETURNING yields rows in no guaranteed order; hand them out in claim order
+        rows.sort(key=lambda row: (-row["priority"], row["rowid"]))
+        entries = [self._entry_from_row(row) for row in rows]
+        for entry in entries:
+            entry.memberships = self.memberships(entry.url)
+        return entries
+
+    def add_manifest(self, data: Dict, completed: Optional[Set[str]] = None) -> int:
+        """
+        Add a URL manifest's guides and tutorials.
+
+        Args:
+            data: Manifest in drupalize_urls.json format
+            completed: Keys of tutorials already completed (added as done)
+
+        Returns:
+            Number of new tutorials
+        """
+        added = 0
+        for guide_position, guide in enumerate(data.get("guides", [])):
+            self.add_guide(guide["url"], guide.get("title") or guide["url"], guide.get("position", guide_position))
+            added += self.add_tutorials(
+                (
+                    {
+                        "url": tutorial["url"],
+                        "title": tutorial.get("title"),
+                        "guide_url": guide["url"],
+                        "subfolder": tutorial.get("subfolder"),
+                        "position": tutorial["position"],
+                    }
+                    for tutorial in self._guide_listing(guide.get("tutorials", []))
+                ),
+                completed,
+            )
+
+        # Tutorials listed without a guide are standalone
+        added += self.add_tutorials(
+            (tutorial for tutorial in data.get("tutorials", []) if not tutorial.get("guideUrl")),
+            completed,
+        )
+        return added
+
+    def _guide_listing(self, tutorials: List[Dict]) -> List[Dict]:
+        """
+        Keep one manifest entry per tutorial in a guide's listing.
+
+        Guide pages can link a tutorial twice: a thumbnail link (?p=0, titled with
+        the URL slug) near the top, then the real entry in the guide's list. An
+        entry with a real title wins over a slug-titled one, otherwise the later
+        entry does, so the tutorial keeps its title and its place in the list.
+
+        Args:
+            tutorials: A guide's manifest entries, in listing order
+
+        Returns:
+            The kept entries in listing order, each with its 'position'
+        """
+        kept: Dict[str, Dict] = {}
+        for i, tutorial in enumerate(tutorials):
+            entry = {**tutorial, "position": tutorial.get("position", i)}
+            key = self.key(entry["url"])
+            current = kept.get(key)
+            if current is None or self._has_real_title(entry) or not self._has_real_title(current):
+                kept[key] = entry
+        return sorted(kept.values(), key=lambda entry: entry["position"])
+
+    @staticmethod
+    def _slug(url: str) -> str:
+        """Last path segment of a URL, which thumbnail links use as their title."""
+        return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+
+    @classmethod
+    def _has_real_title(cls, tutorial: Dict) -> bool:
+        """Whether a manifest entry has a title other than its URL slug."""
+        title = tutorial.get("title") or ""
+        slug = cls._slug(tutorial["url"])
+        return bool(title) and title != slug and not title.startswith(slug + "?")
+
+    def release(self, urls: Iterable[str]) -> int:
+        """
+        Return claimed tutorials that were never started to the state they were claimed from.
+
+        Args:
+            urls: URLs of in-flight tutorials to release
+
+        Returns:
+            Number of tutorials released
+        """
+        released = 0
+        with self._transaction():
+            for url in urls:
+                cursor = self.conn.execute(
+                    "UPDATE tutorials SET state = COALESCE(claimed_from, ?), claimed_from = NULL, "
+                    "attempts = MAX(attempts - 1, 0) WHERE url = ? AND state = ?",
+                    (PENDING, self.key(url), IN_FLIGHT),
+                )
+                released += cursor.rowcount
+        return released
+
+    def prioritize(self, guide_priorities: Dict[str, int]) -> int:
+        """
+        Set the priority of every tutorial (done ones too, for a refresh) from the guides it belongs to.
+
+        A tutorial in several guides takes its highest-priority guide's score;
+        standalone tutorials get 0. Claims follow priority, then discovery order.
+
+        Args:
+            guide_priorities: Priority by guide URL
+
+        Returns:
+            Number of unfinished tutorials whose priority was set above 0
+        """
+        with self._transaction():
+            self.conn.execute("UPDATE tutorials SET priority = 0")
+            for guide_url, priority in sorted(guide_priorities.items(), key=lambda item: item[1]):
+                if priority <= 0:
+                    continue
+                self.conn.execute(
+                    "UPDATE tutorials SET priority = MAX(priority, ?) WHERE url IN "
+                    "(SELECT tutorial_url FROM memberships WHERE guide_url = ?)",
+                    (priority, self.key(guide_url)),
+                )
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM tutorials WHERE state != ? AND priority > 0", (DONE,)
+            ).fetchone()
+        return row[0]
+
+    def entries(self) -> List[FrontierEntry]:
+        """
+        Get every tutorial in the frontier, whatever its state, without claiming it.
+
+        Returns:
+            Entries with their guide memberships, highest priority first
+        """
+        memberships: Dict[str, List[GuideMembership]] = {}
+        rows = self.conn.execute(
+            "SELECT m.tutorial_url, m.guide_url, g.name, m.subfolder, m.position FROM memberships m "
+            "JOIN guides g ON g.url = m.guide_url ORDER BY m.rowid"
+        )
+        for row in rows:
+            memberships.setdefault(row[0], []).append(GuideMembership(row[1], row[2], row[3], row[4]))
+
+        rows = self.conn.execute(
+            "SELECT url, title, priority, attempts, note_path, etag, last_modified, content_hash "
+            "FROM tutorials ORDER BY priority DESC, rowid"
+        )
+        entries = []
+        for row in rows:
+            entry = self._entry_from_row(row)
+            entry.memberships = memberships.get(entry.url, [])
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _entry_from_row(row: sqlite3.Row) -> FrontierEntry:
+        """Build an entry (without memberships) from a tutorials row."""
+        return FrontierEntry(
+            url=row["url"],
+            title=row["title"],
+            priority=row["priority"],
+            attempts=row["attempts"],
+            note_path=row["note_path"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            content_hash=row["content_hash"],
+        )
+
+    def memberships(self, url: str) -> List[GuideMembership]:
+        """
+        Get every guide a tutorial belongs to.
+
+        Args:
+            url: Tutorial URL
+
+        Returns:
+            Memberships in the order they were discovered
+        """
+        rows = self.conn.execute(
+            "SELECT m.guide_url, g.name, m.subfolder, m.position FROM memberships m "
+            "JOIN guides g ON g.url = m.guide_url WHERE m.tutorial_url = ? ORDER BY m.rowid",
+            (self.key(url),),
+        ).fetchall()
+        return [GuideMembership(row[0], row[1], row[2], row[3]) for row in rows]
+
+    def mark_done(
+        self,
+        url: str,
+        title: str,
+        note_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ):
+        """
+        Mark a tutorial as done and remember its refresh validators.
+
+        Args:
+            url: Tutorial URL
+            title: Extracted tutorial title
+            note_path: Path of the written note, relative to the vault root
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+            content_hash: Fingerprint of the extracted content
+        """
+        self.conn.execute(
+            "UPDATE tutorials SET state = ?, title = ?, note_path = ?, etag = ?, last_modified = ?, "
+            "content_hash = ?, last_error = NULL, error_category = NULL, updated_at = ? WHERE url = ?",
+            (DONE, title, note_path, etag, last_modified, content_hash, time.time(), self.key(url)),
+        )
+
+    def mark_unchanged(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Return a refreshed tutorial to done without touching its note.
+
+        Args:
+            url: Tutorial URL
+            etag: New ETag, if the server sent one
+            last_modified: New Last-Modified, if the server sent one
+        """
+        self.conn.execute(
+            "UPDATE tutorials SET state = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+            "last_error = NULL, updated_at = ? WHERE url = ?",
+            (DONE, etag, last_modified, time.time(), self.key(url)),
+        )
+
+    def mark_failed(self, url: str, error: str, category: Optional[str] = None):
+        """
+        Mark a tutorial as failed.
+
+        Args:
+            url: Tutorial URL
+            error: Error message
+            category: Failure category (see scraper.errors)
+        """
+        self.conn.execute(
+            "UPDATE tutorials SET state = ?, last_error = ?, error_category = ?, updated_at = ? WHERE url = ?",
+            (FAILED, error, category, time.time(), self.key(url)),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count tutorials by state.
+
+        Returns:
+            Dictionary mapping state to number of tutorials
+        """
+        rows = self.conn.execute("SELECT state, COUNT(*) FROM tutorials GROUP BY state").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def guides(self) -> List[Dict]:
+        """
+        Get all known guides with their open (pending, in-flight or failed) tutorial counts.
+
+        Returns:
+            List of {'url', 'name', 'open'} dictionaries in listing order
+        """
+        rows = self.conn.execute(
+            "SELECT g.url, g.name, "
+            "(SELECT COUNT(*) FROM memberships m JOIN tutorials t ON t.url = m.tutorial_url "
+            " WHERE m.guide_url = g.url AND t.state != ?) "
+            "FROM guides g ORDER BY g.position, g.rowid",
+            (DONE,),
+        ).fetchall()
+        return [{"url": row[0], "name": row[1], "open": row[2]} for row in rows]
+
+    def guide_tutorials(self, guide_url: str) -> List[Dict]:
+        """
+        Get a guide's completed tutorials in guide order.
+
+        Args:
+            guide_url: Guide URL
+
+        Returns:
+            List of {'url', 'title', 'subfolder', 'position', 'note_path'} dictionaries
+        """
+        rows = self.conn.execute(
+            "SELECT t.url, t.title, m.subfolder, m.position, t.note_path FROM memberships m "
+            "JOIN tutorials t ON t.url = m.tutorial_url "
+            "WHERE m.guide_url = ? AND t.state = ? ORDER BY m.position",
+            (self.key(guide_url), DONE),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def tutorials_by_guide(self, states: Iterable[str]) -> Dict[str, List[Dict]]:
+        """
+        Get the tutorials in the given states, grouped under the guide each one is scraped into.
+
+        A tutorial in several guides is listed once, under its first guide, like the job built for it.
+
+        Args:
+            states: Tutorial states to include
+
+        Returns:
+            Guide URL ('' for standalone tutorials) -> list of {'url', 'title', 'position'} in guide order
+        """
+        states = list(states)
+        rows = self.conn.execute(
+            "SELECT t.url, t.title, m.guide_url, m.position FROM tutorials t LEFT JOIN memberships m "
+            "ON m.rowid = (SELECT MIN(rowid) FROM memberships WHERE tutorial_url = t.url) "
+            f"WHERE t.state IN ({', '.join('?' * len(states))}) ORDER BY m.position, t.rowid",
+            states,
+        )
+        grouped: Dict[str, List[Dict]] = {}
+        for row in rows:
+            grouped.setdefault(row["guide_url"] or "", []).append(
+                {"url": row["url"], "title": row["title"], "position": row["position"]}
+            )
+        return grouped
+
+    def note_owners(self) -> Dict[str, str]:
+        """
+        Map the note path of every completed tutorial to its URL.
+
+        Returns:
+            Dictionary of vault-relative note path -> tutorial URL
+        """
+        rows = self.conn.execute(
+            "SELECT note_path, url FROM tutorials WHERE state = ? AND note_path IS NOT NULL", (DONE,)
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def merge_from(self, other_path: Path) -> int:
+        """
+        Merge another frontier database (e.g. a shard's) into this one.
+
+        Guides and memberships are unioned. A tutorial already present is
+        only replaced when the other copy is done and this one isn't.
+
+        Args:
+            other_path: Path of the frontier database to merge
+
+        Returns:
+            Number of tutorials in the other frontier
+        """
+        columns = (
+            "url, title, state, priority, attempts, last_error, error_category, note_path, "
+            "etag, last_modified, content_hash, updated_at"
+        )
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns.split(", ")[1:])
+        self.conn.execute("ATTACH DATABASE ? AS other", (str(other_path),))
+        try:
+            with self._transaction():
+                self.conn.execute(
+                    "INSERT INTO guides (url, name, position) SELECT url, name, position FROM other.guides "
+                    "WHERE true ON CONFLICT (url) DO NOTHING"
+                )
+                self.conn.execute(
+                    f"INSERT INTO tutorials ({columns}) SELECT {columns} FROM other.tutorials WHERE true "
+                    f"ON CONFLICT (url) DO UPDATE SET {updates} "
+                    "WHERE tutorials.state != ? AND excluded.state = ?",
+                    (DONE, DONE),
+                )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO memberships (tutorial_url, guide_url, subfolder, position) "
+                    "SELECT tutorial_url, guide_url, subfolder, position FROM other.memberships"
+                )
+                count = self.conn.execute("SELECT COUNT(*) FROM other.tutorials").fetchone()[0]
+        finally:
+            self.conn.execute("DETACH DATABASE other")
+        return count
+
+    @contextmanager
+    def _transaction(self):
+        """Run the block in an immediate (write-locking) transaction."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
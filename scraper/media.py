@@ -0,0 +1,183 @@
+"""Run-wide background media download service."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from scraper.downloader import MediaDownloader
+from scraper.ratelimit import AIMDController
+from scraper.urls import normalize_url
+
+
+@dataclass
+class MediaStats:
+    """Counters for the media service."""
+
+    requested: int = 0
+    coalesced: int = 0
+    downloaded: int = 0
+    failed: int = 0
+    captured: int = 0
+    deferred: int = 0
+
+    def summary(self) -> str:
+        """Human-readable summary of media activity."""
+        unique = self.requested - self.coalesced
+        return (
+            f"{self.requested} requested, {unique} unique, {self.coalesced} deduplicated, "
+            f"{self.downloaded} saved, {self.failed} failed, {self.captured} captured from rendered pages, "
+            f"{self.deferred} deferred"
+        )
+
+
+class MediaService:
+    """Downloads each unique media URL once, in the background, for the whole run."""
+
+    def __init__(
+        self,
+        downloader: MediaDownloader,
+        max_concurrent: int = 5,
+        control: Optional[AIMDController] = None,
+        defer: Optional[Callable[[str, str], bool]] = None,
+    ):
+        """
+        Initialize media service.
+
+        Args:
+            downloader: MediaDownloader with a run-scoped session
+            max_concurrent: Maximum concurrent downloads across all tutorials (when no controller is given)
+            control: Optional adaptive concurrency controller for downloads
+            defer: Optional predicate on (url, media_type); matching files are recorded in
+                deferred instead of downloaded. Checked on submit and again when a queued download starts.
+        """
+        self.downloader = downloader
+        self.stats = MediaStats()
+        self.control = control or AIMDController.fixed("media", max_concurrent)
+        self.defer = defer
+        self.deferred: Dict[str, str] = {}  # URL -> media type, for a later run
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    def submit(self, url: str, media_type: str = "image") -> asyncio.Future:
+        """
+        Request a media file without waiting for it.
+
+        Concurrent and repeated requests for the same normalized URL share a
+        single in-flight download. A failed download is forgotten once it
+        ends, so a later request for the URL tries again.
+
+        Args:
+            url: Media URL
+            media_type: Type of media ('image' or 'video')
+
+        Returns:
+            Future resolving to the local file path, or None if the download failed
+        """
+        self.stats.requested += 1
+        key = normalize_url(url)
+        future = self._futures.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            return future
+
+        if self._defer(url, media_type):
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+        else:
+            future = self._track(key, url, self._download(url, media_type))
+        self._futures[key] = future
+        return future
+
+    def _track(self, key: str, url: str, download: Awaitable[Optional[str]]) -> asyncio.Future:
+        """Start a download for a URL key, dropping it from the cache if it fails."""
+        future = asyncio.ensure_future(download)
+
+        def forget_failure(done: asyncio.Future):
+            failed = done.cancelled() or done.exception() is not None or done.result() is None
+            if failed and url not in self.deferred and self._futures.get(key) is done:
+                del self._futures[key]
+
+        future.add_done_callback(forget_failure)
+        return future
+
+    def _defer(self, url: str, media_type: str) -> bool:
+        """Record the file as deferred if the defer predicate says so."""
+        if not (self.defer and self.defer(url, media_type)):
+            return False
+        self.deferred[url] = media_type
+        self.stats.deferred += 1
+        return True
+
+    def submit_all(self, images: List[str], videos: List[str]) -> Dict[str, asyncio.Future]:
+        """
+        Request every image and video of a tutorial.
+
+        Args:
+            images: List of image URLs
+            videos: List of video URLs
+
+        Returns:
+            Dictionary mapping original URLs to their download futures
+        """
+        futures = {url: self.submit(url, "image") for url in images}
+        futures.update({url: self.submit(url, "video") for url in videos})
+        return futures
+
+    def capture(self, url: str, media_type: str, read_body: Callable[[], Awaitable[bytes]]):
+        """
+        Accept a media response the browser already received, instead of downloading it again.
+
+        The URL is registered immediately, so later submit() calls for it wait
+        for the captured bytes to be written rather than starting a download.
+        URLs that are already known are left alone.
+
+        Args:
+            url: Media URL
+            media_type: Type of media ('image' or 'video')
+            read_body: Coroutine function returning the response body
+        """
+        key = normalize_url(url)
+        if key not in self._futures:
+            self._futures[key] = self._track(key, url, self._save_captured(url, media_type, read_body))
+
+    async def _save_captured(
+        self, url: str, media_type: str, read_body: Callable[[], Awaitable[bytes]]
+    ) -> Optional[str]:
+        """Write a captured body to the assets directory, downloading instead if the body is gone."""
+        try:
+            body = await read_body()
+        except Exception:
+            body = b""  # e.g. the page navigated away before the body was read
+        if not body:
+            return await self._download(url, media_type)
+        path = await self.downloader.save_media(url, body, media_type)
+        self.stats.captured += 1
+        return path
+
+    async def _download(self, url: str, media_type: str) -> Optional[str]:
+        """Download one file under the service-wide concurrency limit."""
+        async with self.control.slot() as outcome:
+            if self._defer(url, media_type):
+                return None  # e.g. the run's byte budget ran out while this download was queued
+            path = await self.downloader.download_media(url, media_type, outcome=outcome)
+        if path:
+            self.stats.downloaded += 1
+        else:
+            self.stats.failed += 1
+        return path
+
+    @property
+    def pending(self) -> int:
+        """Number of downloads not finished yet."""
+        return sum(1 for future in self._futures.values() if not future.done())
+
+    async def cancel(self):
+        """Cancel unfinished downloads (their partial files are removed) and wait for them to unwind."""
+        pending = [future for future in self._futures.values() if not future.done()]
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def drain(self):
+        """Wait for every submitted download to finish."""
+        if self._futures:
+            await asyncio.gather(*self._futures.values(), return_exceptions=True)
@@ -0,0 +1,108 @@
+"""Runtime metrics for scraper runs."""
+
+import asyncio
+import time
+from typing import List, Optional
+
+
+class LoopLagMonitor:
+    """Measures how long the asyncio event loop is blocked by synchronous work."""
+
+    def __init__(self, interval: float = 0.05, stall_threshold: float = 0.1):
+        """
+        Initialize loop lag monitor.
+
+        Args:
+            interval: Seconds between probes
+            stall_threshold: Lag in seconds above which a probe counts as a stall
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.samples = 0
+        self.stalls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start probing the running event loop."""
+        self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        """Stop probing."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self):
+        """Sleep for the interval and record how late the loop woke us up."""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - expected, 0.0)
+            self.samples += 1
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.stall_threshold:
+                self.stalls += 1
+
+    @property
+    def mean_lag(self) -> float:
+        """Average lag per probe in seconds."""
+        return self.total_lag / self.samples if self.samples else 0.0
+
+    def summary(self) -> str:
+        """Human-readable summary of event-loop blocking."""
+        return (
+            f"max {self.max_lag * 1000:.0f} ms, mean {self.mean_lag * 1000:.1f} ms, "
+            f"{self.stalls} stalls >= {self.stall_threshold * 1000:.0f} ms, "
+            f"{self.total_lag:.1f}s blocked in total"
+        )
+
+
+class LatencyStats:
+    """Collects durations and summarizes their distribution."""
+
+    def __init__(self, name: str):
+        """
+        Initialize latency stats.
+
+        Args:
+            name: Label used in the summary
+        """
+        self.name = name
+        self.samples: List[float] = []
+
+    def record(self, seconds: float):
+        """Record one duration in seconds."""
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Get a percentile of the recorded durations.
+
+        Args:
+            fraction: Percentile as a fraction (e.g. 0.95)
+
+        Returns:
+            Duration in seconds, or 0 if nothing was recorded
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(int(fraction * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+    def summary(self) -> str:
+        """Human-readable summary of the distribution."""
+        if not self.samples:
+            return f"{self.name}: no samples"
+        mean = sum(self.samples) / len(self.samples)
+        return (
+            f"{self.name}: {len(self.samples)} pages, mean {mean:.2f}s, p50 {self.percentile(0.5):.2f}s, "
+            f"p95 {self.percentile(0.95):.2f}s, max {max(self.samples):.2f}s"
+        )
@@ -0,0 +1,202 @@
+"""Staged asyncio pipeline connected by bounded queues."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+# Marker put on a stage queue once per worker when upstream has finished
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """A single pipeline stage: an async handler run by N workers."""
+
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Any]]]
+    concurrency: int = 1
+    queue_size: int = 8
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def throughput(self) -> float:
+        """Items completed per second since the pipeline started."""
+        elapsed = time.monotonic() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class Pipeline:
+    """Runs jobs through a sequence of stages, each with its own concurrency."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_complete: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+    ):
+        """
+        Initialize pipeline.
+
+        A handler returning None ends the job early (it is counted as dropped and
+        not passed downstream). An exception is reported through on_error.
+
+        Args:
+            stages: Stages in processing order
+            on_complete: Called with each job that leaves the last stage
+            on_error: Called with (stage name, job, exception) when a handler raises
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.queues = [asyncio.Queue(maxsize=max(stage.queue_size, 1)) for stage in stages]
+        self.stats: Dict[str, StageStats] = {stage.name: StageStats() for stage in stages}
+        self._workers: List[List[asyncio.Task]] = []
+
+    def start(self):
+        """Start every stage's workers."""
+        for index, stage in enumerate(self.stages):
+            self._workers.append(
+                [asyncio.create_task(self._worker(index)) for _ in range(max(stage.concurrency, 1))]
+            )
+
+    async def put(self, job: Any):
+        """Submit a job to the first stage, waiting if its queue is full."""
+        await self.queues[0].put(job)
+
+    async def close(self):
+        """Signal that no more jobs will be submitted."""
+        for _ in self._workers[0]:
+            await self.queues[0].put(_STOP)
+
+    async def join(self):
+        """Wait until every submitted job has left the pipeline."""
+        for index, workers in enumerate(self._workers):
+            await asyncio.gather(*workers)
+            if index + 1 < len(self._workers):
+                for _ in self._workers[index + 1]:
+                    await self.queues[index + 1].put(_STOP)
+
+    async def cancel(self):
+        """Cancel every worker, abandoning the jobs they hold, and wait for them to unwind."""
+        workers = [worker for stage_workers in self._workers for worker in stage_workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self, index: int):
+        """Process jobs from one stage's queue until told to stop."""
+        stage = self.stages[index]
+        stats = self.stats[stage.name]
+        queue = self.queues[index]
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            job = await queue.get()
+            if job is _STOP:
+                return
+
+            stats.in_flight += 1
+            started = time.monotonic()
+            try:
+                result = await stage.handler(job)
+            except Exception as e:
+                stats.failed += 1
+                if self.on_error:
+                    self.on_error(stage.name, job, e)
+                continue
+            finally:
+                stats.in_flight -= 1
+                stats.busy_seconds += time.monotonic() - started
+
+            if result is None:
+                stats.dropped += 1
+                continue
+
+            stats.processed += 1
+            if is_last:
+                if self.on_complete:
+                    self.on_complete(result)
+            else:
+                await self.queues[index + 1].put(result)
+
+    def snapshot(self) -> List[Dict]:
+        """
+        Get current queue depths and stage counters.
+
+        Returns:
+            One dictionary per stage, in pipeline order
+        """
+        rows = []
+        for stage, queue in zip(self.stages, self.queues):
+            stats = self.stats[stage.name]
+            rows.append(
+                {
+                    "stage": stage.name,
+                    "queued": queue.qsize(),
+                    "queue_size": queue.maxsize,
+                    "in_flight": stats.in_flight,
+                    "workers": stage.concurrency,
+                    "processed": stats.processed,
+                    "dropped": stats.dropped,
+                    "failed": stats.failed,
+                    "per_second": stats.throughput(),
+                    "busy_seconds": stats.busy_seconds,
+                }
+            )
+        return rows
+
+    def status_line(self) -> str:
+        """One-line summary of queue depths and throughput, for periodic logging."""
+        parts = []
+        for row in self.snapshot():
+            parts.append(
+                f"{row['stage']} q={row['queued']}/{row['queue_size']} "
+                f"busy={row['in_flight']}/{row['workers']} done={row['processed']} "
+                f"({row['per_second']:.2f}/s)"
+            )
+        return " | ".join(parts)
+
+    async def report_periodically(self, console: Console, interval: float):
+        """
+        Log the status line every interval seconds until cancelled.
+
+        Args:
+            console: Console to log to
+            interval: Seconds between reports
+        """
+        while True:
+            await asyncio.sleep(interval)
+            console.log(f"[dim]{self.status_line()}[/dim]")
+
+    def summary_table(self) -> Table:
+        """Build a Rich table summarizing every stage."""
+        table = Table(title="Pipeline stages")
+        for column in ["Stage", "Workers", "Processed", "Dropped", "Failed", "Items/s", "Busy (s)"]:
+            table.add_column(column, justify="left" if column == "Stage" else "right")
+        for row in self.snapshot():
+            table.add_row(
+                row["stage"],
+                str(row["workers"]),
+                str(row["processed"]),
+                str(row["dropped"]),
+                str(row["failed"]),
+                f"{row['per_second']:.2f}",
+                f"{row['busy_seconds']:.1f}",
+            )
+        return table
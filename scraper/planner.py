@@ -0,0 +1,198 @@
+"""Dry-run planning: the work a run would do and how long it would take."""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scraper.budget import guide_priorities
+from scraper.frontier import DONE, FAILED, IN_FLIGHT, PENDING, Frontier
+from scraper.pipeline import StageStats
+from scraper.progress import ProgressStore
+from scraper.shards import Shard
+from scraper.vault import VaultManager
+
+# Earlier runs kept in run_stats.json for throughput estimates
+RUN_HISTORY = 10
+
+
+class RunHistory:
+    """Throughput of earlier runs, kept in _metadata/run_stats.json."""
+
+    filename = "run_stats.json"
+
+    def __init__(self, vault: VaultManager):
+        """
+        Initialize run history.
+
+        Args:
+            vault: Vault whose metadata directory holds the history
+        """
+        self.vault = vault
+
+    def runs(self) -> List[Dict]:
+        """Get the recorded runs, oldest first."""
+        return self.vault.load_metadata(self.filename).get("runs", [])
+
+    def record(self, fetched: StageStats, transferred: int, media_files: int):
+        """
+        Record a finished run, keeping the last RUN_HISTORY.
+
+        Only tutorials the fetch stage got a page for (or failed on) count. Its drops (refreshed
+        tutorials the site answered 304 for, and jobs handed back unstarted) aren't scrapes, and
+        counting them would skew the per-tutorial rates the dry-run estimates use.
+
+        Args:
+            fetched: Fetch stage counters of the run's pipeline
+            transferred: Bytes of pages and media transferred
+            media_files: Media files downloaded or captured
+        """
+        tutorials = fetched.processed + fetched.failed
+        if tutorials <= 0:
+            return
+        run = {
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tutorials": tutorials,
+            "seconds": round(time.monotonic() - fetched.started_at, 1),
+            "bytes": transferred,
+            "media_files": media_files,
+        }
+        self.vault.save_metadata({"runs": (self.runs() + [run])[-RUN_HISTORY:]}, self.filename)
+
+    def rates(self) -> Optional[Dict[str, float]]:
+        """
+        Average throughput over the recorded runs.
+
+        Returns:
+            {'runs', 'seconds_per_tutorial', 'bytes_per_tutorial', 'media_per_tutorial'}, or None without history
+        """
+        runs = self.runs()
+        tutorials = sum(run["tutorials"] for run in runs)
+        if not tutorials:
+            return None
+        return {
+            "runs": len(runs),
+            "seconds_per_tutorial": sum(run["seconds"] for run in runs) / tutorials,
+            "bytes_per_tutorial": sum(run["bytes"] for run in runs) / tutorials,
+            "media_per_tutorial": sum(run["media_files"] for run in runs) / tutorials,
+        }
+
+
+@dataclass
+class RunPlan:
+    """What a run would do, worked out without touching the network."""
+
+    source: str
+    counts: Dict[str, int] = field(default_factory=dict)
+    to_fetch: int = 0
+    guides: List[Dict] = field(default_factory=list)  # Guides with open work, in the order they'd be scraped
+    tutorials: Dict[str, List[Dict]] = field(default_factory=dict)  # Guide URL ('' standalone) -> tutorials to fetch
+    deferred_media: Dict[str, int] = field(default_factory=dict)  # Media type -> files left by earlier runs
+    deferred: List[Dict] = field(default_factory=list)  # The deferred {'url', 'media_type'} items themselves
+    assets: Dict[str, int] = field(default_factory=dict)  # 'images'/'videos' -> files already in the vault
+    rates: Optional[Dict[str, float]] = None
+
+    @property
+    def estimated_seconds(self) -> Optional[float]:
+        """Wall-clock estimate for the fetch work, from earlier runs' throughput."""
+        return self.to_fetch * self.rates["seconds_per_tutorial"] if self.rates else None
+
+    @property
+    def estimated_bytes(self) -> Optional[float]:
+        """Transfer estimate for the fetch work, from earlier runs' throughput."""
+        return self.to_fetch * self.rates["bytes_per_tutorial"] if self.rates else None
+
+    @property
+    def estimated_media(self) -> Optional[float]:
+        """Media files the fetched tutorials are expected to reference."""
+        return self.to_fetch * self.rates["media_per_tutorial"] if self.rates else None
+
+
+def _count_files(directory: Path) -> int:
+    """Count the files directly in a directory (one directory read, no per-file stat)."""
+    if not directory.is_dir():
+        return 0
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.is_file())
+
+
+def plan_run(
+    frontier: Frontier,
+    progress: ProgressStore,
+    vault: VaultManager,
+    urls_file: Optional[Path] = None,
+    rediscover: bool = False,
+    retry_failed: bool = False,
+    refresh: bool = False,
+    priority: str = "guide-order",
+    shard: Optional[Shard] = None,
+    list_tutorials: bool = False,
+) -> RunPlan:
+    """
+    Work out what a run with these options would do.
+
+    Uses the frontier when an earlier run seeded it, otherwise the URL
+    manifest seeded into an in-memory copy of it with progress applied,
+    so the same indexed queries answer both. Only reads: pass the frontier
+    and progress opened read-only, and nothing in the vault is written.
+
+    Args:
+        frontier: The vault's frontier (read-only), or an empty in-memory one if it has none
+        progress: The vault's progress (read-only)
+        vault: The vault
+        urls_file: URL manifest a new frontier would be seeded from
+        rediscover: Plan from the manifest even if the frontier is seeded
+        retry_failed: Plan a --retry-failed run
+        refresh: Plan a --refresh run (completed tutorials are re-checked)
+        priority: Priority policy the run would use
+        shard: Shard of the manifest the run would seed
+        list_tutorials: Also collect every tutorial the run would fetch (RunPlan.tutorials)
+
+    Returns:
+        RunPlan
+    """
+    source = "frontier"
+    if not frontier.is_seeded() or (rediscover and urls_file):
+        if not urls_file:
+            return RunPlan(source="site crawl (no frontier or manifest yet; counts known after discovery)")
+        with open(urls_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if shard:
+            data = shard.filter_manifest(data)
+        # Seed an in-memory copy, so rediscovery keeps the states the frontier already has
+        seeded = frontier.copy()
+        seeded.add_manifest(data, {Frontier.key(url) for url in progress.get_completed_urls()})
+        frontier = seeded
+        source = f"manifest {urls_file}"
+
+    counts = frontier.counts()
+    if retry_failed:
+        states = [FAILED]
+    else:
+        states = [PENDING, IN_FLIGHT] + ([DONE] if refresh else [])
+    to_fetch = sum(counts.get(state, 0) for state in states)
+
+    guides = frontier.guides()
+    scores = guide_priorities(guides, priority)
+    ranked = sorted(
+        (guide for guide in guides if guide["open"]), key=lambda guide: -scores.get(guide["url"], 0)
+    )
+
+    deferred_items = vault.load_metadata("deferred_media.json").get("media", [])
+    deferred: Dict[str, int] = {}
+    for item in deferred_items:
+        deferred[item["media_type"]] = deferred.get(item["media_type"], 0) + 1
+
+    return RunPlan(
+        source=source,
+        counts=counts,
+        to_fetch=to_fetch,
+        guides=ranked,
+        tutorials=frontier.tutorials_by_guide(states) if list_tutorials else {},
+        deferred_media=deferred,
+        deferred=deferred_items,
+        assets={"images": _count_files(vault.images_dir), "videos": _count_files(vault.videos_dir)},
+        rates=RunHistory(vault).rates(),
+    )
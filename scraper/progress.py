@@ -1,49 +1,593 @@
 """Progress tracking and resume capability."""
 
+import atexit
 import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Optional, Set
 
+from scraper.storage import connect_readonly
 
-class ProgressTracker:
-    """Tracks scraping progress and enables resuming."""
+# Progress storage: a JSON file, a JSON snapshot plus an append-only journal, or a SQLite database
+PROGRESS_BACKENDS = ["json", "journal", "sqlite"]
 
-    def __init__(self, metadata_dir: Path):
+# Default write-behind policy: flush after this many seconds or this many changes, whichever comes first
+FLUSH_INTERVAL = 5.0
+FLUSH_EVERY = 100
+
+# Journal size at which it is folded into the progress.json snapshot
+COMPACT_BYTES = 1_000_000
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completed_guides (
+    url TEXT PRIMARY KEY,
+    completed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS completed_tutorials (
+    url TEXT PRIMARY KEY,
+    completed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS failed_tutorials (
+    url TEXT PRIMARY KEY,
+    error TEXT,
+    category TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    failed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_failed_category ON failed_tutorials (category);
+"""
+
+
+class ProgressStore(ABC):
+    """
+    Interface of a progress backend.
+
+    Progress is which guides and tutorials are completed and which tutorials
+    failed. load() and save() exchange it as a dictionary in the progress.json
+    format, whatever the backend stores. A backend must implement every
+    abstract method; one that doesn't cannot be instantiated.
+    """
+
+    @abstractmethod
+    def load(self) -> Dict:
+        """Get all progress as a progress.json-format dictionary."""
+
+    @abstractmethod
+    def save(self, progress: Dict):
+        """Replace all progress with a progress.json-format dictionary."""
+
+    @abstractmethod
+    def is_guide_completed(self, guide_url: str) -> bool:
+        """Check if a guide has been completed."""
+
+    @abstractmethod
+    def is_tutorial_completed(self, tutorial_url: str) -> bool:
+        """Check if a tutorial has been completed."""
+
+    @abstractmethod
+    def mark_guide_completed(self, guide_url: str):
+        """Mark a guide as completed."""
+
+    @abstractmethod
+    def mark_tutorial_completed(self, tutorial_url: str):
+        """Mark a tutorial as completed, clearing any earlier failure."""
+
+    def mark_tutorials_completed(self, tutorial_urls: Iterable[str]):
+        """Mark several tutorials as completed."""
+        for url in tutorial_urls:
+            self.mark_tutorial_completed(url)
+
+    @abstractmethod
+    def mark_tutorial_failed(
+        self, tutorial_url: str, error: str, category: Optional[str] = None, attempts: int = 1
+    ):
+        """Mark a tutorial as failed, replacing any earlier failure of the same URL."""
+
+    @abstractmethod
+    def get_completed_urls(self) -> Set[str]:
+        """Get set of all completed guide and tutorial URLs."""
+
+    def flush(self):
+        """Make every mark so far durable."""
+
+    def close(self):
+        """Flush and release the backend."""
+        self.flush()
+
+
+class ProgressTracker(ProgressStore):
+    """
+    Tracks scraping progress in progress.json and enables resuming.
+
+    Progress is loaded once into memory and marks are applied there; the
+    progress file is rewritten (atomically, in the same JSON format) behind
+    them: every flush_interval seconds while there are unsaved changes, after
+    flush_every changes, and on close(). A crash loses at most one flush
+    interval of marks, which the frontier records as well.
+    """
+
+    def __init__(
+        self,
+        metadata_dir: Path,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_every: int = FLUSH_EVERY,
+        readonly: bool = False,
+    ):
         """
         Initialize progress tracker.
 
         Args:
             metadata_dir: Directory to store progress metadata
+            flush_interval: Maximum seconds unsaved changes stay in memory (0 flushes on every change)
+            flush_every: Flush once this many changes are unsaved
+            readonly: Only read progress, creating nothing; marking or saving raises RuntimeError (dry runs)
         """
         self.metadata_dir = Path(metadata_dir)
-        self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        self.readonly = readonly
+        if not readonly:
+            self.metadata_dir.mkdir(parents=True, exist_ok=True)
         self.progress_file = self.metadata_dir / "progress.json"
+        self.flush_interval = flush_interval
+        self.flush_every = max(flush_every, 1)
+        self.flushes = 0
+
+        # Dicts with None values are insertion-ordered sets, so the file keeps its order
+        self._completed_guides: Optional[Dict[str, None]] = None
+        self._completed_tutorials: Dict[str, None] = {}
+        self._failed: Dict[str, Dict] = {}
+        self._other: Dict = {}  # Keys this tracker doesn't manage, written back unchanged
+        self._dirty = 0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _ensure_loaded(self):
+        """Read the progress file into memory the first time progress is needed."""
+        if self._completed_guides is None:
+            self._replace(self._read())
+
+    def _replace(self, progress: Dict):
+        """Replace the in-memory progress with a progress dictionary."""
+        progress = dict(progress)
+        self._completed_guides = dict.fromkeys(progress.pop("completed_guides", []))
+        self._completed_tutorials = dict.fromkeys(progress.pop("completed_tutorials", []))
+        self._failed = {entry["url"]: dict(entry) for entry in progress.pop("failed_tutorials", [])}
+        self._other = progress
+
+    def _read(self) -> Dict:
+        """Parse the progress file, or return empty progress."""
+        if self.progress_file.exists():
+            with open(self.progress_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
 
     def load(self) -> Dict:
         """
-        Load progress from file.
+        Get all progress.
 
         Returns:
-            Progress dictionary
+            Progress dictionary (a copy; pass it to save() to replace the progress)
         """
-        if self.progress_file.exists():
-            with open(self.progress_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "completed_guides": list(self._completed_guides),
+                "completed_tutorials": list(self._completed_tutorials),
+                "failed_tutorials": [dict(entry) for entry in self._failed.values()],
+                **self._other,
+            }
+
+    def save(self, progress: Dict):
+        """
+        Replace all progress and write it to file immediately.
+
+        Args:
+            progress: Progress dictionary to save
+        """
+        self._check_writable()
+        with self._lock:
+            self._replace(progress)
+            self._dirty += 1
+            self.flush()
+
+    def flush(self):
+        """Write unsaved changes to the progress file atomically (temporary file, fsync, rename)."""
+        with self._lock:
+            if self._dirty:
+                self._write_snapshot()
+
+    def _write_snapshot(self):
+        """Rewrite the progress file from memory atomically."""
+        with self._lock:
+            temporary = self.progress_file.with_name(f".{self.progress_file.name}.tmp")
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(self.load(), f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.progress_file)
+            self._dirty = 0
+            self.flushes += 1
+
+    def close(self):
+        """Stop the background flusher and write any unsaved changes."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+            atexit.unregister(self.close)
+        self.flush()
+
+    def _changed(self, change: Dict):
+        """Count an in-memory change and flush if the write-behind policy says so."""
+        self._dirty += 1
+        if self._dirty >= self.flush_every or self.flush_interval <= 0:
+            self.flush()
+        elif self._flusher is None:
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_periodically, name="progress-flush", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _flush_periodically(self):
+        """Background thread: flush unsaved changes every flush_interval seconds until closed."""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def is_guide_completed(self, guide_url: str) -> bool:
+        """
+        Check if a guide has been completed.
+
+        Args:
+            guide_url: URL of the guide
+
+        Returns:
+            True if guide is completed
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return guide_url in self._completed_guides
+
+    def is_tutorial_completed(self, tutorial_url: str) -> bool:
+        """
+        Check if a tutorial has been completed.
+
+        Args:
+            tutorial_url: URL of the tutorial
+
+        Returns:
+            True if tutorial is completed
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return tutorial_url in self._completed_tutorials
+
+    def mark_guide_completed(self, guide_url: str):
+        """
+        Mark a guide as completed.
+
+        Args:
+            guide_url: URL of the guide
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if guide_url not in self._completed_guides:
+                self._record({"op": "guide_completed", "url": guide_url})
+
+    def mark_tutorial_completed(self, tutorial_url: str):
+        """
+        Mark a tutorial as completed.
+
+        Args:
+            tutorial_url: URL of the tutorial
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if tutorial_url in self._completed_tutorials and tutorial_url not in self._failed:
+                return
+            self._record({"op": "tutorials_completed", "urls": [tutorial_url]})
+
+    def mark_tutorials_completed(self, tutorial_urls: Iterable[str]):
+        """
+        Mark several tutorials as completed, as one change.
+
+        Args:
+            tutorial_urls: URLs of the tutorials
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._record({"op": "tutorials_completed", "urls": list(tutorial_urls)})
+
+    def mark_tutorial_failed(
+        self, tutorial_url: str, error: str, category: Optional[str] = None, attempts: int = 1
+    ):
+        """
+        Mark a tutorial as failed, replacing any earlier failure of the same URL.
+
+        Args:
+            tutorial_url: URL of the tutorial
+            error: Error message
+            category: Failure category (timeout, http_status, challenge, network, parse or write)
+            attempts: Attempts made in this run; added to the attempts of earlier runs
+        """
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._failed.get(tutorial_url)
+            if previous:
+                attempts += previous.get("attempts", 1)
+            self._record({
+                "op": "tutorial_failed",
+                "url": tutorial_url,
+                "error": error,
+                "category": category,
+                "attempts": attempts,
+            })
+
+    def _check_writable(self):
+        """Refuse changes to progress opened read-only."""
+        if self.readonly:
+            raise RuntimeError(f"Progress in {self.metadata_dir} was opened read-only")
+
+    def _record(self, change: Dict):
+        """Apply a change in memory and hand it to the write policy."""
+        self._check_writable()
+        self._apply(change)
+        self._changed(change)
+
+    def _apply(self, change: Dict):
+        """
+        Apply one change to the in-memory progress.
+
+        Changes carry their outcome (e.g. total attempts), so applying one twice is harmless.
+
+        Args:
+            change: {'op': 'guide_completed' | 'tutorials_completed' | 'tutorial_failed', ...}
+        """
+        op = change["op"]
+        if op == "guide_completed":
+            self._completed_guides[change["url"]] = None
+        elif op == "tutorials_completed":
+            for url in change["urls"]:
+                self._completed_tutorials[url] = None
+                # A retried tutorial that now succeeded is no longer failed
+                self._failed.pop(url, None)
+        elif op == "tutorial_failed":
+            self._failed.pop(change["url"], None)  # Re-insert so the latest failure comes last
+            self._failed[change["url"]] = {key: change[key] for key in ("url", "error", "category", "attempts")}
+        else:
+            raise ValueError(f"Unknown progress change: {op}")
+
+    def get_completed_urls(self) -> Set[str]:
+        """
+        Get set of all completed URLs.
+
+        Returns:
+            Set of completed URLs
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return set(self._completed_guides) | set(self._completed_tutorials)
+
+
+class JournalProgress(ProgressTracker):
+    """
+    Tracks scraping progress as progress.json plus an append-only journal.
+
+    Every mark appends one JSON line to progress.journal.jsonl and fsyncs it,
+    so a mark costs O(1) and is durable when it returns. On startup the
+    journal is replayed on top of the progress.json snapshot; once it grows
+    past compact_bytes (and on close) it is folded into a new snapshot and
+    truncated. A line torn by a crash mid-append is dropped.
+    """
+
+    def __init__(self, metadata_dir: Path, compact_bytes: int = COMPACT_BYTES, readonly: bool = False):
+        """
+        Initialize journal progress.
+
+        Args:
+            metadata_dir: Directory holding progress.json and progress.journal.jsonl
+            compact_bytes: Journal size that triggers compaction into the snapshot
+            readonly: Only read progress: the journal is replayed but never written or compacted (dry runs)
+        """
+        super().__init__(metadata_dir, readonly=readonly)
+        self.journal_file = self.metadata_dir / "progress.journal.jsonl"
+        if not readonly:
+            self.journal_file.touch()
+        self.compact_bytes = compact_bytes
+        self.compactions = 0
+        self._journal = None
+
+    def _ensure_loaded(self):
+        """Read the snapshot and replay the journal the first time progress is needed."""
+        if self._completed_guides is not None:
+            return
+        super()._ensure_loaded()
+        if self.readonly and not self.journal_file.exists():
+            return
+        torn = False
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    torn = True  # Final line cut off by a crash mid-append
+                    break
+                self._apply(change)
+        # Compacting also drops a torn line, so new appends start on a clean line
+        if self.readonly:
+            return
+        if torn or self.journal_file.stat().st_size >= self.compact_bytes:
+            self.compact()
+
+    def save(self, progress: Dict):
+        """
+        Replace all progress and write it as a new snapshot.
+
+        Args:
+            progress: Progress dictionary to save
+        """
+        self._check_writable()
+        with self._lock:
+            self._replace(progress)
+            self.compact()
+
+    def flush(self):
+        """Nothing to do: every change is durable once appended."""
+
+    def close(self):
+        """Fold the journal into the snapshot and close it."""
+        if self.readonly:
+            return
+        with self._lock:
+            if self._completed_guides is not None and self.journal_file.stat().st_size:
+                self.compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def compact(self):
+        """Write the in-memory progress as the progress.json snapshot, then truncate the journal."""
+        with self._lock:
+            self._write_snapshot()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            with open(self.journal_file, "w", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+            self.compactions += 1
+
+    def _changed(self, change: Dict):
+        """Append the change to the journal and fsync it, compacting once the journal is large."""
+        if self._journal is None:
+            self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        if self._journal.tell() >= self.compact_bytes:
+            self.compact()
+
+
+class SQLiteProgress(ProgressStore):
+    """
+    Tracks scraping progress in a SQLite database (WAL mode).
+
+    Every mark is its own transaction, so progress survives a crash and any
+    number of readers and writers (pages, processes, shards) can share one
+    database without losing updates.
+    """
+
+    def __init__(self, metadata_dir: Path, readonly: bool = False):
+        """
+        Initialize SQLite progress.
+
+        Args:
+            metadata_dir: Directory holding progress.sqlite
+            readonly: Open the existing database for reading only (dry runs); writes then fail
+        """
+        self.metadata_dir = Path(metadata_dir)
+        self.db_path = self.metadata_dir / "progress.sqlite"
+        if readonly:
+            self.conn = connect_readonly(self.db_path)
+            return
+        self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run the block in an immediate (write-locking) transaction."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def load(self) -> Dict:
+        """
+        Get all progress.
+
+        Returns:
+            Progress dictionary in the progress.json format, in the order things were marked
+        """
+        guides = self.conn.execute("SELECT url FROM completed_guides ORDER BY rowid").fetchall()
+        tutorials = self.conn.execute("SELECT url FROM completed_tutorials ORDER BY rowid").fetchall()
+        failed = self.conn.execute(
+            "SELECT url, error, category, attempts FROM failed_tutorials ORDER BY rowid"
+        ).fetchall()
         return {
-            "completed_guides": [],
-            "completed_tutorials": [],
-            "failed_tutorials": [],
+            "completed_guides": [row[0] for row in guides],
+            "completed_tutorials": [row[0] for row in tutorials],
+            "failed_tutorials": [
+                {"url": url, "error": error, "category": category, "attempts": attempts}
+                for url, error, category, attempts in failed
+            ],
         }
 
     def save(self, progress: Dict):
         """
-        Save progress to file.
+        Replace all progress.
 
         Args:
-            progress: Progress dictionary to save
+            progress: Progress dictionary in the progress.json format
+        """
+        with self._transaction():
+            for table in ("completed_guides", "completed_tutorials", "failed_tutorials"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self._insert(progress)
+
+    def import_json(self, progress_file: Path) -> int:
         """
-        with open(self.progress_file, "w", encoding="utf-8") as f:
-            json.dump(progress, f, indent=2, ensure_ascii=False)
+        Merge a progress.json file into the database.
+
+        Completed tutorials win over failures; importing the same file twice changes nothing.
+
+        Args:
+            progress_file: Path to progress.json
+
+        Returns:
+            Number of completed tutorials added
+        """
+        with open(progress_file, "r", encoding="utf-8") as f:
+            progress = json.load(f)
+        with self._transaction():
+            before = self.conn.execute("SELECT COUNT(*) FROM completed_tutorials").fetchone()[0]
+            self._insert(progress)
+            after = self.conn.execute("SELECT COUNT(*) FROM completed_tutorials").fetchone()[0]
+        return after - before
+
+    def _insert(self, progress: Dict):
+        """Add a progress.json-format dictionary's entries inside the current transaction."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO completed_guides (url, completed_at) VALUES (?, ?)",
+            [(url, now) for url in progress.get("completed_guides", [])],
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO completed_tutorials (url, completed_at) VALUES (?, ?)",
+            [(url, now) for url in progress.get("completed_tutorials", [])],
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO failed_tutorials (url, error, category, attempts, failed_at) "
+            "SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM completed_tutorials WHERE url = ?)",
+            [
+                (entry["url"], entry.get("error"), entry.get("category"), entry.get("attempts", 1), now, entry["url"])
+                for entry in progress.get("failed_tutorials", [])
+            ],
+        )
 
     def is_guide_completed(self, guide_url: str) -> bool:
         """
@@ -55,8 +599,8 @@ class ProgressTracker:
         Returns:
             True if guide is completed
         """
-        progress = self.load()
-        return guide_url in progress.get("completed_guides", [])
+        row = self.conn.execute("SELECT 1 FROM completed_guides WHERE url = ?", (guide_url,)).fetchone()
+        return row is not None
 
     def is_tutorial_completed(self, tutorial_url: str) -> bool:
         """
@@ -68,8 +612,8 @@ class ProgressTracker:
         Returns:
             True if tutorial is completed
         """
-        progress = self.load()
-        return tutorial_url in progress.get("completed_tutorials", [])
+        row = self.conn.execute("SELECT 1 FROM completed_tutorials WHERE url = ?", (tutorial_url,)).fetchone()
+        return row is not None
 
     def mark_guide_completed(self, guide_url: str):
         """
@@ -78,12 +622,9 @@ class ProgressTracker:
         Args:
             guide_url: URL of the guide
         """
-        progress = self.load()
-        if "completed_guides" not in progress:
-            progress["completed_guides"] = []
-        if guide_url not in progress["completed_guides"]:
-            progress["completed_guides"].append(guide_url)
-        self.save(progress)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO completed_guides (url, completed_at) VALUES (?, ?)", (guide_url, time.time())
+        )
 
     def mark_tutorial_completed(self, tutorial_url: str):
         """
@@ -92,28 +633,48 @@ class ProgressTracker:
         Args:
             tutorial_url: URL of the tutorial
         """
-        progress = self.load()
-        if "completed_tutorials" not in progress:
-            progress["completed_tutorials"] = []
-        if tutorial_url not in progress["completed_tutorials"]:
-            progress["completed_tutorials"].append(tutorial_url)
-        self.save(progress)
+        self.mark_tutorials_completed([tutorial_url])
 
-    def mark_tutorial_failed(self, tutorial_url: str, error: str):
+    def mark_tutorials_completed(self, tutorial_urls: Iterable[str]):
         """
-        Mark a tutorial as failed.
+        Mark several tutorials as completed in one transaction.
+
+        Args:
+            tutorial_urls: URLs of the tutorials
+        """
+        now = time.time()
+        urls = list(tutorial_urls)
+        with self._transaction():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO completed_tutorials (url, completed_at) VALUES (?, ?)",
+                [(url, now) for url in urls],
+            )
+            # A retried tutorial that now succeeded is no longer failed
+            self.conn.executemany("DELETE FROM failed_tutorials WHERE url = ?", [(url,) for url in urls])
+
+    def mark_tutorial_failed(
+        self, tutorial_url: str, error: str, category: Optional[str] = None, attempts: int = 1
+    ):
+        """
+        Mark a tutorial as failed, replacing any earlier failure of the same URL.
 
         Args:
             tutorial_url: URL of the tutorial
             error: Error message
+            category: Failure category (timeout, http_status, challenge, network, parse or write)
+            attempts: Attempts made in this run; added to the attempts of earlier runs
         """
-        progress = self.load()
-        if "failed_tutorials" not in progress:
-            progress["failed_tutorials"] = []
-        failed_entry = {"url": tutorial_url, "error": error}
-        if failed_entry not in progress["failed_tutorials"]:
-            progress["failed_tutorials"].append(failed_entry)
-        self.save(progress)
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT attempts FROM failed_tutorials WHERE url = ?", (tutorial_url,)
+            ).fetchone()
+            if row:
+                attempts += row[0]
+                self.conn.execute("DELETE FROM failed_tutorials WHERE url = ?", (tutorial_url,))
+            self.conn.execute(
+                "INSERT INTO failed_tutorials (url, error, category, attempts, failed_at) VALUES (?, ?, ?, ?, ?)",
+                (tutorial_url, error, category, attempts, time.time()),
+            )
 
     def get_completed_urls(self) -> Set[str]:
         """
@@ -122,7 +683,46 @@ class ProgressTracker:
         Returns:
             Set of completed URLs
         """
-        progress = self.load()
-        completed = set(progress.get("completed_guides", []))
-        completed.update(progress.get("completed_tutorials", []))
-        return completed
+        rows = self.conn.execute("SELECT url FROM completed_guides UNION SELECT url FROM completed_tutorials")
+        return {row[0] for row in rows}
+
+
+def open_progress(metadata_dir: Path, backend: Optional[str] = None, readonly: bool = False) -> ProgressStore:
+    """
+    Open a vault's progress.
+
+    Switching an existing vault to SQLite imports its progress.json once, when
+    the database is created.
+
+    Args:
+        metadata_dir: Vault metadata directory
+        backend: One of PROGRESS_BACKENDS, or None for whichever the vault already uses (json for a new vault)
+        readonly: Read the progress without creating, importing or compacting anything (dry runs)
+
+    Returns:
+        Progress backend
+    """
+    metadata_dir = Path(metadata_dir)
+    if backend is None:
+        if (metadata_dir / "progress.sqlite").exists():
+            backend = "sqlite"
+        elif (metadata_dir / "progress.journal.jsonl").exists():
+            backend = "journal"
+        else:
+            backend = "json"
+    if backend not in PROGRESS_BACKENDS:
+        raise ValueError(f"Unknown progress backend: {backend}")
+    if readonly and backend == "sqlite" and not (metadata_dir / "progress.sqlite").exists():
+        backend = "json"  # What the database would be imported from
+    if backend == "json":
+        return ProgressTracker(metadata_dir, readonly=readonly)
+    if backend == "journal":
+        return JournalProgress(metadata_dir, readonly=readonly)
+    if readonly:
+        return SQLiteProgress(metadata_dir, readonly=True)
+
+    created = not (metadata_dir / "progress.sqlite").exists()
+    progress = SQLiteProgress(metadata_dir)
+    if created and (metadata_dir / "progress.json").exists():
+        progress.import_json(metadata_dir / "progress.json")
+    return progress
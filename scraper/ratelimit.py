@@ -0,0 +1,223 @@
+"""Request-rate and concurrency limiting shared across concurrent workers."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every page in the pool."""
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (requests per second). None or 0 disables limiting.
+            capacity: Maximum number of tokens that can accumulate (burst size)
+        """
+        self.rate = rate or 0.0
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float, max_rps: Optional[float] = None) -> "TokenBucket":
+        """
+        Build a bucket from the scraper's delay setting.
+
+        Args:
+            delay: Delay between requests in seconds (the historical --delay option)
+            max_rps: Explicit requests-per-second budget; overrides the delay when given
+
+        Returns:
+            TokenBucket enforcing the resulting budget
+        """
+        if max_rps is not None:
+            return cls(max_rps)
+        return cls(1.0 / delay if delay > 0 else None)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything at all."""
+        return self.rate > 0
+
+    def _refill(self):
+        """Add tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until the requested number of tokens is available, then take them.
+
+        Args:
+            tokens: Number of tokens to consume
+        """
+        if not self.enabled:
+            return
+
+        # The lock serializes waiters so requests are released in FIFO order
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+@dataclass
+class RequestOutcome:
+    """What a request run under an AIMDController slot reported back."""
+
+    status: Optional[int] = None
+    error: bool = False
+
+
+class AIMDController:
+    """
+    Adaptive concurrency limit using additive increase / multiplicative decrease.
+
+    The limit grows by one after a full window of healthy requests (one per
+    slot) and is cut by the decrease factor on a 429, a 5xx, a failed request
+    or a latency spike. Requests that were already in flight when the limit
+    was cut don't count towards another cut.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ceiling: int,
+        initial: int = 1,
+        floor: int = 1,
+        decrease: float = 0.5,
+        latency_factor: Optional[float] = 3.0,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Initialize AIMD controller.
+
+        Args:
+            name: Label used in log messages and the summary
+            ceiling: Maximum concurrency
+            initial: Starting concurrency
+            floor: Minimum concurrency
+            decrease: Factor the limit is multiplied by when the server pushes back
+            latency_factor: Latency above this multiple of the healthy baseline counts as a spike
+                (None to ignore latency, e.g. for downloads whose size varies widely)
+            log: Optional callback receiving a message for every change of the limit
+        """
+        self.name = name
+        self.ceiling = max(ceiling, 1)
+        self.floor = min(max(floor, 1), self.ceiling)
+        self.limit = min(max(initial, self.floor), self.ceiling)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.log = log
+
+        self.in_flight = 0
+        self.peak = self.limit
+        self.increases = 0
+        self.decreases: Dict[str, int] = {}
+        self.baseline: Optional[float] = None
+        self._samples = 0
+        self._successes = 0
+        self._epoch = 0
+        self._condition = asyncio.Condition()
+
+    @classmethod
+    def fixed(cls, name: str, concurrency: int) -> "AIMDController":
+        """Build a controller whose limit never moves."""
+        return cls(name, ceiling=concurrency, initial=concurrency, floor=concurrency)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[RequestOutcome]:
+        """
+        Wait for a free slot under the current limit and hold it for one request.
+
+        Set the yielded outcome's status once the response arrives; exceptions
+        count as failures. Slots whose outcome is left empty (e.g. a download
+        skipped because the file exists) are not recorded.
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        outcome = RequestOutcome()
+        epoch = self._epoch
+        started = time.monotonic()
+        try:
+            yield outcome
+        except BaseException:
+            outcome.error = True
+            raise
+        finally:
+            if outcome.status is not None or outcome.error:
+                self.record(time.monotonic() - started, outcome, epoch)
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, latency: float, outcome: RequestOutcome, epoch: Optional[int] = None):
+        """
+        Feed one request's outcome into the controller.
+
+        Args:
+            latency: Request duration in seconds
+            outcome: Status / failure of the request
+            epoch: Epoch the request started in (default: current)
+        """
+        reason = self._throttle_reason(latency, outcome)
+        if epoch is not None and epoch != self._epoch:
+            return  # Started before the last cut; its outcome reflects the old limit
+        if reason:
+            self._set_limit(max(self.floor, int(self.limit * self.decrease)), reason)
+            self.decreases[reason] = self.decreases.get(reason, 0) + 1
+            self._epoch += 1
+            self._successes = 0
+            return
+
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.ceiling:
+            self._successes = 0
+            self.increases += 1
+            self._set_limit(self.limit + 1, "healthy")
+
+    def _throttle_reason(self, latency: float, outcome: RequestOutcome) -> Optional[str]:
+        """Classify an outcome as a reason to back off, updating the latency baseline if it's healthy."""
+        if outcome.error:
+            return "error"
+        if outcome.status == 429:
+            return "429"
+        if outcome.status is not None and outcome.status >= 500:
+            return "5xx"
+        if self.latency_factor is None:
+            return None
+        if self.baseline is not None and self._samples >= 5 and latency > self.latency_factor * self.baseline:
+            return "latency"
+        # Exponentially weighted moving average of healthy latencies
+        self.baseline = latency if self.baseline is None else 0.9 * self.baseline + 0.1 * latency
+        self._samples += 1
+        return None
+
+    def _set_limit(self, limit: int, reason: str):
+        """Change the limit, wake waiting requests and log the decision."""
+        if limit == self.limit:
+            return
+        if self.log:
+            baseline = f", baseline {self.baseline:.2f}s" if self.baseline is not None else ""
+            self.log(f"{self.name} concurrency {self.limit} -> {limit} ({reason}{baseline})")
+        self.limit = limit
+        self.peak = max(self.peak, limit)
+        # Waiting requests re-check the limit when the slot that recorded this outcome is released
+
+    def summary(self) -> str:
+        """Human-readable summary of the controller's decisions."""
+        cuts = ", ".join(f"{reason} x{count}" for reason, count in sorted(self.decreases.items())) or "none"
+        return (
+            f"{self.name}: limit {self.limit}/{self.ceiling} (peak {self.peak}), "
+            f"{self.increases} increases, decreases: {cuts}"
+        )
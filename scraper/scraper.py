@@ -1,22 +1,75 @@
 """Main scraper for guides and tutorials."""
 
 import asyncio
-import re
+import contextlib
+import json
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
+from playwright.async_api import Page
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
-from scraper.browser import BrowserSession
+from scraper.archive import PageArchive
+from scraper.budget import RunBudget, format_duration, guide_priorities
+from scraper.browser import (
+    CAPTURED_RESOURCE_TYPES,
+    DEFAULT_ALLOWED_HOSTS,
+    DEFAULT_BLOCKED_TYPES,
+    BlockingProfile,
+    BrowserSession,
+    FetchResult,
+)
 from scraper.converter import MarkdownConverter
-from scraper.downloader import MediaDownloader
-from scraper.extractor import ContentExtractor, TutorialContent
-from scraper.progress import ProgressTracker
+from scraper.discovery import DISCOVERY_CONCURRENCY, SiteDiscovery, http_fetcher
+from scraper.errors import ChallengeError, CircuitBreaker, HTTPStatusError, RetryPolicy, ScrapeError, classify
+from scraper.downloader import ConnectionStats, MediaDownloader, create_session
+from scraper.extractor import IN_PAGE_EXTRACTOR, ContentExtractor, TutorialContent
+from scraper.frontier import DONE, FAILED, PENDING, Frontier, FrontierEntry, GuideMembership
+from scraper.media import MediaService
+from scraper.metrics import LoopLagMonitor
+from scraper.pipeline import Pipeline, Stage
+from scraper.planner import RunHistory, RunPlan, plan_run
+from scraper.progress import ProgressStore, open_progress
+from scraper.ratelimit import AIMDController, TokenBucket
+from scraper.shards import Shard
 from scraper.vault import VaultManager
 
+# Default worker counts for the stages after fetch (fetch uses one worker per page).
+# "media" is the number of concurrent downloads in the background media service.
+DEFAULT_STAGE_WORKERS = {"extract": 1, "media": 5, "convert": 1, "write": 1}
+
+
+@dataclass
+class TutorialJob:
+    """A tutorial moving through the scraping pipeline."""
+
+    url: str
+    name: str
+    guide_path: Path
+    guide_name: str
+    subfolder: Optional[str] = None
+    guide_url: Optional[str] = None
+    position: int = 0
+    # Every guide the tutorial belongs to; the note lives in the first one
+    memberships: List[GuideMembership] = field(default_factory=list)
+    html: str = ""
+    tutorial: Optional[TutorialContent] = None
+    markdown: str = ""
+    metadata: Optional[Dict] = None
+    # Refresh validators: loaded from the frontier, replaced by the latest response's values
+    note_path: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    previous_hash: Optional[str] = None
+    content_hash: Optional[str] = None
+    attempts: int = 1
+
 
 class DrupalizeScraper:
     """Main scraper for Drupalize.me content."""
@@ -29,6 +82,36 @@ class DrupalizeScraper:
         headless: bool = True,
         cookies_file: Optional[Path] = None,
         cdp_url: Optional[str] = None,
+        pages: int = 1,
+        max_rps: Optional[float] = None,
+        stage_workers: Optional[Dict[str, int]] = None,
+        queue_size: int = 8,
+        stats_interval: float = 30.0,
+        parse_executor: str = "thread",
+        parse_workers: int = 2,
+        urls_file: Optional[Path] = None,
+        rediscover: bool = False,
+        refresh: bool = False,
+        archive: bool = True,
+        replay: bool = False,
+        readiness: str = "content",
+        ready_predicate: Optional[str] = None,
+        block_resources: bool = True,
+        blocked_types: Optional[List[str]] = None,
+        allowed_hosts: Optional[List[str]] = None,
+        fetch_mode: str = "auto",
+        adaptive: bool = True,
+        retry_failed: bool = False,
+        max_attempts: int = 3,
+        shard: Optional[Shard] = None,
+        extract_in_page: bool = False,
+        capture_media: bool = False,
+        max_duration: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        priority: str = "guide-order",
+        defer_videos: Optional[bool] = None,
+        progress_backend: Optional[str] = None,
+        shutdown_grace: float = 30.0,
     ):
         """
         Initialize scraper.
@@ -36,8 +119,41 @@ class DrupalizeScraper:
         Args:
             vault_root: Root directory for the Obsidian vault
             base_url: Base URL of Drupalize.me
-            delay: Delay between requests in seconds
+            delay: Delay between requests in seconds; sets the default request-rate budget
             headless: Whether to run browser in headless mode
+            pages: Number of browser pages to scrape with concurrently
+            max_rps: Maximum page requests per second across all pages (default: 1 / delay)
+            stage_workers: Worker counts for the extract, media, convert and write stages
+            queue_size: Maximum number of jobs waiting in front of each stage
+            stats_interval: Seconds between pipeline status lines (0 disables them)
+            parse_executor: Where extraction and conversion run: 'thread', 'process' or 'inline'
+            parse_workers: Number of threads or processes for extraction and conversion
+            urls_file: Optional URL manifest (drupalize_urls.json format) to seed the frontier from
+            rediscover: Discover work again even if the frontier already has some
+            refresh: Re-check completed tutorials and rewrite only the ones whose content changed
+            archive: Store every fetched page in the compressed raw-page archive
+            replay: Rebuild the vault from the page archive without a browser
+            readiness: Page readiness strategy ('content', 'article', 'networkidle' or 'predicate')
+            ready_predicate: JavaScript readiness predicate for the 'predicate' strategy
+            block_resources: Abort unneeded subresources and third-party requests while rendering
+            blocked_types: Resource types to abort (default: image, media, font, stylesheet)
+            allowed_hosts: Extra third-party hosts that are never blocked
+            fetch_mode: 'http' (plain GET with the session cookies), 'render' (full browser render)
+                or 'auto' (HTTP, falling back to rendering pages that need it)
+            adaptive: Adapt fetch and media concurrency to how the server responds (AIMD), using
+                pages and the media worker count as ceilings; otherwise both stay fixed
+            retry_failed: Only re-process tutorials that failed in earlier runs
+            max_attempts: Fetch attempts per tutorial within a run, with exponential backoff between them
+            shard: Only seed this shard's part of the URL manifest (vault_root should be its staging vault)
+            extract_in_page: Extract tutorials inside rendered pages instead of re-parsing their HTML
+            capture_media: Save images and videos the browser loads while rendering instead of downloading them again
+            max_duration: Seconds after which no new tutorials or downloads start; in-flight work finishes
+            max_bytes: Bytes (pages and media) after which no new tutorials or downloads start
+            priority: Order to scrape in: 'guide-order', or 'value' (certification guides first, then the
+                guides with the most unscraped tutorials)
+            defer_videos: Leave videos for a later run (default: only with the 'value' policy)
+            progress_backend: 'json', 'journal' or 'sqlite' (default: whichever the vault already uses, else json)
+            shutdown_grace: Seconds in-flight tutorials get to finish after SIGINT/SIGTERM before they are cancelled
         """
         self.vault_root = Path(vault_root)
         self.base_url = base_url
@@ -45,296 +161,870 @@ class DrupalizeScraper:
         self.headless = headless
         self.cookies_file = cookies_file
         self.cdp_url = cdp_url
+        self.readiness = readiness
+        self.ready_predicate = ready_predicate
+        self.capture_media = capture_media
+        self.blocking = None
+        if block_resources:
+            blocked_types = blocked_types or DEFAULT_BLOCKED_TYPES
+            if capture_media:
+                # Captured media has to be loaded by the page in the first place
+                blocked_types = [kind for kind in blocked_types if kind not in CAPTURED_RESOURCE_TYPES]
+            self.blocking = BlockingProfile(
+                first_party_host=urlparse(base_url).hostname or "",
+                blocked_types=blocked_types,
+                allowed_hosts=DEFAULT_ALLOWED_HOSTS + list(allowed_hosts or []),
+            )
+        self.fetch_mode = fetch_mode
+        self.extract_in_page = extract_in_page
+        self.fetch_stats = {"http": 0, "render": 0, "fallback": 0, "in_page": 0}
+        self.pages = max(pages, 1)
+        self.rate_limiter = TokenBucket.from_delay(delay, max_rps)
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.retry_failed = retry_failed
+        if shard and not urls_file:
+            raise ValueError("Sharding splits a URL manifest; pass urls_file")
+        self.shard = shard
+        self.retry = RetryPolicy(max_attempts, breaker=CircuitBreaker(log=self._log_decision))
+        self._retried_guides: Set[str] = set()
+        if adaptive:
+            self.fetch_control = AIMDController("fetch", ceiling=self.pages, log=self._log_decision)
+            # Download times mostly reflect file size, so only errors and status codes drive media
+            self.media_control = AIMDController(
+                "media", ceiling=self.stage_workers["media"], latency_factor=None, log=self._log_decision
+            )
+        else:
+            self.fetch_control = AIMDController.fixed("fetch", self.pages)
+            self.media_control = AIMDController.fixed("media", self.stage_workers["media"])
+        self.queue_size = queue_size
+        self.stats_interval = stats_interval
+        self.parse_executor = parse_executor
+        self.parse_workers = max(parse_workers, 1)
+        self.urls_file = urls_file
+        self.rediscover = rediscover
+        self.refresh = refresh
+        self.refresh_stats = {"not_modified": 0, "same_content": 0, "changed": 0}
+        self._refresh_started: Optional[float] = None  # Done tutorials updated before this are still unchecked
+
+        # Limits on this run, and what to spend them on first
+        self.budget = RunBudget(max_duration, max_bytes)
+        self.priority = priority
+        self.defer_videos = priority == "value" if defer_videos is None else defer_videos
+        self._carried_media: Dict[str, str] = {}  # Deferred by an earlier run and still deferred
+
+        # Graceful shutdown: set by the first SIGINT/SIGTERM, after which no new work starts
+        self.shutdown_grace = shutdown_grace
+        self.stop_reason: Optional[str] = None
+        self._grace_timer: Optional[asyncio.TimerHandle] = None
 
         self.vault = VaultManager(self.vault_root)
         self.extractor = ContentExtractor(base_url)
         self.converter = MarkdownConverter(self.vault_root)
-        self.progress = ProgressTracker(self.vault.metadata_dir)
+        self.progress_backend = progress_backend
         self.console = Console()
 
+        # Run-scoped background media service sharing one pooled HTTP session (set up in scrape_all)
+        self.connection_stats = ConnectionStats()
+        self.media: Optional[MediaService] = None
+
+        # CPU-bound parsing runs here instead of on the event loop (set up in scrape_all)
+        self._executor: Optional[Executor] = None
+        self.loop_lag = LoopLagMonitor()
+
+        # The frontier, progress and archive are opened on first use, so a --plan dry run creates none of them
+        self.replay = replay
+        self.archive_pages = archive or replay
+        # Archive writes (compression, log append, index insert, dictionary training) run on one
+        # thread of their own, so they stay in fetch order without blocking the event loop
+        self._archive_executor: Optional[ThreadPoolExecutor] = None
+
+    @cached_property
+    def frontier(self) -> Frontier:
+        """Durable work queue: discovered once, then claimed in batches by the pipeline feeder."""
+        return Frontier(self.vault.metadata_dir / "frontier.sqlite")
+
+    @cached_property
+    def progress(self) -> ProgressStore:
+        """The vault's progress, in whichever backend it uses."""
+        return open_progress(self.vault.metadata_dir, self.progress_backend)
+
+    @cached_property
+    def archive(self) -> Optional[PageArchive]:
+        """Raw HTML of every fetch, so the vault can be rebuilt offline with --replay (None when not archiving)."""
+        return PageArchive(self.vault.metadata_dir / "archive") if self.archive_pages else None
+
+    def _log_decision(self, message: str):
+        """Print a concurrency or circuit breaker decision."""
+        self.console.print(f"[dim]{message}[/dim]")
+
     async def scrape_all(self):
-        """Scrape all guides and tutorials."""
+        """
+        Scrape all guides and tutorials.
+
+        The first SIGINT or SIGTERM stops new work from starting and gives
+        in-flight tutorials shutdown_grace seconds to finish; a second signal,
+        or the end of the grace period, cancels them. Either way the frontier
+        and progress are left so the next run resumes where this one stopped.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        signals = [signal.SIGINT, signal.SIGTERM]
+        for sig in signals:
+            with contextlib.suppress(NotImplementedError):  # Event loops without signal support
+                loop.add_signal_handler(sig, self._request_shutdown, sig, task)
+        try:
+            await self._scrape()
+        except asyncio.CancelledError:
+            if self.stop_reason is None:
+                raise
+            self.console.print("[yellow]Cancelled in-flight tutorials; they will be fetched again next run[/yellow]")
+            if self.media:
+                self._report_deferred()
+        finally:
+            if self._grace_timer:
+                self._grace_timer.cancel()
+            for sig in signals:
+                with contextlib.suppress(NotImplementedError):
+                    loop.remove_signal_handler(sig)
+            # Tutorials cut off mid-flight go back to the queue; partial files were removed as they were cancelled
+            self.frontier.reset_in_flight()
+            # Let archive writes already handed to the archive thread finish
+            if self._archive_executor:
+                self._archive_executor.shutdown(wait=True)
+                self._archive_executor = None
+            # Progress is written behind the marks; make sure the last ones reach the file
+            self.progress.close()
+
+    def _request_shutdown(self, sig: int, task: asyncio.Task):
+        """Signal handler: stop claiming work, then cancel what is still running after the grace period."""
+        if self.stop_reason is not None:
+            self.console.print("[red]Stopping now[/red]")
+            task.cancel()
+            return
+        self.stop_reason = f"{signal.Signals(sig).name} received"
+        self.console.print(
+            f"[yellow]{self.stop_reason}: starting no new tutorials, giving in-flight work "
+            f"{self.shutdown_grace:.0f}s to finish (send it again to stop now)[/yellow]"
+        )
+        self._grace_timer = asyncio.get_running_loop().call_later(self.shutdown_grace, task.cancel)
+
+    def _should_stop(self) -> Optional[str]:
+        """Why no new work should start (shutdown requested or budget spent), or None."""
+        return self.stop_reason or self.budget.exhausted()
+
+    def plan(self, verbose: bool = False) -> RunPlan:
+        """
+        Print what a run with these options would do, without fetching anything.
+
+        Every guide with work left is listed, in the order it would be scraped.
+
+        Args:
+            verbose: Also list every tutorial to fetch, under its guide, and every deferred media file
+
+        Returns:
+            RunPlan
+        """
+        started = time.perf_counter()
+        # Read-only views: a dry run creates, migrates and compacts nothing
+        frontier_path = self.vault.metadata_dir / "frontier.sqlite"
+        frontier = Frontier(frontier_path, readonly=True) if frontier_path.exists() else Frontier(Path(":memory:"))
+        progress = open_progress(self.vault.metadata_dir, self.progress_backend, readonly=True)
+        plan = plan_run(
+            frontier,
+            progress,
+            self.vault,
+            urls_file=self.urls_file,
+            rediscover=self.rediscover,
+            retry_failed=self.retry_failed,
+            refresh=self.refresh,
+            priority=self.priority,
+            shard=self.shard,
+            list_tutorials=verbose,
+        )
+        progress.close()
+        frontier.close()
+
+        self.console.print(f"[bold cyan]Plan[/bold cyan] (from {plan.source})")
+        if plan.counts:
+            self.console.print(f"Tutorials: {plan.counts}")
+        self.console.print(f"Fetch, convert and write: {plan.to_fetch} tutorials")
+        if plan.guides:
+            self.console.print(f"Guides with work left: {len(plan.guides)}, in scrape order ({self.priority}):")
+            for guide in plan.guides:
+                self.console.print(f"  {guide['name']}: {guide['open']} open")
+                self._print_plan_tutorials(plan.tutorials.get(guide["url"], []))
+        if plan.tutorials.get(""):
+            self.console.print(f"  Standalone tutorials: {len(plan.tutorials[''])}")
+            self._print_plan_tutorials(plan.tutorials[""])
+
+        videos = plan.deferred_media.get("video", 0)
+        images = plan.deferred_media.get("image", 0)
+        if videos or images:
+            verb = "stay deferred" if self.defer_videos else "download"
+            self.console.print(f"Deferred media: {images} images to download, {videos} videos to {verb}")
+        if verbose:
+            for item in plan.deferred:
+                self.console.print(f"  [dim]{item['media_type']}: {item['url']}[/dim]", soft_wrap=True)
+        if self.defer_videos:
+            self.console.print("New videos: deferred")
+        self.console.print(f"Vault assets: {plan.assets['images']} images, {plan.assets['videos']} videos")
+
+        if plan.rates:
+            self.console.print(
+                f"Estimate: ~{format_duration(plan.estimated_seconds)}, ~{plan.estimated_bytes / 1e6:.0f} MB, "
+                f"~{plan.estimated_media:.0f} media files "
+                f"(from {plan.rates['runs']} earlier runs, {plan.rates['seconds_per_tutorial']:.1f}s per tutorial)"
+            )
+            if self.budget.limited and plan.to_fetch:
+                fits = [plan.to_fetch]
+                if self.budget.max_duration is not None:
+                    fits.append(int(self.budget.max_duration / max(plan.rates["seconds_per_tutorial"], 1e-9)))
+                if self.budget.max_bytes is not None:
+                    fits.append(int(self.budget.max_bytes / max(plan.rates["bytes_per_tutorial"], 1)))
+                self.console.print(f"Budget: fits ~{min(fits)} of {plan.to_fetch} tutorials")
+        elif plan.to_fetch:
+            self.console.print("Estimate: no earlier runs to measure throughput from")
+        self.console.print(f"[dim]Planned in {time.perf_counter() - started:.3f}s[/dim]")
+        return plan
+
+    def _print_plan_tutorials(self, tutorials: List[Dict]):
+        """Print the tutorials a planned run would fetch for one guide (listed with --plan --verbose)."""
+        for tutorial in tutorials:
+            self.console.print(f"    [dim]{tutorial['url']}[/dim]", soft_wrap=True)
+
+    async def _scrape(self):
+        """Discover work, then run the pipeline over it (or replay the archive)."""
         self.vault.initialize()
+        self.budget.start()
+
+        quarantined = self.vault.quarantine_partials()
+        if quarantined:
+            self.console.print(
+                f"[yellow]Moved {len(quarantined)} partial files left by an interrupted run to "
+                f"{quarantined[0].parent.relative_to(self.vault_root)}[/yellow]"
+            )
+
+        if self.replay:
+            await self._replay_all()
+            return
 
         async with BrowserSession(
             headless=self.headless,
             cookies_file=self.cookies_file,
             cdp_url=self.cdp_url,
-        ) as browser:
-            # First, get list of all guides
-            guides = await self._get_guide_list(browser)
+            readiness=self.readiness,
+            ready_predicate=self.ready_predicate,
+            blocking=self.blocking,
+            capture_media=self.capture_media,
+        ) as browser, create_session(self.connection_stats) as session:
+            await browser.open_pages(self.pages)
+            await self._discover(browser)
+
+            downloader = MediaDownloader(
+                self.vault.images_dir, self.vault.videos_dir, session=session, on_bytes=self.budget.add_bytes
+            )
+            self.media = MediaService(downloader, control=self.media_control, defer=self._defer_media)
+            if self.capture_media:
+                browser.media_sink = self.media.capture
+            self._resume_deferred_media()
+
+            fetch_stage = Stage("fetch", lambda job: self._fetch_stage(browser, job), self.pages, self.queue_size)
+            pipeline = await self._run_pipeline(fetch_stage, self._feed_pipeline)
+            fetched = pipeline.stats["fetch"]
+            RunHistory(self.vault).record(
+                fetched, self.budget.bytes, self.media.stats.downloaded + self.media.stats.captured
+            )
+            stats = self.fetch_stats
+            self.console.print(
+                f"Fetch ({self.fetch_mode}): {stats['http']} via HTTP, {stats['render']} rendered, "
+                f"{stats['fallback']} fell back to rendering, {stats['in_page']} extracted in-page"
+            )
+            self.console.print(f"Pages: {browser.readiness_summary()}")
+            if self.blocking:
+                self.console.print(f"Blocking: {browser.block_stats.summary()}")
+            self.console.print(f"Media: {self.media.stats.summary()}")
+            self.console.print(f"Media connections: {self.connection_stats.summary()}")
+            self.console.print(f"Concurrency: {self.fetch_control.summary()}; {self.media_control.summary()}")
+            self.console.print(f"Retries: {self.retry.retries}, circuit breaker trips: {self.retry.breaker.trips}")
+            self._report_deferred()
+
+    def _defer_media(self, url: str, media_type: str) -> bool:
+        """Whether a media file should be left for a later run."""
+        return (media_type == "video" and self.defer_videos) or self._should_stop() is not None
 
-            self.console.print(f"[green]Found {len(guides)} guides[/green]")
+    def _resume_deferred_media(self):
+        """Download media deferred by earlier runs, unless it would be deferred again."""
+        deferred = self.vault.load_metadata("deferred_media.json").get("media", [])
+        for item in deferred:
+            if self._defer_media(item["url"], item["media_type"]):
+                self._carried_media[item["url"]] = item["media_type"]
+            else:
+                self.media.submit(item["url"], item["media_type"])
+        resumed = len(deferred) - len(self._carried_media)
+        if resumed:
+            self.console.print(f"[green]Downloading {resumed} media files deferred by an earlier run[/green]")
 
-            # Scrape each guide (skip if already completed)
-            for guide_url, guide_name in guides:
-                if not self.progress.is_guide_completed(guide_url):
-                    await self._scrape_guide(browser, guide_url, guide_name)
-                    self.progress.mark_guide_completed(guide_url)
-                else:
-                    self.console.print(f"[yellow]Skipping completed guide: {guide_name}[/yellow]")
-                await asyncio.sleep(self.delay)
+    def _report_deferred(self):
+        """Save the media left for a later run and summarize what this run didn't get to."""
+        deferred = {**self._carried_media, **self.media.deferred}
+        self.vault.save_metadata(
+            {"media": [{"url": url, "media_type": media_type} for url, media_type in deferred.items()]},
+            "deferred_media.json",
+        )
+        if self.budget.limited:
+            self.console.print(f"Budget: {self.budget.summary()}")
+        pending = self.frontier.counts().get(FAILED if self.retry_failed else PENDING, 0)
+        if not deferred and not (self.budget.exhausted() and pending):
+            return
 
-            # Also scrape standalone tutorials
-            await self._scrape_standalone_tutorials(browser)
+        videos = sum(1 for media_type in deferred.values() if media_type == "video")
+        self.console.print("[yellow]Deferred to the next run:[/yellow]")
+        if self.budget.exhausted():
+            self.console.print(f"[yellow]  {pending} tutorials still to scrape[/yellow]")
+            open_guides = sorted(
+                (guide for guide in self.frontier.guides() if guide["open"]), key=lambda guide: -guide["open"]
+            )
+            for guide in open_guides:
+                self.console.print(f"[yellow]    {guide['name']}: {guide['open']} open[/yellow]")
+        if deferred:
+            self.console.print(
+                f"[yellow]  {videos} videos and {len(deferred) - videos} images "
+                f"(listed in _metadata/deferred_media.json)[/yellow]"
+            )
 
-    async def _get_guide_list(self, browser: BrowserSession) -> List[tuple]:
+    async def _replay_all(self):
+        """Rebuild notes from the page archive with no browser and no network."""
+        if not self.frontier.is_seeded():
+            if not self.urls_file:
+                self.console.print("[red]Nothing to replay: no frontier yet. Pass --urls-file to seed one.[/red]")
+                return
+            self._seed_from_manifest(self.urls_file, set())
+
+        fetch_stage = Stage("replay", self._replay_stage, self.stage_workers["extract"], self.queue_size)
+        await self._run_pipeline(fetch_stage, self._feed_replay)
+
+    async def _run_pipeline(self, fetch_stage: Stage, feeder) -> Pipeline:
         """
-        Get list of all guides.
+        Run the pipeline with the given first stage and feeder, then report and rebuild guide indexes.
 
         Args:
-            browser: Browser session
+            fetch_stage: Stage that turns a job into a job with HTML
+            feeder: Coroutine function that submits jobs to the pipeline and closes it
 
         Returns:
-            List of (url, name) tuples
+            The finished pipeline, with its stage counters
         """
-        guides = []
-        search_url = f"{self.base_url}/search?f%5B0%5D=type%3Aguide"
+        self._executor = self._create_executor()
+        self.loop_lag.start()
+
+        pipeline = self._build_pipeline(fetch_stage)
+        pipeline.start()
+        reporter = None
+        if self.stats_interval > 0:
+            reporter = asyncio.create_task(pipeline.report_periodically(self.console, self.stats_interval))
 
         try:
-            await browser.navigate(search_url)
-            await browser.wait_for_cloudflare()
+            await feeder(pipeline)
+            await pipeline.join()
 
-            html = await browser.page.content()
-            soup = BeautifulSoup(html, "html.parser")
+            if self.media and self.media.pending:
+                self.console.print(f"Waiting for {self.media.pending} background media downloads...")
+            if self.media:
+                await self.media.drain()
+        except asyncio.CancelledError:
+            # Shutdown grace period over: abandon in-flight jobs and downloads, removing partial files
+            await pipeline.cancel()
+            if self.media:
+                await self.media.cancel()
+            raise
+        finally:
+            if reporter:
+                reporter.cancel()
+            await self.loop_lag.stop()
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
 
-            # Find guide links
-            guide_links = soup.find_all("a", href=re.compile(r"/guide/"))
-            for link in guide_links:
-                href = link.get("href", "")
-                if href.startswith("/guide/"):
-                    full_url = urljoin(self.base_url, href)
-                    name = link.get_text(strip=True)
-                    if name and (full_url, name) not in guides:
-                        guides.append((full_url, name))
+        self.console.print(pipeline.summary_table())
+        self.console.print(f"Event loop lag ({self.parse_executor} parsing): {self.loop_lag.summary()}")
+        if self.archive:
+            self.console.print(f"Archive: {self.archive.summary()}")
+        self._finish_guides()
+        self.console.print(f"Frontier: {self.frontier.counts()}")
+        if self.refresh:
+            stats = self.refresh_stats
+            self.console.print(
+                f"Refresh: {stats['not_modified']} not modified, {stats['same_content']} unchanged content, "
+                f"{stats['changed']} rewritten"
+            )
+        return pipeline
 
-        except Exception as e:
-            self.console.print(f"[red]Error fetching guide list: {e}[/red]")
+    def _create_executor(self) -> Optional[Executor]:
+        """
+        Create the pool that extraction and conversion run in.
+
+        Returns:
+            Executor, or None to run parsing inline on the event loop
+        """
+        if self.parse_executor == "process":
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        if self.parse_executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="parse")
+        return None
 
-        return guides
+    async def _run_cpu_bound(self, func, *args):
+        """Run a synchronous, CPU-heavy call in the parse executor and await it."""
+        if self._executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
 
-    async def _scrape_guide(self, browser: BrowserSession, guide_url: str, guide_name: str):
+    async def _run_archive(self, func, *args):
+        """Run a page archive call on the archive thread, in the order calls are made, and await it."""
+        if self._archive_executor is None:
+            self._archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._archive_executor, func, *args)
+
+    def _build_pipeline(self, fetch_stage: Stage) -> Pipeline:
         """
-        Scrape a single guide and all its tutorials.
+        Build the fetch -> extract -> media -> convert -> write pipeline.
 
         Args:
-            browser: Browser session
-            guide_url: URL of the guide
-            guide_name: Name of the guide
+            fetch_stage: First stage, which fills in each job's HTML
+
+        Returns:
+            Pipeline ready to start
         """
-        self.console.print(f"[cyan]Scraping guide: {guide_name}[/cyan]")
+        workers = self.stage_workers
+        stages = [
+            fetch_stage,
+            Stage("extract", self._extract_stage, workers["extract"], self.queue_size),
+            Stage("media", self._media_stage, 1, self.queue_size),
+            Stage("convert", self._convert_stage, workers["convert"], self.queue_size),
+            Stage("write", self._write_stage, workers["write"], self.queue_size),
+        ]
+        return Pipeline(stages, on_complete=self._on_job_complete, on_error=self._on_job_error)
 
+    async def _feed_pipeline(self, pipeline: Pipeline):
+        """
+        Claim pending tutorials (failed ones with --retry-failed) from the frontier and submit them to the pipeline.
+
+        Args:
+            pipeline: Started pipeline to feed
+        """
+        state = FAILED if self.retry_failed else PENDING
+        done_before = self._refresh_started if self.refresh and not self.retry_failed else None
         try:
-            await browser.navigate(guide_url)
-            await browser.wait_for_cloudflare()
-
-            html = await browser.page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Extract guide overview/description
-            guide_overview = self._extract_guide_overview(soup)
-
-            # Find all tutorial links in this guide
-            tutorial_links = self._extract_tutorial_links_from_guide(soup)
-
-            self.console.print(f"  Found {len(tutorial_links)} tutorials")
-
-            # Create guide directory
-            guide_path = self.vault.get_guide_path(guide_name)
-            guide_path.mkdir(parents=True, exist_ok=True)
-
-            # Save guide overview
-            overview_path = guide_path / "_overview.md"
-            overview_content = f"# {guide_name}\n\n{guide_overview}\n"
-            overview_path.write_text(overview_content, encoding="utf-8")
-
-            # Scrape each tutorial (skip if already completed)
-            tutorials_metadata = []
-            for tutorial_url, tutorial_name, subfolder in tutorial_links:
-                if not self.progress.is_tutorial_completed(tutorial_url):
-                    tutorial_meta = await self._scrape_tutorial(
-                        browser, tutorial_url, tutorial_name, guide_path, guide_name, subfolder
-                    )
-                    if tutorial_meta:
-                        tutorials_metadata.append(tutorial_meta)
-                        self.progress.mark_tutorial_completed(tutorial_url)
-                    else:
-                        self.progress.mark_tutorial_failed(tutorial_url, "Scraping failed")
-                else:
-                    self.console.print(f"      [yellow]Skipping completed: {tutorial_name}[/yellow]")
-                await asyncio.sleep(self.delay)
-
-            # Create guide index
-            self.vault.create_guide_index(guide_path, guide_name, tutorials_metadata)
-
-        except Exception as e:
-            self.console.print(f"[red]Error scraping guide {guide_name}: {e}[/red]")
-
-    async def _scrape_tutorial(
-        self,
-        browser: BrowserSession,
-        tutorial_url: str,
-        tutorial_name: str,
-        guide_path: Path,
-        guide_name: str,
-        subfolder: Optional[str] = None,
-    ) -> Optional[Dict]:
+            while not self._should_stop():
+                batch = self.frontier.claim_batch(self.queue_size, state, done_before)
+                if not batch:
+                    break
+                for i, entry in enumerate(batch):
+                    if self._should_stop():
+                        # Checkpoint: unstarted claims go back to the frontier for the next run
+                        self.frontier.release(unstarted.url for unstarted in batch[i:])
+                        break
+                    self._retried_guides.update(membership.guide_url for membership in entry.memberships)
+                    await pipeline.put(self._job_from_entry(entry))
+            if self._should_stop():
+                self.console.print(f"[yellow]{self._should_stop()}: finishing tutorials already in progress[/yellow]")
+        finally:
+            await pipeline.close()
+
+    async def _feed_replay(self, pipeline: Pipeline):
+        """
+        Submit every frontier tutorial that has an archived page.
+
+        Args:
+            pipeline: Started pipeline to feed
+        """
+        try:
+            archived = self.archive.urls()
+            for entry in self.frontier.entries():
+                if entry.url in archived:
+                    await pipeline.put(self._job_from_entry(entry))
+        finally:
+            await pipeline.close()
+
+    def _job_from_entry(self, entry: FrontierEntry) -> TutorialJob:
+        """Build a pipeline job for a claimed frontier entry, placed in its first guide."""
+        validators = {
+            "note_path": entry.note_path,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "previous_hash": entry.content_hash,
+        }
+        name = entry.title or entry.url
+        if not entry.memberships:
+            return TutorialJob(
+                url=entry.url,
+                name=name,
+                guide_path=self.vault_root / "Tutorials",
+                guide_name="Standalone Tutorials",
+                **validators,
+            )
+
+        membership = entry.memberships[0]
+        return TutorialJob(
+            url=entry.url,
+            name=name,
+            guide_path=self.vault.get_guide_path(membership.guide_name),
+            guide_name=membership.guide_name,
+            subfolder=membership.subfolder,
+            guide_url=membership.guide_url,
+            position=membership.position,
+            memberships=entry.memberships,
+            **validators,
+        )
+
+    async def _discover(self, browser: BrowserSession):
+        """
+        Seed the frontier unless an earlier run already did.
+
+        Args:
+            browser: Browser session used to crawl guide pages
         """
-        Scrape a single tutorial.
+        merged, stale_notes = self.frontier.canonicalize()
+        if merged:
+            for note_path in stale_notes:
+                (self.vault_root / note_path).unlink(missing_ok=True)
+            self.console.print(
+                f"[yellow]Merged {merged} duplicate tutorial URLs (?p= variants), "
+                f"removed {len(stale_notes)} duplicate notes[/yellow]"
+            )
+
+        reset = self.frontier.reset_in_flight()
+        if reset:
+            self.console.print(f"[yellow]Re-queued {reset} tutorials left in flight by an interrupted run[/yellow]")
+
+        if self.retry_failed:
+            failed = self.frontier.counts().get(FAILED, 0)
+            self.console.print(f"[green]Retrying {failed} failed tutorials[/green]")
+            return
+
+        if self.frontier.is_seeded() and not self.rediscover:
+            self.console.print(f"[green]Resuming from frontier: {self.frontier.counts()}[/green]")
+        else:
+            completed = {Frontier.key(url) for url in self.progress.get_completed_urls()}
+            if self.urls_file:
+                added = self._seed_from_manifest(self.urls_file, completed)
+            else:
+                added = await self._crawl_site(browser, completed)
+            self.console.print(f"[green]Frontier: {added} new tutorials discovered[/green]")
+
+        if self.refresh:
+            self._refresh_started = time.time()
+            done = self.frontier.counts().get(DONE, 0)
+            self.console.print(f"[green]Refresh: re-checking {done} completed tutorials[/green]")
+
+        ranked = self.frontier.prioritize(guide_priorities(self.frontier.guides(), self.priority))
+        if ranked:
+            self.console.print(f"[green]Priority ({self.priority}): {ranked} tutorials ranked by guide value[/green]")
+
+    def _seed_from_manifest(self, urls_file: Path, completed: Set[str]) -> int:
+        """
+        Seed the frontier from a URL manifest in drupalize_urls.json format.
+
+        Args:
+            urls_file: Path to the manifest
+            completed: Frontier keys of tutorials completed by earlier runs
+
+        Returns:
+            Number of new tutorials
+        """
+        with open(urls_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if self.shard:
+            data = self.shard.filter_manifest(data)
+            self.console.print(
+                f"[green]Shard {self.shard.index}/{self.shard.count} (by {self.shard.strategy}): "
+                f"{len(data['guides'])} guides[/green]"
+            )
+        return self._seed_manifest(data, completed)
+
+    def _seed_manifest(self, data: Dict, completed: Set[str]) -> int:
+        """
+        Add a manifest's guides and tutorials to the frontier.
+
+        Guide overviews, when the manifest carries them, are written to the guide folders.
+
+        Args:
+            data: Manifest in drupalize_urls.json format
+            completed: Frontier keys of tutorials completed by earlier runs
+
+        Returns:
+            Number of new tutorials
+        """
+        for guide in data.get("guides", []):
+            if guide.get("overview") is not None:
+                guide_name = guide.get("title") or guide["url"]
+                guide_path = self.vault.get_guide_path(guide_name)
+                guide_path.mkdir(parents=True, exist_ok=True)
+                self.vault.write_atomic(guide_path / "_overview.md", f"# {guide_name}\n\n{guide['overview']}\n")
+        return self.frontier.add_manifest(data, completed)
+
+    async def _crawl_site(self, browser: BrowserSession, completed: Set[str]) -> int:
+        """
+        Seed the frontier from a fresh discovery of the site's guides and tutorials.
+
+        The discovered manifest is saved as _metadata/discovered_urls.json, so it
+        can be reused with --urls-file (e.g. to shard the next run).
 
         Args:
             browser: Browser session
-            tutorial_url: URL of the tutorial
-            tutorial_name: Name of the tutorial
-            guide_path: Path to guide directory
-            guide_name: Name of the guide
-            subfolder: Optional subfolder name
+            completed: Frontier keys of tutorials completed by earlier runs
 
         Returns:
-            Tutorial metadata dictionary or None if failed
+            Number of new tutorials
         """
-        try:
-            self.console.print(f"    Scraping: {tutorial_name}")
-
-            # Get tutorial HTML
-            html = await browser.get_content(tutorial_url)
-            await browser.wait_for_cloudflare()
-
-            # Extract content
-            tutorial = self.extractor.extract_tutorial(html, tutorial_url)
-
-            # Download media
-            async with MediaDownloader(
-                self.vault.images_dir, self.vault.videos_dir
-            ) as downloader:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    console=self.console,
-                ) as progress:
-                    media_paths = await downloader.download_all(
-                        tutorial.images, tutorial.videos, progress
-                    )
-
-            # Convert to markdown
-            markdown = self.converter.convert_tutorial(tutorial, guide_path)
-
-            # Save tutorial file
-            tutorial_path = self.vault.get_tutorial_path(guide_path, tutorial.title, subfolder)
-            tutorial_path.write_text(markdown, encoding="utf-8")
-
-            return {
-                "title": tutorial.title,
-                "filename": tutorial_path.name,
-                "subfolder": subfolder,
-                "url": tutorial_url,
-            }
-
-        except Exception as e:
-            self.console.print(f"[red]Error scraping tutorial {tutorial_name}: {e}[/red]")
-            return None
 
-    async def _scrape_standalone_tutorials(self, browser: BrowserSession):
-        """Scrape tutorials that aren't part of guides."""
-        self.console.print("[cyan]Scraping standalone tutorials[/cyan]")
+        async def render(url: str) -> FetchResult:
+            async with browser.page_slot() as page:
+                return await self._fetch_page(browser, page, url)
 
-        search_url = f"{self.base_url}/search?f%5B0%5D=type%3Atutorial"
+        control = AIMDController("discovery", ceiling=DISCOVERY_CONCURRENCY, log=self._log_decision)
+        discovery = SiteDiscovery(
+            self.base_url,
+            http_fetcher(browser, self.rate_limiter, control),
+            render=None if self.fetch_mode == "http" else render,
+            console=self.console,
+        )
+        self.console.print("[cyan]Discovering guides and tutorials[/cyan]")
+        data = await discovery.discover()
+        self.console.print(f"[green]Discovery: {discovery.summary(data)}[/green]")
+        for error in data["errors"]:
+            self.console.print(f"[yellow]Discovery error ({error['type']}): {error['url']}: {error['error']}[/yellow]")
+        self.vault.save_metadata(data, "discovered_urls.json")
+        return self._seed_manifest(data, completed)
 
-        try:
-            await browser.navigate(search_url)
-            await browser.wait_for_cloudflare()
-
-            html = await browser.page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Find tutorial links
-            tutorial_links = soup.find_all("a", href=re.compile(r"/tutorial/"))
-            tutorials = []
-            for link in tutorial_links:
-                href = link.get("href", "")
-                if href.startswith("/tutorial/"):
-                    full_url = urljoin(self.base_url, href)
-                    name = link.get_text(strip=True)
-                    if name and (full_url, name) not in tutorials:
-                        tutorials.append((full_url, name))
-
-            self.console.print(f"Found {len(tutorials)} standalone tutorials")
-
-            # Create standalone directory
-            standalone_path = self.vault_root / "Tutorials"
-            standalone_path.mkdir(exist_ok=True)
-
-            # Scrape each tutorial (skip if already completed)
-            for tutorial_url, tutorial_name in tutorials:
-                if not self.progress.is_tutorial_completed(tutorial_url):
-                    tutorial_meta = await self._scrape_tutorial(
-                        browser, tutorial_url, tutorial_name, standalone_path, "Standalone Tutorials"
-                    )
-                    if tutorial_meta:
-                        self.progress.mark_tutorial_completed(tutorial_url)
-                    else:
-                        self.progress.mark_tutorial_failed(tutorial_url, "Scraping failed")
-                else:
-                    self.console.print(f"  [yellow]Skipping completed: {tutorial_name}[/yellow]")
-                await asyncio.sleep(self.delay)
-
-        except Exception as e:
-            self.console.print(f"[red]Error scraping standalone tutorials: {e}[/red]")
-
-    def _extract_guide_overview(self, soup: BeautifulSoup) -> str:
-        """Extract guide overview/description."""
-        main_content = soup.find("main") or soup.find("article") or soup
-
-        # Try to find overview section
-        overview_elem = main_content.find("div", class_=re.compile(r"overview|description|intro", re.I))
-        if overview_elem:
-            return overview_elem.get_text(separator="\n", strip=True)
-
-        # Fallback: get first paragraph
-        first_p = main_content.find("p")
-        if first_p:
-            return first_p.get_text(strip=True)
-
-        return ""
-
-    def _extract_tutorial_links_from_guide(self, soup: BeautifulSoup) -> List[tuple]:
+    async def _fetch_page(self, browser: BrowserSession, page: Page, url: str, extract: bool = False) -> FetchResult:
         """
-        Extract tutorial links from a guide page.
+        Fetch a page on a pooled page, respecting the shared rate limit and adaptive concurrency.
+
+        Args:
+            browser: Browser session
+            page: Page borrowed from the pool
+            url: URL to fetch
+            extract: Run the in-page tutorial extractor; the HTML is then only kept for the archive
 
         Returns:
-            List of (url, name, subfolder) tuples
+            FetchResult with the rendered HTML
+        """
+        await self.rate_limiter.acquire()
+        async with self.fetch_control.slot() as outcome:
+            result = await browser.render(
+                url,
+                page=page,
+                extract_script=IN_PAGE_EXTRACTOR if extract else None,
+                keep_html=self.archive is not None,
+            )
+            outcome.status = result.status
+        await self._archive_result(result)
+        return result
+
+    async def _archive_result(self, result: FetchResult):
+        """Store a successfully fetched page in the raw-page archive."""
+        if self.archive and result.status == 200 and result.html and not result.is_challenge:
+            await self._run_archive(self.archive.append, result.url, result.html, result.status)
+
+    async def _fetch_document(
+        self, browser: BrowserSession, url: str, headers: Optional[Dict[str, str]] = None, extract: bool = False
+    ) -> FetchResult:
+        """
+        Fetch a page according to the fetch mode.
+
+        In 'http' and 'auto' modes (and for conditional requests) the page is first
+        requested over plain HTTP through the browser context, reusing its cookies.
+        'auto' falls back to a full render when that response is unusable:
+        an error status, a Cloudflare challenge, or HTML without the content container.
+
+        Args:
+            browser: Browser session
+            url: URL to fetch
+            headers: Extra request headers (e.g. conditional request validators)
+            extract: Run the in-page tutorial extractor if the page ends up being rendered
+
+        Returns:
+            FetchResult; status 304 if a conditional request found the page unchanged
+        """
+        if self.fetch_mode != "render" or headers:
+            await self.rate_limiter.acquire()
+            async with self.fetch_control.slot() as outcome:
+                result = await browser.request(url, headers=headers)
+                outcome.status = result.status
+            if result.not_modified:
+                return result
+            usable = result.status == 200 and not result.is_challenge
+            if usable and (result.has_content or self.fetch_mode == "http"):
+                self.fetch_stats["http"] += 1
+                await self._archive_result(result)
+                return result
+            if self.fetch_mode == "http":
+                if result.is_challenge:
+                    raise ChallengeError("Cloudflare challenge on HTTP fetch", url=url)
+                raise HTTPStatusError(result.status, url=url)
+            if self.fetch_mode == "auto":
+                self.fetch_stats["fallback"] += 1
+
+        async with browser.page_slot() as page:
+            result = await self._fetch_page(browser, page, url, extract)
+        self.fetch_stats["render"] += 1
+        return result
+
+    def _conditional_headers(self, job: TutorialJob) -> Dict[str, str]:
+        """Conditional request headers built from a job's stored validators."""
+        headers = {}
+        if job.etag:
+            headers["If-None-Match"] = job.etag
+        if job.last_modified:
+            headers["If-Modified-Since"] = job.last_modified
+        return headers
+
+    async def _fetch_stage(self, browser: BrowserSession, job: TutorialJob) -> Optional[TutorialJob]:
+        """Pipeline stage: fetch the tutorial's HTML, retrying transient failures with backoff."""
+        if self._should_stop():
+            # Queued before the run was told to stop; hand it back unstarted
+            self.frontier.release([job.url])
+            return None
+
+        def on_retry(attempt: int, error: ScrapeError, delay: float):
+            job.attempts = attempt + 1
+            self.console.print(
+                f"[yellow]    Retrying {job.name} in {delay:.1f}s after {error.category} error: {error}[/yellow]"
+            )
+
+        host = urlparse(job.url).hostname or ""
+        return await self.retry.run(lambda: self._fetch_once(browser, job), host, "fetch", on_retry)
+
+    async def _fetch_once(self, browser: BrowserSession, job: TutorialJob) -> Optional[TutorialJob]:
+        """Fetch a tutorial once, raising ChallengeError for challenges and HTTPStatusError for error pages."""
+        headers = self._conditional_headers(job) if self.refresh and job.previous_hash else None
+        result = await self._fetch_document(browser, job.url, headers, extract=self.extract_in_page)
+        self.budget.add_bytes(len(result.html))
+        # Challenges are often served with a 403 status, so check for them first
+        if result.is_challenge:
+            raise ChallengeError("Cloudflare challenge not cleared", url=job.url)
+        if result.status >= 400:
+            raise HTTPStatusError(result.status, url=job.url)
+        if result.not_modified:
+            self.refresh_stats["not_modified"] += 1
+            self.frontier.mark_unchanged(job.url)
+            return None
+
+        if result.rendered:
+            detail = (
+                f"rendered, ready {result.ready_seconds or 0:.1f}s, {result.blocked_requests} requests blocked, "
+                f"~{result.blocked_bytes / 1e3:.0f} KB saved"
+            )
+        else:
+            detail = f"http, {result.ready_seconds or 0:.1f}s, {len(result.html) / 1e3:.0f} KB"
+        self.console.print(f"    Scraped: {job.name} [dim]({detail})[/dim]")
+        self._apply_fetch_result(job, result)
+        return job
+
+    async def _replay_stage(self, job: TutorialJob) -> Optional[TutorialJob]:
+        """Replay stage: load the tutorial's latest HTML from the page archive."""
+        record = await self._run_archive(self.archive.latest, job.url)
+        if record is None:
+            return None
+        job.html = await self._run_archive(self.archive.read, record)
+        return job
+
+    def _apply_fetch_result(self, job: TutorialJob, result: FetchResult):
+        """Store a fetched page's HTML (or in-page extraction) and refresh validators on the job."""
+        if result.data is not None:
+            job.tutorial = self.extractor.from_page_data(result.data, job.url)
+            self.fetch_stats["in_page"] += 1
+        else:
+            job.html = result.html
+        job.etag = result.headers.get("etag")
+        job.last_modified = result.headers.get("last-modified")
+
+    async def _extract_stage(self, job: TutorialJob) -> Optional[TutorialJob]:
+        """Pipeline stage: extract structured content from the HTML, unless it was extracted in-page."""
+        if job.tutorial is None:
+            job.tutorial = await self._run_cpu_bound(self.extractor.extract_tutorial, job.html, job.url)
+        job.html = ""  # No longer needed; don't keep every page in memory
+        job.content_hash = job.tutorial.fingerprint()
+
+        if self.refresh and job.previous_hash:
+            note_exists = job.note_path and (self.vault_root / job.note_path).exists()
+            if job.content_hash == job.previous_hash and note_exists:
+                self.refresh_stats["same_content"] += 1
+                self.frontier.mark_unchanged(job.url, job.etag, job.last_modified)
+                return None
+            self.refresh_stats["changed"] += 1
+        return job
+
+    async def _media_stage(self, job: TutorialJob) -> TutorialJob:
+        """Pipeline stage: hand the tutorial's images and videos to the background media service."""
+        if self.media:
+            self.media.submit_all(job.tutorial.images, job.tutorial.videos)
+        return job
+
+    async def _convert_stage(self, job: TutorialJob) -> TutorialJob:
+        """Pipeline stage: convert the extracted content to Markdown."""
+        guides = [
+            {"name": membership.guide_name, "url": membership.guide_url, "order": membership.position + 1}
+            for membership in job.memberships
+        ]
+        job.markdown = await self._run_cpu_bound(
+            self.converter.convert_tutorial, job.tutorial, job.guide_path, guides
+        )
+        return job
+
+    async def _write_stage(self, job: TutorialJob) -> TutorialJob:
+        """Pipeline stage: write the tutorial note into the vault."""
+        job.guide_path.mkdir(parents=True, exist_ok=True)
+        tutorial_path = self.vault.get_tutorial_path(job.guide_path, job.tutorial.title, job.subfolder)
+        self.vault.write_atomic(tutorial_path, job.markdown)
+
+        # A refreshed tutorial whose title changed moves to a new note; drop the stale one
+        if job.note_path:
+            previous_path = self.vault_root / job.note_path
+            if previous_path != tutorial_path and previous_path.exists():
+                previous_path.unlink()
+
+        job.metadata = {
+            "title": job.tutorial.title,
+            "filename": tutorial_path.name,
+            "subfolder": job.subfolder,
+            "url": job.url,
+            "note_path": tutorial_path.relative_to(self.vault_root).as_posix(),
+        }
+        return job
+
+    def _on_job_complete(self, job: TutorialJob):
+        """Record a tutorial that made it through every stage."""
+        self.frontier.mark_done(
+            job.url,
+            job.tutorial.title,
+            job.metadata["note_path"],
+            etag=job.etag,
+            last_modified=job.last_modified,
+            content_hash=job.content_hash,
+        )
+        self.progress.mark_tutorial_completed(job.url)
+
+    def _on_job_error(self, stage: str, job: TutorialJob, error: Exception):
+        """Record a tutorial that failed in one of the stages."""
+        error = classify(error, stage)
+        message = f"{stage} failed: {error}"
+        self.console.print(f"[red]Error scraping tutorial {job.name} ({error.category}, {stage}): {error}[/red]")
+        self.frontier.mark_failed(job.url, message, error.category)
+        self.progress.mark_tutorial_failed(job.url, message, category=error.category, attempts=error.attempts)
+
+    def _finish_guides(self):
+        """
+        Rebuild guide indexes from the frontier and mark fully scraped guides completed.
+
+        A --retry-failed run only touches the guides its retried tutorials belong to.
         """
-        tutorials = []
-        main_content = soup.find("main") or soup.find("article") or soup
-
-        # Find all tutorial links
-        tutorial_links = main_content.find_all("a", href=re.compile(r"/tutorial/"))
-
-        for link in tutorial_links:
-            href = link.get("href", "")
-            if href.startswith("/tutorial/"):
-                full_url = urljoin(self.base_url, href)
-                name = link.get_text(strip=True)
-
-                # Try to determine subfolder from parent structure
-                subfolder = None
-                parent = link.find_parent(["section", "div", "li"])
-                if parent:
-                    # Look for heading that might indicate a section
-                    heading = parent.find_previous(["h2", "h3", "h4"])
-                    if heading:
-                        heading_text = heading.get_text(strip=True)
-                        # Skip if it's a generic heading
-                        if heading_text and heading_text.lower() not in [
-                            "tutorials",
-                            "lessons",
-                            "content",
-                        ]:
-                            subfolder = heading_text
-
-                if name and (full_url, name, subfolder) not in tutorials:
-                    tutorials.append((full_url, name, subfolder))
-
-        return tutorials
+        for guide in self.frontier.guides():
+            if self.retry_failed and guide["url"] not in self._retried_guides:
+                continue
+            tutorials = self.frontier.guide_tutorials(guide["url"])
+            if tutorials:
+                self.vault.write_guide_index(guide["name"], tutorials)
+            if guide["open"] == 0:
+                self.progress.mark_guide_completed(guide["url"])
@@ -0,0 +1,225 @@
+"""Static sharding of a scrape across independent processes, and merging of the results."""
+
+import hashlib
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from scraper.downloader import PART_SUFFIX
+from scraper.frontier import Frontier
+from scraper.progress import ProgressStore, open_progress
+from scraper.urls import canonical_url
+from scraper.vault import VaultManager
+
+SHARD_STRATEGIES = ["hash", "guide"]
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of count slices of a URL manifest (index is 1-based)."""
+
+    index: int
+    count: int
+    strategy: str = "hash"
+
+    @classmethod
+    def parse(cls, spec: str, strategy: str = "hash") -> "Shard":
+        """
+        Parse a shard spec such as '2/8'.
+
+        Args:
+            spec: 'i/K' with 1 <= i <= K
+            strategy: 'hash' (by canonical tutorial URL) or 'guide' (whole guides)
+
+        Returns:
+            Shard
+
+        Raises:
+            ValueError: If the spec or strategy is invalid
+        """
+        try:
+            index, count = (int(part) for part in spec.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{spec}', expected i/K (e.g. 1/4)") from None
+        if not 1 <= index <= count:
+            raise ValueError(f"Invalid shard '{spec}': i must be between 1 and K")
+        if strategy not in SHARD_STRATEGIES:
+            raise ValueError(f"Unknown shard strategy: {strategy}")
+        return cls(index, count, strategy)
+
+    @property
+    def name(self) -> str:
+        """Directory name of the shard's staging vault."""
+        return f"shard-{self.index:02d}-of-{self.count:02d}"
+
+    def owns_url(self, url: str) -> bool:
+        """Whether a URL hashes into this shard."""
+        digest = hashlib.sha1(canonical_url(url).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+    def _guide_assignment(self, guides: List[Dict]) -> Dict[str, int]:
+        """
+        Assign whole guides to shards, largest first, each to the least-loaded shard.
+
+        Deterministic for a given manifest, so every process computes the same split.
+        """
+        loads = [0] * self.count
+        assignment = {}
+        order = sorted(range(len(guides)), key=lambda i: (-len(guides[i].get("tutorials", [])), i))
+        for i in order:
+            shard = min(range(self.count), key=lambda s: (loads[s], s))
+            assignment[guides[i]["url"]] = shard + 1
+            loads[shard] += len(guides[i].get("tutorials", []))
+        return assignment
+
+    def filter_manifest(self, data: Dict) -> Dict:
+        """
+        Cut a drupalize_urls.json manifest down to this shard's part.
+
+        Guides and tutorials keep their original positions, so indexes rebuilt
+        after merging are ordered exactly as in an unsharded run.
+
+        Args:
+            data: Parsed manifest
+
+        Returns:
+            Manifest in the same format containing only this shard's work
+        """
+        all_guides = data.get("guides", [])
+        assignment = self._guide_assignment(all_guides) if self.strategy == "guide" else {}
+
+        guides = []
+        for position, guide in enumerate(all_guides):
+            tutorials = [dict(tutorial, position=i) for i, tutorial in enumerate(guide.get("tutorials", []))]
+            if self.strategy == "guide":
+                if assignment[guide["url"]] != self.index:
+                    continue
+            else:
+                tutorials = [tutorial for tutorial in tutorials if self.owns_url(tutorial["url"])]
+                if not tutorials:
+                    continue
+            guides.append(dict(guide, position=position, tutorials=tutorials))
+
+        standalone = [
+            tutorial for tutorial in data.get("tutorials", [])
+            if not tutorial.get("guideUrl") and self.owns_url(tutorial["url"])
+        ]
+        return {**data, "guides": guides, "tutorials": standalone}
+
+
+@dataclass
+class MergeReport:
+    """What merging staging vaults did."""
+
+    shards: int = 0
+    tutorials: int = 0
+    files_copied: int = 0
+    files_shared: int = 0
+    duplicate_notes: int = 0
+    conflicts: List[str] = field(default_factory=list)
+
+
+def _copy_file(source: Path, target: Path, report: MergeReport):
+    """Copy a file unless the target exists; identical files count as shared, different ones as conflicts."""
+    if target.exists():
+        if target.read_bytes() == source.read_bytes():
+            report.files_shared += 1
+        else:
+            report.conflicts.append(target.as_posix())
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(source, target)
+    report.files_copied += 1
+
+
+def _merge_progress(progress: ProgressStore, shard_progress: ProgressStore):
+    """Fold a shard's progress file into the target's."""
+    merged = progress.load()
+    other = shard_progress.load()
+    completed = set(merged.get("completed_tutorials", []))
+    for url in other.get("completed_tutorials", []):
+        if url not in completed:
+            merged.setdefault("completed_tutorials", []).append(url)
+            completed.add(url)
+    failed = {entry["url"]: entry for entry in merged.get("failed_tutorials", []) + other.get("failed_tutorials", [])}
+    merged["failed_tutorials"] = [entry for url, entry in failed.items() if url not in completed]
+    progress.save(merged)
+
+
+def merge_shards(shard_roots: List[Path], target_root: Path) -> MergeReport:
+    """
+    Merge staging vaults into one vault, deterministically.
+
+    Shards are processed in sorted order. Frontiers are merged first: a
+    completed tutorial beats an unfinished one, and between two completed
+    copies (a tutorial shared by guides in different shards) the first shard
+    wins, so only its note is copied. Other files are copied once; identical
+    files (shared assets) are kept once, and differing files at the same
+    path keep the first shard's version and are reported as conflicts. Guide
+    indexes are rebuilt once at the end. Page archives stay in the staging
+    vaults.
+
+    Args:
+        shard_roots: Staging vault directories
+        target_root: Vault to merge into (created if missing)
+
+    Returns:
+        MergeReport
+    """
+    vault = VaultManager(target_root)
+    vault.initialize()
+    frontier = Frontier(vault.metadata_dir / "frontier.sqlite")
+    progress = open_progress(vault.metadata_dir)
+    report = MergeReport()
+
+    shard_roots = sorted(Path(root) for root in shard_roots)
+    for root in shard_roots:
+        shard_frontier = root / "_metadata" / "frontier.sqlite"
+        if shard_frontier.exists():
+            frontier.merge_from(shard_frontier)
+    report.tutorials = sum(frontier.counts().values())
+    winners = frontier.note_owners()
+
+    for root in shard_roots:
+        report.shards += 1
+        shard_notes = {}
+        shard_frontier_path = root / "_metadata" / "frontier.sqlite"
+        if shard_frontier_path.exists():
+            shard_frontier = Frontier(shard_frontier_path)
+            shard_notes = shard_frontier.note_owners()
+            shard_frontier.close()
+
+        for source in sorted(path for path in root.rglob("*") if path.is_file()):
+            relative = source.relative_to(root)
+            if relative.parts[0] == "_metadata" or relative.name == "_index.md":
+                continue  # Metadata is merged above; indexes are rebuilt below
+            if relative.suffix == PART_SUFFIX:
+                continue  # Download cut off by a killed shard
+            note_url = shard_notes.get(relative.as_posix())
+            if note_url is not None and winners.get(relative.as_posix()) != note_url:
+                report.duplicate_notes += 1
+                continue
+            _copy_file(source, target_root / relative, report)
+
+        shard_metadata = root / "_metadata"
+        progress_files = ("progress.json", "progress.journal.jsonl", "progress.sqlite")
+        if any((shard_metadata / name).exists() for name in progress_files):
+            shard_progress = open_progress(shard_metadata)
+            _merge_progress(progress, shard_progress)
+            shard_progress.close()
+
+    for guide in frontier.guides():
+        tutorials = frontier.guide_tutorials(guide["url"])
+        if tutorials:
+            vault.write_guide_index(guide["name"], tutorials)
+        if guide["open"] == 0:
+            progress.mark_guide_completed(guide["url"])
+    vault.save_metadata(
+        {"merged_shards": [root.name for root in shard_roots], "tutorials": report.tutorials},
+        "merge_log.json",
+    )
+    progress.close()
+    frontier.close()
+    return report
+
@@ -0,0 +1,25 @@
+"""SQLite helpers shared by the vault's databases."""
+
+import sqlite3
+from pathlib import Path
+
+
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """
+    Open an existing SQLite database for reading without creating or changing any file.
+
+    A database closed cleanly is opened as immutable, so no -wal or -shm file
+    is created next to it. One with a -wal file (a run is writing it, or one
+    crashed) is opened read-only through that log, so its latest commits are seen.
+
+    Args:
+        db_path: Path of the database file (must exist)
+
+    Returns:
+        Read-only connection (rows as sqlite3.Row)
+    """
+    db_path = Path(db_path).resolve()
+    mode = "mode=ro" if db_path.with_name(db_path.name + "-wal").exists() else "immutable=1"
+    conn = sqlite3.connect(f"{db_path.as_uri()}?{mode}", uri=True, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
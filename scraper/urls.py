@@ -0,0 +1,57 @@
+"""URL normalization helpers."""
+
+from functools import lru_cache
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Query parameters that carry navigation context rather than identify a page
+CONTEXT_PARAMS = {"p"}
+
+
+def _normalize(url: str, drop_params: Iterable[str] = ()) -> str:
+    """Normalize a URL, leaving out the given query parameters."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = ""
+    if parts.query:
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        query = urlencode(sorted(param for param in params if param[0] not in drop_params))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings compare equal.
+
+    Lowercases the scheme and host, drops default ports and fragments, and
+    sorts query parameters. The path is left as-is since it is case-sensitive.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    return _normalize(url)
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL and drop query parameters that only record how a page was reached.
+
+    Guide pages link each tutorial with a ?p= parameter naming the guide, so the
+    same tutorial shows up under a different URL in every guide it belongs to.
+    Results are cached, since the same URLs are keyed over and over while seeding.
+
+    Args:
+        url: URL to canonicalize
+
+    Returns:
+        Canonical URL
+    """
+    return _normalize(url, CONTEXT_PARAMS)
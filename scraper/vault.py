@@ -1,6 +1,10 @@
 """Obsidian vault structure management."""
 
 import json
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -22,6 +26,9 @@ class VaultManager:
         self.images_dir = self.assets_dir / "images"
         self.videos_dir = self.assets_dir / "videos"
         self.metadata_dir = self.vault_root / "_metadata"
+        # Notes are written here first and renamed into place, so a note is never seen half-written
+        self.staging_dir = self.metadata_dir / "staging"
+        self.quarantine_dir = self.metadata_dir / "quarantine"
 
     def initialize(self):
         """Create vault directory structure."""
@@ -32,6 +39,53 @@ class VaultManager:
         self.images_dir.mkdir(exist_ok=True)
         self.videos_dir.mkdir(exist_ok=True)
         self.metadata_dir.mkdir(exist_ok=True)
+        self.staging_dir.mkdir(exist_ok=True)
+
+    def write_atomic(self, path: Path, content: str):
+        """
+        Write a text file so it appears complete or not at all.
+
+        The content goes to a file in the staging directory, which is then
+        renamed over the target (same filesystem, so the rename is atomic).
+
+        Args:
+            path: File to write
+            content: Text content
+        """
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        temporary = self.staging_dir / f"{uuid.uuid4().hex}.tmp"
+        try:
+            temporary.write_text(content, encoding="utf-8")
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def quarantine_partials(self) -> List[Path]:
+        """
+        Move files left half-written by a killed run out of the vault.
+
+        Unfinished notes are in the staging directory and unfinished downloads
+        are .part files in the assets directories, so this reads three
+        directories rather than the whole vault.
+
+        Returns:
+            Paths the files were moved to, under _metadata/quarantine/<timestamp>/
+        """
+        partials = []
+        for directory, pattern in ((self.staging_dir, "*"), (self.images_dir, "*.part"), (self.videos_dir, "*.part")):
+            if directory.is_dir():
+                partials.extend(path for path in directory.glob(pattern) if path.is_file())
+        if not partials:
+            return []
+
+        target_dir = self.quarantine_dir / time.strftime("%Y%m%d-%H%M%S")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        moved = []
+        for path in partials:
+            target = target_dir / f"{path.parent.name}-{path.name}"
+            shutil.move(path, target)
+            moved.append(target)
+        return moved
 
     def get_guide_path(self, guide_name: str) -> Path:
         """
@@ -110,9 +164,33 @@ class VaultManager:
 
         content = "\n".join(content_lines)
 
-        index_path.write_text(content, encoding="utf-8")
+        self.write_atomic(index_path, content)
         return index_path
 
+    def write_guide_index(self, guide_name: str, tutorials: List[Dict]) -> Path:
+        """
+        Write a guide's index from its completed tutorials.
+
+        Args:
+            guide_name: Name of the guide
+            tutorials: Completed tutorials in guide order, as {'url', 'title', 'subfolder', 'note_path'} dictionaries
+
+        Returns:
+            Path to the index file
+        """
+        guide_path = self.get_guide_path(guide_name)
+        guide_path.mkdir(parents=True, exist_ok=True)
+        entries = [
+            {
+                "title": tutorial["title"],
+                "filename": Path(tutorial["note_path"] or "").name,
+                "subfolder": tutorial["subfolder"],
+                "url": tutorial["url"],
+            }
+            for tutorial in tutorials
+        ]
+        return self.create_guide_index(guide_path, guide_name, entries)
+
     def create_topic_index(self, topic: str, tutorials: List[Dict]) -> Path:
         """
         Create an index file for a topic.
@@ -146,7 +224,7 @@ class VaultManager:
                 content_lines.append(f"- {title} ({guide})")
 
         content = "\n".join(content_lines)
-        index_path.write_text(content, encoding="utf-8")
+        self.write_atomic(index_path, content)
         return index_path
 
     def _sanitize_dirname(self, name: str) -> str:
@@ -196,9 +274,7 @@ class VaultManager:
             metadata: Metadata dictionary to save
             filename: Name of the metadata file
         """
-        metadata_path = self.metadata_dir / filename
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        self.write_atomic(self.metadata_dir / filename, json.dumps(metadata, indent=2, ensure_ascii=False))
 
     def load_metadata(self, filename: str = "scrape_log.json") -> Dict:
         """
@@ -0,0 +1,54 @@
+"""Tests for the zstd page archive."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scraper.archive import PageArchive
+
+
+def page(n: int) -> str:
+    body = "".join(f"<p>Paragraph {i} of tutorial {n} about Drupal hooks and plugins.</p>" for i in range(40))
+    return f"<html><head><title>Tutorial {n}</title></head><body><main>{body}</main></body></html>"
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = PageArchive(tmp_path / "archive", train_after=20)
+    yield archive
+    archive.close()
+
+
+def test_round_trip_by_canonical_url(archive):
+    archive.append("https://drupalize.me/tutorial/hooks?p=3", page(1), fetched_at=100.0)
+    archive.append("https://drupalize.me/tutorial/hooks", page(2), fetched_at=200.0)
+
+    record = archive.latest("https://drupalize.me/tutorial/hooks?p=1")
+
+    assert record.fetched_at == 200.0
+    assert archive.read(record) == page(2)
+    assert archive.urls() == {"https://drupalize.me/tutorial/hooks"}
+    assert archive.latest("https://drupalize.me/tutorial/missing") is None
+
+
+def test_dictionary_is_trained_and_older_records_stay_readable(tmp_path, archive):
+    records = [archive.append(f"https://drupalize.me/tutorial/t{n}", page(n)) for n in range(25)]
+
+    assert records[0].dict_id == 0
+    assert archive.current_dict_id
+    assert records[-1].dict_id == archive.current_dict_id
+    assert [archive.read(record) for record in records] == [page(n) for n in range(25)]
+
+    reopened = PageArchive(tmp_path / "archive")
+    assert reopened.current_dict_id == archive.current_dict_id
+    assert reopened.read(reopened.latest("https://drupalize.me/tutorial/t24")) == page(24)
+    reopened.close()
+
+
+def test_usable_from_a_dedicated_thread(archive):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        records = [executor.submit(archive.append, f"https://drupalize.me/tutorial/t{n}", page(n)) for n in range(3)]
+        offsets = [future.result().offset for future in records]
+
+    assert offsets == sorted(offsets)
+    assert archive.count() == 3
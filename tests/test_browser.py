@@ -0,0 +1,60 @@
+"""Tests for browser session helpers that need no browser."""
+
+import pytest
+
+from scraper.browser import BlockingProfile, FetchResult
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, blocked",
+    [
+        ("document", "https://drupalize.me/tutorial/a", False),
+        ("script", "https://drupalize.me/core/misc/drupal.js", False),
+        ("xhr", "https://cdn.drupalize.me/api/progress", False),  # Subdomains are first-party
+        ("image", "https://drupalize.me/sites/default/files/diagram.png", True),
+        ("media", "https://drupalize.me/files/intro.mp4", True),
+        ("font", "https://drupalize.me/themes/font.woff2", True),
+        ("stylesheet", "https://drupalize.me/themes/style.css", True),
+        ("script", "https://www.googletagmanager.com/gtm.js", True),
+        ("script", "https://notdrupalize.me/script.js", True),  # Only a suffix, not a subdomain
+        ("script", "https://challenges.cloudflare.com/turnstile/v0/api.js", False),
+        ("image", "https://challenges.cloudflare.com/cdn-cgi/challenge.png", False),
+    ],
+)
+def test_blocking_profile(resource_type, url, blocked):
+    assert BlockingProfile("drupalize.me").should_block(resource_type, url) is blocked
+
+
+def test_blocking_profile_never_blocks_navigation_and_can_allow_third_parties():
+    profile = BlockingProfile("drupalize.me", blocked_types=["font"], block_third_party=False)
+
+    assert not profile.should_block("image", "https://drupalize.me/files/diagram.png", is_navigation=True)
+    assert not profile.should_block("script", "https://www.googletagmanager.com/gtm.js")
+    assert not profile.should_block("image", "https://drupalize.me/files/diagram.png")
+    assert profile.should_block("font", "https://fonts.example.com/font.woff2")
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<main><div class="node__content"><h2>Goal</h2></div></main>',
+        "<div class='layout tutorial-content clearfix'>",
+        '<DIV CLASS="Tutorial-Content">',
+    ],
+)
+def test_has_content_for_tutorial_markup(html):
+    assert FetchResult("https://drupalize.me/tutorial/a", 200, html).has_content
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<main><article class="node"><h1>Log in</h1><form id="user-login-form"></form></article></main>',
+        '<main><div class="paywall"><p>Become a member to watch this tutorial.</p></div></main>',
+        "<article><h1>Page not found</h1></article>",
+        '<div class="node__content-wrapper">',
+        "<p>Add the node__content class to the template.</p>",
+    ],
+)
+def test_has_content_rejects_pages_without_the_tutorial(html):
+    assert not FetchResult("https://drupalize.me/tutorial/a", 200, html).has_content
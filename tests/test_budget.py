@@ -0,0 +1,85 @@
+"""Tests for run budgets and guide prioritization."""
+
+import pytest
+
+from scraper.budget import CERTIFICATION_BONUS, RunBudget, format_duration, guide_priorities, parse_duration, parse_size
+
+
+@pytest.mark.parametrize("text, seconds", [("90", 90), ("45m", 2700), ("2h", 7200), ("1h30m", 5400), (" 1.5H ", 5400)])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "soon", "1h30", "30x", "m"])
+def test_parse_duration_rejects_garbage(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+@pytest.mark.parametrize(
+    "text, size",
+    [("1048576", 1048576), ("500MB", 500_000_000), ("2 gb", 2_000_000_000), ("1.5k", 1500), ("3T", 3 * 10**12),
+     ("10b", 10)],
+)
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["", "lots", "5 MiB", "-1MB"])
+def test_parse_size_rejects_garbage(text):
+    with pytest.raises(ValueError):
+        parse_size(text)
+
+
+@pytest.mark.parametrize("seconds, text", [(42, "42s"), (65, "1m05s"), (3900, "1h05m"), (59.9, "59s")])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
+
+
+def test_unlimited_budget_never_runs_out():
+    budget = RunBudget()
+    budget.add_bytes(10**12)
+
+    assert not budget.limited
+    assert budget.exhausted() is None
+
+
+def test_transfer_limit_stays_exhausted():
+    budget = RunBudget(max_bytes=1000)
+    budget.add_bytes(999)
+    assert budget.exhausted() is None
+
+    budget.add_bytes(1)
+
+    assert budget.exhausted() == "transfer limit of 0.001 MB reached"
+    assert "stopped early" in budget.summary()
+
+
+def test_time_limit(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("scraper.budget.time.monotonic", lambda: now[0])
+    budget = RunBudget(max_duration=60)
+    budget.start()
+
+    now[0] += 59
+    assert budget.exhausted() is None
+    now[0] += 1
+    assert budget.exhausted() == "time limit of 1m00s reached"
+    assert budget.summary().startswith("1m00s elapsed of 1m00s")
+
+
+def test_guide_priorities():
+    guides = [
+        {"url": "https://drupalize.me/guide/site-building", "name": "Site Building", "open": 40},
+        {"url": "https://drupalize.me/guide/acquia-certified-developer", "name": "Developer Exam Prep", "open": 3},
+        {"url": "https://drupalize.me/guide/theming", "name": "Theming", "open": 0},
+    ]
+
+    assert set(guide_priorities(guides, "guide-order").values()) == {0}
+    assert guide_priorities(guides, "value") == {
+        "https://drupalize.me/guide/site-building": 40,
+        "https://drupalize.me/guide/acquia-certified-developer": 3 + CERTIFICATION_BONUS,
+        "https://drupalize.me/guide/theming": 0,
+    }
+    with pytest.raises(ValueError):
+        guide_priorities(guides, "random")
@@ -0,0 +1,51 @@
+"""Tests for Markdown conversion."""
+
+import re
+
+from process_extracted import create_frontmatter
+from scraper.converter import MarkdownConverter
+from scraper.extractor import TutorialContent
+
+
+def frontmatter(markdown: str) -> str:
+    return markdown.split("---", 2)[1]
+
+
+def test_frontmatter_orders_the_note_in_its_primary_guide(tmp_path):
+    tutorial = TutorialContent(
+        title="Implement hook_help()", url="https://drupalize.me/tutorial/implement-hook-help", topics=[],
+        drupal_versions=[],
+    )
+    guides = [
+        {"name": "Drupal Module Developer Guide", "url": "https://drupalize.me/guide/module-dev", "order": 12},
+        {"name": "Hooks", "url": "https://drupalize.me/guide/hooks", "order": 3},
+    ]
+
+    header = frontmatter(MarkdownConverter(tmp_path).convert_tutorial(tutorial, tmp_path, guides))
+
+    # Top-level, where fix_links.py and add_ordering.py read it
+    assert re.findall(r"(?m)^order:\s*(\d+)\s*$", header) == ["12"]
+    assert re.findall(r"(?m)^    order: (\d+)$", header) == ["12", "3"]
+
+
+def test_frontmatter_without_guides_has_no_order(tmp_path):
+    tutorial = TutorialContent(title="Standalone", url="https://drupalize.me/tutorial/standalone", topics=[],
+                               drupal_versions=[])
+
+    assert "order:" not in MarkdownConverter(tmp_path).convert_tutorial(tutorial)
+
+
+def test_both_writers_use_the_same_guides_schema(tmp_path):
+    tutorial = TutorialContent(title="Implement hook_help()", url="https://drupalize.me/tutorial/implement-hook-help",
+                               topics=[], drupal_versions=[])
+    guides = [{"name": "Hooks", "url": "https://drupalize.me/guide/hooks", "order": 3}]
+    extracted = {
+        "title": tutorial.title,
+        "url": tutorial.url,
+        "guides": [{"guide": "Hooks", "guideUrl": "https://drupalize.me/guide/hooks", "order": 3}],
+    }
+
+    scraped = frontmatter(MarkdownConverter(tmp_path).convert_tutorial(tutorial, tmp_path, guides))
+    processed = create_frontmatter(extracted)
+
+    assert scraped[scraped.index("guides:"):].strip() == processed[processed.index("guides:"):-len("---")].strip()
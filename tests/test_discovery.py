@@ -0,0 +1,183 @@
+"""Tests for URL discovery."""
+
+import asyncio
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from rich.console import Console
+
+from scraper.browser import FetchResult
+from scraper.discovery import SiteDiscovery, extract_guide_tutorials
+
+BASE = "https://drupalize.me"
+FIXTURES = Path(__file__).parent / "fixtures" / "discovery"
+GUIDE_LISTING = f"{BASE}/search?f%5B0%5D=type%3Aguide"
+TUTORIAL_LISTING = f"{BASE}/search?f%5B0%5D=type%3Atutorial"
+SITEMAP_PAGES = {
+    f"{BASE}/robots.txt": "robots.txt",
+    f"{BASE}/sitemap.xml": "sitemap.xml",
+    f"{BASE}/sitemap.xml?page=1": "sitemap-1.xml",
+    f"{BASE}/sitemap.xml?page=2": "sitemap-2.xml",
+}
+LISTING_PAGES = {
+    GUIDE_LISTING: "guide-listing-0.html",
+    f"{GUIDE_LISTING}&page=1": "guide-listing-1.html",
+    f"{GUIDE_LISTING}&page=2": "guide-listing-2.html",
+    TUTORIAL_LISTING: "tutorial-listing-0.html",
+}
+
+GUIDE_PAGE = """
+<html><body>
+<h2>Outside main</h2>
+<main>
+  <p><a href="/tutorial/audience-and-approach?p=3233">Audience and Approach</a></p>
+  <h2>Module Basics</h2>
+  <ul>
+    <li><a href="/tutorial/what-are-hooks?p=3233">What Are Hooks?</a></li>
+    <li><a href="/tutorial/implement-any-hook?p=3233">Implement Any Hook</a></li>
+  </ul>
+  <h3>Tutorials</h3>
+  <ul>
+    <li><a href="/tutorial/guiding-scenario?p=3233">Guiding Scenario</a></li>
+  </ul>
+  <section>
+    <h2>Routes and Controllers</h2>
+    <div><a href="/tutorial/create-route?p=3233">Create a Route</a></div>
+    <div><a href="/tutorial/what-are-hooks?p=0">what-are-hooks</a></div>
+    <div><a href="/tutorial/missing-title"></a></div>
+    <a href="/guide/drupal-module-developer-guide">Back to the guide</a>
+  </section>
+  <div class="cards">
+    <a href="/tutorial/implement-hook-help?p=3233"><h3>Implement hook_help()</h3><p>Add help text</p></a>
+    <a href="/tutorial/implement-hook-cron?p=3233"><h3>Implement hook_cron()</h3></a>
+  </div>
+  <div><a href="/tutorial/add-a-block?p=3233">Add a Block</a></div>
+</main>
+</body></html>
+"""
+
+
+def guide_tutorials():
+    return extract_guide_tutorials(BeautifulSoup(GUIDE_PAGE, "html.parser"), BASE)
+
+
+def test_links_come_in_document_order_with_positions():
+    tutorials = guide_tutorials()
+
+    assert [url.rsplit("/", 1)[1] for url, _, _, _ in tutorials] == [
+        "audience-and-approach", "what-are-hooks", "implement-any-hook", "guiding-scenario", "create-route",
+        "implement-hook-help", "implement-hook-cron", "add-a-block",
+    ]
+    assert [position for _, _, _, position in tutorials] == list(range(8))
+
+
+def test_subfolder_is_the_nearest_heading_before_the_container():
+    subfolders = {url.rsplit("/", 1)[1]: subfolder for url, _, subfolder, _ in guide_tutorials()}
+
+    # Headings outside <main> don't count; the first link has no section
+    assert subfolders["audience-and-approach"] is None
+    assert subfolders["what-are-hooks"] == "Module Basics"
+    assert subfolders["implement-any-hook"] == "Module Basics"
+    # A generic heading ends the section
+    assert subfolders["guiding-scenario"] is None
+    assert subfolders["create-route"] == "Routes and Controllers"
+
+
+def test_duplicate_and_nameless_links():
+    tutorials = guide_tutorials()
+    hooks = [entry for entry in tutorials if entry[0] == f"{BASE}/tutorial/what-are-hooks"]
+
+    # The ?p=0 thumbnail link is the same tutorial: the first link keeps its place and name
+    assert hooks == [(f"{BASE}/tutorial/what-are-hooks", "What Are Hooks?", "Module Basics", 1)]
+    assert all(not url.endswith("missing-title") for url, _, _, _ in tutorials)
+
+
+def test_card_links_name_the_tutorial_but_not_a_section():
+    tutorials = {url.rsplit("/", 1)[1]: (name, subfolder) for url, name, subfolder, _ in guide_tutorials()}
+
+    assert tutorials["implement-hook-help"] == ("Implement hook_help()Add help text", "Routes and Controllers")
+    assert tutorials["implement-hook-cron"] == ("Implement hook_cron()", "Routes and Controllers")
+    # The cards' <h3>s are inside links, so they don't become the next section's heading
+    assert tutorials["add-a-block"] == ("Add a Block", "Routes and Controllers")
+
+
+class FakeSite:
+    """Serves fixture files by URL; every guide gets the same guide page and anything else is a 404."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    async def fetch(self, url):
+        self.fetched.append(url)
+        if url.startswith(f"{BASE}/guide/"):
+            name = "guide.html"
+        elif url in self.pages:
+            name = self.pages[url]
+        else:
+            return FetchResult(url, 404)
+        return FetchResult(url, 200, (FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def discover(site, **kwargs):
+    discovery = SiteDiscovery(BASE, site.fetch, console=Console(quiet=True), **kwargs)
+    return discovery, asyncio.run(discovery.discover())
+
+
+def test_sitemap_index_is_followed_from_robots_txt():
+    site = FakeSite({**SITEMAP_PAGES, **LISTING_PAGES})
+
+    discovery, manifest = discover(site)
+
+    assert discovery.sources == {"guide": "sitemap", "tutorial": "sitemap"}
+    assert not any("/search" in url for url in site.fetched)
+    [guide] = manifest["guides"]
+    assert guide["url"] == f"{BASE}/guide/drupal-module-developer-guide"
+    # Sitemaps carry no titles, so the guide's comes from its page
+    assert guide["title"] == "Drupal Module Developer Guide"
+    assert guide["overview"] == "Learn to build modules."
+    # Guide tutorials come first in guide order; sitemap tutorials no guide lists are standalone
+    assert [(tutorial["url"], tutorial.get("guideUrl")) for tutorial in manifest["tutorials"]] == [
+        (f"{BASE}/tutorial/what-are-hooks", guide["url"]),
+        (f"{BASE}/tutorial/implement-any-hook", guide["url"]),
+        (f"{BASE}/tutorial/install-drush", None),
+    ]
+    assert manifest["errors"] == []
+
+
+def test_missing_sitemap_falls_back_to_every_listing_page():
+    site = FakeSite(LISTING_PAGES)
+
+    discovery, manifest = discover(site)
+
+    assert discovery.sources == {"guide": "listing", "tutorial": "listing"}
+    # robots.txt and /sitemap.xml were tried; their 404s just mean there is no sitemap
+    assert site.fetched[:2] == [f"{BASE}/robots.txt", f"{BASE}/sitemap.xml"]
+    assert manifest["errors"] == []
+    # Page 2 is only linked from page 1's pager; links to other content types are ignored
+    assert [(guide["url"], guide["title"]) for guide in manifest["guides"]] == [
+        (f"{BASE}/guide/drupal-module-developer-guide", "Drupal Module Developer Guide"),
+        (f"{BASE}/guide/site-building", "Site Building"),
+        (f"{BASE}/guide/theming", "Theming"),
+    ]
+    assert sum(url.startswith(GUIDE_LISTING) for url in site.fetched) == 3
+    assert manifest["tutorials"][-1] == {"url": f"{BASE}/tutorial/install-drush", "title": "Install Drush"}
+
+
+def test_listing_is_used_when_sitemaps_are_disabled():
+    site = FakeSite({**SITEMAP_PAGES, **LISTING_PAGES})
+
+    discovery, _ = discover(site, use_sitemap=False)
+
+    assert discovery.sources == {"guide": "listing", "tutorial": "listing"}
+    assert not any(url in SITEMAP_PAGES for url in site.fetched)
+
+
+def test_listing_pages_that_fail_are_recorded_and_skipped():
+    site = FakeSite({url: name for url, name in LISTING_PAGES.items() if not url.endswith("page=1")})
+
+    _, manifest = discover(site)
+
+    # Page 2 is only reachable through the failed page 1
+    assert [guide["title"] for guide in manifest["guides"]] == ["Drupal Module Developer Guide"]
+    assert manifest["errors"] == [{"type": "fetch", "url": f"{GUIDE_LISTING}&page=1", "error": "HTTP 404"}]
@@ -0,0 +1,109 @@
+"""Tests for media downloads."""
+
+import asyncio
+
+import pytest
+from multidict import CIMultiDict
+from rich.progress import Progress
+
+from scraper.downloader import PART_SUFFIX, MediaDownloader, content_length
+from scraper.ratelimit import RequestOutcome
+from scraper.vault import VaultManager
+
+
+class FakeContent:
+    def __init__(self, chunks, parts_seen, images_dir):
+        self.chunks = chunks
+        self.parts_seen = parts_seen
+        self.images_dir = images_dir
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            yield chunk
+            await asyncio.sleep(0)  # Let the other download write its part too
+            self.parts_seen.append(sorted(path.name for path in self.images_dir.glob(f"*{PART_SUFFIX}")))
+
+
+class FakeResponse:
+    def __init__(self, content, headers=None):
+        self.status = 200
+        self.headers = CIMultiDict(headers or {})
+        self.content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    def __init__(self, bodies, images_dir, headers=None):
+        self.bodies = bodies
+        self.images_dir = images_dir
+        self.headers = headers
+        self.parts_seen = []
+
+    def get(self, url):
+        return FakeResponse(FakeContent(self.bodies[url], self.parts_seen, self.images_dir), self.headers)
+
+
+def test_same_file_name_downloads_use_separate_part_files(tmp_path):
+    vault = VaultManager(tmp_path / "vault")
+    vault.initialize()
+    bodies = {
+        "https://drupalize.me/sites/default/files/a/diagram.png": [b"a1", b"a2"],
+        "https://drupalize.me/sites/default/files/b/diagram.png": [b"b1", b"b2"],
+    }
+    session = FakeSession(bodies, vault.images_dir)
+    downloader = MediaDownloader(vault.images_dir, vault.videos_dir, session=session)
+    target = vault.images_dir / "diagram.png"
+
+    async def download_both():
+        return await asyncio.gather(*(downloader.download_file(url, target) for url in bodies))
+
+    assert asyncio.run(download_both()) == [True, True]
+    assert max(len(parts) for parts in session.parts_seen) == 2
+    assert target.read_bytes() in (b"a1a2", b"b1b2")
+    assert list(vault.images_dir.glob(f"*{PART_SUFFIX}")) == []
+
+
+def test_part_files_are_quarantined(tmp_path):
+    vault = VaultManager(tmp_path / "vault")
+    vault.initialize()
+    part = MediaDownloader._part_path(vault.videos_dir / "intro.mp4")
+    part.write_bytes(b"half")
+
+    moved = vault.quarantine_partials()
+
+    assert [path.name for path in moved] == [f"videos-{part.name}"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("1024", 1024), (" 0 ", 0), ("", None), ("12, 12", None), ("abc", None), ("-5", None)],
+)
+def test_content_length_treats_bad_values_as_unknown(value, expected):
+    assert content_length({"content-length": value}) == expected
+    assert content_length(CIMultiDict({"Content-Length": value})) == expected
+
+
+def test_content_length_missing_header():
+    assert content_length({}) is None
+
+
+def test_malformed_content_length_does_not_fail_the_download(tmp_path):
+    url = "https://drupalize.me/sites/default/files/diagram.png"
+    session = FakeSession({url: [b"png"]}, tmp_path, headers={"Content-Length": "3, 3"})
+    downloader = MediaDownloader(tmp_path, tmp_path / "videos", session=session)
+    outcome = RequestOutcome()
+
+    async def download():
+        with Progress(disable=True) as progress:
+            progress.add_task("other", total=None)  # Task ids start at 0, which download_file treats as none
+            task_id = progress.add_task("diagram.png", total=None)
+            return await downloader.download_file(url, tmp_path / "diagram.png", progress, task_id, outcome)
+
+    assert asyncio.run(download())
+    assert not outcome.error
+    assert (tmp_path / "diagram.png").read_bytes() == b"png"
@@ -0,0 +1,145 @@
+"""Tests for failure classification, retries and the circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from scraper.errors import (
+    CHALLENGE,
+    HTTP_STATUS,
+    NETWORK,
+    PARSE,
+    TIMEOUT,
+    WRITE,
+    ChallengeError,
+    CircuitBreaker,
+    HTTPStatusError,
+    RetryPolicy,
+    ScrapeError,
+    classify,
+)
+
+
+@pytest.mark.parametrize("status, retryable", [(403, False), (404, False), (408, True), (429, True), (503, True)])
+def test_http_status_retryable(status, retryable):
+    error = HTTPStatusError(status)
+
+    assert error.category == HTTP_STATUS
+    assert error.retryable is retryable
+
+
+def test_challenge_is_its_own_retryable_category():
+    error = ChallengeError("Cloudflare challenge not cleared", url="https://drupalize.me/tutorial/a")
+
+    assert error.category == CHALLENGE
+    assert error.retryable
+
+
+@pytest.mark.parametrize(
+    "error, stage, category, retryable",
+    [
+        (asyncio.TimeoutError(), "fetch", TIMEOUT, True),
+        (ValueError("bad markup"), "extract", PARSE, False),
+        (OSError("disk full"), "write", WRITE, False),
+        (OSError("connection reset"), "fetch", NETWORK, True),
+    ],
+)
+def test_classify(error, stage, category, retryable):
+    classified = classify(error, stage)
+
+    assert classified.category == category
+    assert classified.retryable is retryable
+    assert classified.__cause__ is error
+
+
+def test_classify_keeps_classified_errors():
+    error = ChallengeError("challenge")
+
+    assert classify(error, "fetch") is error
+
+
+def test_retry_policy_retries_transient_failures():
+    outcomes = [HTTPStatusError(503), ChallengeError("challenge"), "page"]
+    retries = []
+
+    async def operation():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    result = asyncio.run(policy.run(operation, "drupalize.me", "fetch", lambda *args: retries.append(args[0])))
+
+    assert result == "page"
+    assert retries == [1, 2]
+    assert policy.retries == 2
+
+
+def test_retry_policy_gives_up_on_permanent_failures():
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        raise HTTPStatusError(403)
+
+    with pytest.raises(HTTPStatusError) as raised:
+        asyncio.run(RetryPolicy(max_attempts=3, base_delay=0).run(operation, "drupalize.me", "fetch"))
+
+    assert len(calls) == 1
+    assert raised.value.attempts == 1
+
+
+def test_retry_policy_stops_after_max_attempts():
+    async def operation():
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(ScrapeError) as raised:
+        asyncio.run(RetryPolicy(max_attempts=2, base_delay=0).run(operation, "drupalize.me", "fetch"))
+
+    assert raised.value.category == TIMEOUT
+    assert raised.value.attempts == 2
+
+
+def test_circuit_opens_after_threshold_and_closes_on_success():
+    messages = []
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05, log=messages.append)
+
+    async def scenario():
+        breaker.record("drupalize.me", False)
+        breaker.record("drupalize.me", False)
+        assert breaker.trips == 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await breaker.before("drupalize.me")
+        assert loop.time() - started >= 0.04
+        breaker.record("drupalize.me", True)
+
+    asyncio.run(scenario())
+
+    assert messages[-1] == "Circuit for drupalize.me closed"
+
+
+def test_cancelled_trial_releases_waiting_requests():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    policy = RetryPolicy(max_attempts=1, breaker=breaker)
+    breaker.record("drupalize.me", False)
+    trial_started = asyncio.Event()
+
+    async def hanging():
+        trial_started.set()
+        await asyncio.Event().wait()
+
+    async def succeeding():
+        return "page"
+
+    async def scenario():
+        trial = asyncio.create_task(policy.run(hanging, "drupalize.me", "fetch"))
+        await trial_started.wait()
+        waiter = asyncio.create_task(policy.run(succeeding, "drupalize.me", "fetch"))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()  # Held back by the trial
+        trial.cancel()
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(scenario()) == "page"
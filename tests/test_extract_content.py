@@ -0,0 +1,75 @@
+"""Tests for the guide listing rules of the browser-console extractor (extract_content.js).
+
+The script's functions are loaded into a node vm context; skipped without node.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scraper.frontier import Frontier
+
+ROOT = Path(__file__).parent.parent
+MANIFEST = Path(__file__).parent / "fixtures" / "introduction_drupal_urls.json"
+BASE = "https://drupalize.me/tutorial/user-guide"
+
+# Never resolves the file picker, so the extraction itself never starts
+RUNNER = """
+const fs = require('fs');
+const vm = require('vm');
+const context = vm.createContext({
+    URL,
+    console: { log() {}, error() {} },
+    document: { createElement: () => ({ click() {} }) },
+});
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8'), context);
+const manifest = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+process.stdout.write(JSON.stringify(context.canonicalTutorials(manifest)));
+"""
+
+
+@pytest.fixture(scope="module")
+def tutorials():
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("node is not available")
+    result = subprocess.run(
+        [node, "-e", RUNNER, str(ROOT / "extract_content.js"), str(MANIFEST)],
+        capture_output=True, text=True, check=True,
+    )
+    return {tutorial["url"]: tutorial for tutorial in json.loads(result.stdout)}
+
+
+def test_real_entry_beats_an_earlier_thumbnail_link(tutorials):
+    drupal = tutorials[f"{BASE}/understanding-drupal"]
+
+    assert drupal["title"] == "1.1. Concept: Drupal as a Content Management System"
+    assert drupal["guides"] == [{
+        "guide": "introduction-drupal",
+        "guideUrl": "https://drupalize.me/guide/introduction-drupal",
+        "order": 4,
+    }]
+    # Thumbnail link after the real entry
+    assert tutorials[f"{BASE}/understanding-project"]["title"] == "1.6. Concept: The Drupal Project"
+    assert tutorials[f"{BASE}/understanding-project"]["guides"][0]["order"] == 9
+
+
+def test_slug_only_tutorials_keep_the_later_link(tutorials):
+    ddev = tutorials["https://drupalize.me/tutorial/install-drupal-locally-ddev"]
+
+    assert ddev["title"] == "install-drupal-locally-ddev"
+    assert ddev["guides"][0]["order"] == 12
+
+
+def test_matches_the_frontier(tmp_path, tutorials):
+    frontier = Frontier(tmp_path / "frontier.sqlite")
+    frontier.add_manifest(json.loads(MANIFEST.read_text(encoding="utf-8")))
+
+    for entry in frontier.entries():
+        tutorial = tutorials[entry.url]
+        assert tutorial["title"] == entry.title.split("?p=", 1)[0]  # The script drops a slug title's ?p=
+        assert [guide["order"] for guide in tutorial["guides"]] == [m.position + 1 for m in entry.memberships]
+    frontier.close()
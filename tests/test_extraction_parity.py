@@ -0,0 +1,70 @@
+"""In-page extraction (scraper/extract_tutorial.js) must match the BeautifulSoup extractor.
+
+Runs both extractors on the tutorial pages in tests/fixtures/tutorials, the
+same way check_extraction_parity.py does on a vault's archive. Needs Chromium
+(`uv run playwright install chromium`); skipped without it.
+"""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+sync_api = pytest.importorskip("playwright.sync_api")
+
+from scraper.extractor import IN_PAGE_EXTRACTOR, ContentExtractor, normalize_content  # noqa: E402
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "tutorials").glob("*.html"))
+
+
+@pytest.fixture(scope="module")
+def page():
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except sync_api.Error as error:
+            pytest.skip(f"Chromium is not available: {error}")
+        # Page scripts stay off and nothing loads, so the DOM is exactly the recorded markup
+        context = browser.new_context(java_script_enabled=False)
+        context.route("**/*", lambda route: route.abort())
+        yield context.new_page()
+        browser.close()
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.stem)
+def test_in_page_extraction_matches_html_extraction(page, fixture):
+    html = fixture.read_text(encoding="utf-8")
+    url = f"https://drupalize.me/tutorial/{fixture.stem}?p=3233"
+    extractor = ContentExtractor()
+
+    expected = extractor.extract_tutorial(html, url)
+    page.set_content(html, wait_until="domcontentloaded")
+    actual = extractor.from_page_data(page.evaluate(IN_PAGE_EXTRACTOR), url)
+
+    # A refresh after --extract-in-page must not see the note as changed
+    assert actual.fingerprint() == expected.fingerprint()
+    # Chromium and BeautifulSoup serialize the same content markup slightly differently
+    expected.content = normalize_content(expected.content)
+    actual.content = normalize_content(actual.content)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.stem)
+def test_fixtures_are_tutorial_pages(fixture):
+    tutorial = ContentExtractor().extract_tutorial(fixture.read_text(encoding="utf-8"), "https://drupalize.me/")
+
+    assert tutorial.title and tutorial.title != "Untitled Tutorial"
+    assert tutorial.goal and tutorial.content
+    assert tutorial.topics and tutorial.drupal_versions
+    assert tutorial.images or tutorial.videos
+
+
+def test_fingerprint_ignores_how_content_is_serialized():
+    tutorial = ContentExtractor().extract_tutorial(FIXTURES[0].read_text(encoding="utf-8"), "https://drupalize.me/")
+    reserialized = replace(tutorial, content=tutorial.content.replace("\n", "\n  ").replace("<p>", '<p class="x">'))
+    edited = replace(tutorial, content=tutorial.content.replace("</p>", " Updated.</p>", 1))
+
+    assert reserialized.content != tutorial.content
+    assert reserialized.fingerprint() == tutorial.fingerprint()
+    assert edited.fingerprint() != tutorial.fingerprint()
+    assert replace(tutorial, title="Renamed").fingerprint() != tutorial.fingerprint()
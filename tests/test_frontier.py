@@ -0,0 +1,223 @@
+"""Tests for the SQLite crawl frontier."""
+
+import sqlite3
+import time
+
+import pytest
+
+from scraper.frontier import DONE, FAILED, IN_FLIGHT, PENDING, Frontier
+
+GUIDE = "https://drupalize.me/guide/drupal-module-developer-guide"
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = Frontier(tmp_path / "frontier.sqlite")
+    yield frontier
+    frontier.close()
+
+
+def tutorial(slug: str, **extra) -> dict:
+    return {"url": f"https://drupalize.me/tutorial/{slug}", "title": slug.title(), **extra}
+
+
+def test_add_tutorials_skips_known_and_marks_completed(frontier):
+    completed = {Frontier.key(tutorial("b")["url"])}
+
+    assert frontier.add_tutorials([tutorial("a"), tutorial("b")], completed) == 2
+    assert frontier.add_tutorials([tutorial("a")]) == 0
+    assert frontier.counts() == {PENDING: 1, DONE: 1}
+    assert frontier.is_seeded()
+
+
+def test_claim_batch_orders_by_priority_then_discovery(frontier):
+    frontier.add_tutorials([tutorial(slug, priority=priority) for slug, priority in
+                            [("a", 0), ("b", 5), ("c", 0), ("d", 5), ("e", 1)]])
+
+    claimed = frontier.claim_batch(10)
+
+    assert [entry.url.rsplit("/", 1)[1] for entry in claimed] == ["b", "d", "e", "a", "c"]
+    assert all(entry.attempts == 1 for entry in claimed)
+    assert frontier.counts() == {IN_FLIGHT: 5}
+
+
+def test_claim_batch_respects_limit_and_state(frontier):
+    frontier.add_tutorials([tutorial("a"), tutorial("b")])
+    frontier.mark_failed(tutorial("b")["url"], "boom")
+
+    assert [entry.title for entry in frontier.claim_batch(10, FAILED)] == ["B"]
+    assert [entry.title for entry in frontier.claim_batch(10)] == ["A"]
+    assert frontier.claim_batch(10) == []
+
+
+def test_release_undoes_the_claim(frontier):
+    frontier.add_tutorials([tutorial("a")])
+    entry = frontier.claim_batch(1)[0]
+
+    assert frontier.release([entry.url]) == 1
+    assert frontier.counts() == {PENDING: 1}
+    assert frontier.claim_batch(1)[0].attempts == 1
+
+
+def test_reset_in_flight_restores_the_claimed_from_state(frontier):
+    frontier.add_tutorials([tutorial("a"), tutorial("b")])
+    frontier.mark_failed(tutorial("b")["url"], "HTTP 500", "http_status")
+    frontier.claim_batch(10)
+    frontier.claim_batch(10, FAILED)
+
+    assert frontier.reset_in_flight() == 2
+    assert frontier.counts() == {PENDING: 1, FAILED: 1}
+    assert [entry.title for entry in frontier.claim_batch(10, FAILED)] == ["B"]
+    assert frontier.release([tutorial("b")["url"]]) == 1
+    assert frontier.counts() == {PENDING: 1, FAILED: 1}
+
+
+def test_migrates_databases_without_newer_columns(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE tutorials (url TEXT PRIMARY KEY, title TEXT NOT NULL DEFAULT '', "
+                "state TEXT NOT NULL DEFAULT 'pending', priority INTEGER NOT NULL DEFAULT 0, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, note_path TEXT, updated_at REAL)")
+    old.execute("INSERT INTO tutorials (url, state) VALUES ('https://drupalize.me/tutorial/a', 'in_flight')")
+    old.commit()
+    old.close()
+
+    frontier = Frontier(path)
+
+    assert frontier.reset_in_flight() == 1
+    assert frontier.counts() == {PENDING: 1}
+    frontier.close()
+
+
+def test_copies_are_migrated_and_leave_the_original_alone(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE tutorials (url TEXT PRIMARY KEY, title TEXT NOT NULL DEFAULT '', "
+                "state TEXT NOT NULL DEFAULT 'pending', priority INTEGER NOT NULL DEFAULT 0, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, note_path TEXT, updated_at REAL)")
+    old.commit()
+    old.close()
+    original = Frontier(path, readonly=True)
+
+    copy = original.copy()
+    copy.add_manifest({"tutorials": [tutorial("a")]})
+
+    assert copy.counts() == {PENDING: 1}
+    assert original.counts() == {}
+    copy.close()
+    original.close()
+
+
+def test_memberships_and_guide_listing(frontier):
+    frontier.add_manifest({
+        "guides": [{
+            "url": GUIDE,
+            "title": "Module Developer Guide",
+            "tutorials": [tutorial("a", subfolder="Basics"), tutorial("b")],
+        }],
+    })
+    frontier.mark_done(tutorial("a")["url"], "A", "Module Developer Guide/Basics/A.md")
+
+    entry = frontier.claim_batch(1)[0]
+
+    assert entry.memberships[0].guide_name == "Module Developer Guide"
+    assert entry.memberships[0].position == 1
+    assert frontier.guides() == [{"url": GUIDE, "name": "Module Developer Guide", "open": 1}]
+    assert [row["title"] for row in frontier.guide_tutorials(GUIDE)] == ["A"]
+
+
+def test_canonicalize_merges_query_variants(frontier):
+    # Rows stored under raw ?p= URLs by a run that predates canonical keys
+    for url, state, note in [
+        ("https://drupalize.me/tutorial/a?p=1", PENDING, None),
+        ("https://drupalize.me/tutorial/a?p=2", DONE, "A.md"),
+        ("https://drupalize.me/tutorial/b?p=1", PENDING, None),
+    ]:
+        frontier.conn.execute(
+            "INSERT INTO tutorials (url, title, state, note_path) VALUES (?, ?, ?, ?)", (url, "T", state, note)
+        )
+
+    merged, dropped = frontier.canonicalize()
+
+    assert merged == 1
+    assert dropped == []
+    assert {entry.url: entry.note_path for entry in frontier.entries()} == {
+        "https://drupalize.me/tutorial/a": "A.md",
+        "https://drupalize.me/tutorial/b": None,
+    }
+
+
+def test_merge_from_prefers_done_copies(tmp_path, frontier):
+    frontier.add_tutorials([tutorial("a"), tutorial("b")])
+    other = Frontier(tmp_path / "shard.sqlite")
+    other.add_tutorials([tutorial("a"), tutorial("c")])
+    other.mark_done(tutorial("a")["url"], "A", "A.md")
+    other.close()
+
+    assert frontier.merge_from(tmp_path / "shard.sqlite") == 2
+    assert frontier.counts() == {DONE: 1, PENDING: 2}
+    assert frontier.note_owners() == {"A.md": tutorial("a")["url"]}
+
+
+def test_add_manifest_keeps_the_real_entry_of_a_tutorial_listed_twice(frontier):
+    # Guide pages list thumbnail links (?p=0, slug titles) before the real entries
+    base = "https://drupalize.me/tutorial/user-guide"
+    frontier.add_manifest({
+        "guides": [{
+            "url": "https://drupalize.me/guide/introduction-drupal",
+            "title": "introduction-drupal",
+            "tutorials": [
+                {"url": f"{base}/understanding-drupal?p=0", "title": "understanding-drupal?p=0"},
+                {"url": "https://drupalize.me/tutorial/why-open-source-matters?p=0",
+                 "title": "why-open-source-matters?p=0"},
+                {"url": f"{base}/understanding-gpl?p=0", "title": "understanding-gpl?p=0"},
+                {"url": f"{base}/understanding-drupal?p=2433",
+                 "title": "1.1. Concept: Drupal as a Content Management System"},
+                {"url": f"{base}/understanding-modules?p=2433", "title": "1.2. Concept: Modules"},
+                {"url": f"{base}/understanding-gpl?p=2433", "title": "1.5. Concept: The GPL"},
+            ],
+        }],
+    })
+
+    entries = {entry.url: entry for entry in frontier.entries()}
+
+    assert len(entries) == 4
+    drupal = entries[f"{base}/understanding-drupal"]
+    assert drupal.title == "1.1. Concept: Drupal as a Content Management System"
+    assert [membership.position for membership in drupal.memberships] == [3]
+    assert entries[f"{base}/understanding-gpl"].memberships[0].position == 5
+    # Only listed as a thumbnail: the slug entry is all there is
+    assert entries["https://drupalize.me/tutorial/why-open-source-matters"].title == "why-open-source-matters?p=0"
+    assert [entry.url.rsplit("/", 1)[1] for entry in frontier.claim_batch(10)] == [
+        "why-open-source-matters", "understanding-drupal", "understanding-modules", "understanding-gpl",
+    ]
+
+
+def test_real_title_from_another_guide_replaces_a_slug_title(frontier):
+    url = "https://drupalize.me/tutorial/user-guide/understanding-gpl"
+    frontier.add_tutorials([{"url": f"{url}?p=0", "title": "understanding-gpl?p=0", "guide_url": GUIDE}])
+    frontier.add_tutorials([{"url": f"{url}?p=2433", "title": "1.5. Concept: The GPL", "guide_url": GUIDE + "-2"}])
+    frontier.add_tutorials([{"url": f"{url}?p=3", "title": "Understanding the GPL", "guide_url": GUIDE + "-3"}])
+
+    assert [entry.title for entry in frontier.entries()] == ["1.5. Concept: The GPL"]
+
+
+def test_refresh_claims_done_tutorials_and_leaves_unchecked_ones_done(frontier):
+    frontier.add_manifest({"guides": [{"url": GUIDE, "title": "Guide", "tutorials": [tutorial("a"), tutorial("b")]}]})
+    frontier.add_tutorials([tutorial("c")])
+    for slug in "ab":
+        frontier.mark_done(tutorial(slug)["url"], slug.upper(), f"{slug.upper()}.md")
+    started = time.time()
+
+    first = frontier.claim_batch(2, done_before=started)
+    frontier.mark_unchanged(first[0].url)
+    frontier.release([first[1].url])
+
+    assert [entry.url for entry in first] == [tutorial("a")["url"], tutorial("b")["url"]]
+    assert [entry.url for entry in frontier.claim_batch(10, done_before=started)] == [tutorial("c")["url"]]
+    # Checked (a) or released (b) this run: not claimed again, and still listed in the guide
+    assert frontier.claim_batch(10, done_before=started) == []
+    assert frontier.counts() == {DONE: 2, IN_FLIGHT: 1}
+    assert [row["title"] for row in frontier.guide_tutorials(GUIDE)] == ["A", "B"]
+    assert frontier.reset_in_flight() == 1
+    assert frontier.counts() == {DONE: 2, PENDING: 1}
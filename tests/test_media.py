@@ -0,0 +1,65 @@
+"""Tests for the run-wide media download service."""
+
+import asyncio
+
+from scraper.media import MediaService
+
+IMAGE = "https://drupalize.me/sites/default/files/diagram.png"
+
+
+class FakeDownloader:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def download_media(self, url, media_type="image", progress=None, outcome=None):
+        self.calls.append(url)
+        await asyncio.sleep(0.01)
+        result = self.results.pop(0)
+        if outcome is not None:
+            outcome.status = 200 if result else 404
+        return result
+
+
+def test_concurrent_requests_share_one_download():
+    downloader = FakeDownloader(["assets/images/diagram.png"])
+    service = MediaService(downloader)
+
+    async def run():
+        futures = [service.submit(IMAGE), service.submit(IMAGE + "#top"), service.submit(IMAGE)]
+        return await asyncio.gather(*futures)
+
+    assert asyncio.run(run()) == ["assets/images/diagram.png"] * 3
+    assert downloader.calls == [IMAGE]
+    assert (service.stats.requested, service.stats.coalesced, service.stats.downloaded) == (3, 2, 1)
+
+
+def test_failed_download_is_not_cached():
+    downloader = FakeDownloader([None, "assets/images/diagram.png"])
+    service = MediaService(downloader)
+
+    async def run():
+        first = await asyncio.gather(service.submit(IMAGE), service.submit(IMAGE))
+        second = await service.submit(IMAGE)
+        third = await service.submit(IMAGE)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert first == [None, None]  # Waiters on the failed download share its result
+    assert second == third == "assets/images/diagram.png"
+    assert downloader.calls == [IMAGE, IMAGE]
+    assert (service.stats.failed, service.stats.downloaded) == (1, 1)
+
+
+def test_deferred_files_stay_deferred():
+    downloader = FakeDownloader([])
+    service = MediaService(downloader, defer=lambda url, media_type: media_type == "video")
+
+    async def run():
+        return [await service.submit("https://drupalize.me/files/intro.mp4", "video") for _ in range(2)]
+
+    assert asyncio.run(run()) == [None, None]
+    assert downloader.calls == []
+    assert service.deferred == {"https://drupalize.me/files/intro.mp4": "video"}
+    assert service.stats.deferred == 1
@@ -0,0 +1,117 @@
+"""Tests for the staged asyncio pipeline."""
+
+import asyncio
+
+import pytest
+
+from scraper.pipeline import Pipeline, Stage
+
+
+async def double(job):
+    await asyncio.sleep(0)
+    return job * 2
+
+
+async def add_one(job):
+    await asyncio.sleep(0)
+    return job + 1
+
+
+def test_close_and_join_drain_every_job_through_every_stage():
+    completed = []
+
+    async def run():
+        pipeline = Pipeline(
+            [Stage("double", double, concurrency=3, queue_size=2), Stage("add", add_one, concurrency=2, queue_size=2)],
+            on_complete=completed.append,
+        )
+        pipeline.start()
+        for job in range(20):
+            await pipeline.put(job)
+        await pipeline.close()
+        await pipeline.join()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert sorted(completed) == [job * 2 + 1 for job in range(20)]
+    assert pipeline.stats["double"].processed == pipeline.stats["add"].processed == 20
+    assert [row["queued"] for row in pipeline.snapshot()] == [0, 0]
+
+
+def test_none_drops_the_job_and_errors_are_reported():
+    completed, errors = [], []
+
+    async def check(job):
+        if job == 3:
+            raise ValueError("bad markup")
+        return None if job % 2 else job
+
+    async def run():
+        pipeline = Pipeline(
+            [Stage("check", check), Stage("double", double)],
+            on_complete=completed.append,
+            on_error=lambda stage, job, error: errors.append((stage, job, str(error))),
+        )
+        pipeline.start()
+        for job in range(6):
+            await pipeline.put(job)
+        await pipeline.close()
+        await pipeline.join()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert completed == [0, 4, 8]
+    assert errors == [("check", 3, "bad markup")]
+    check_stats = pipeline.stats["check"]
+    assert (check_stats.processed, check_stats.dropped, check_stats.failed) == (3, 2, 1)
+    assert pipeline.stats["double"].processed == 3
+
+
+def test_put_waits_while_the_first_queue_is_full():
+    async def run():
+        gate = asyncio.Event()
+
+        async def blocked(job):
+            await gate.wait()
+            return job
+
+        pipeline = Pipeline([Stage("fetch", blocked, concurrency=1, queue_size=1)])
+        pipeline.start()
+        await pipeline.put(1)  # Taken by the worker
+        await asyncio.sleep(0)
+        await pipeline.put(2)  # Fills the queue
+        third = asyncio.create_task(pipeline.put(3))
+        await asyncio.sleep(0.01)
+        held = not third.done()
+        gate.set()
+        await third
+        await pipeline.close()
+        await pipeline.join()
+        return held, pipeline.stats["fetch"].processed
+
+    assert asyncio.run(run()) == (True, 3)
+
+
+def test_cancel_abandons_jobs_in_progress():
+    async def run():
+        async def hang(job):
+            await asyncio.Event().wait()
+
+        pipeline = Pipeline([Stage("fetch", hang, concurrency=2)])
+        pipeline.start()
+        await pipeline.put(1)
+        await asyncio.sleep(0)
+        await pipeline.cancel()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert pipeline.stats["fetch"].in_flight == 0
+    assert pipeline.stats["fetch"].processed == 0
+
+
+def test_needs_a_stage():
+    with pytest.raises(ValueError):
+        Pipeline([])
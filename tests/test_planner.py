@@ -0,0 +1,114 @@
+"""Tests for --plan dry runs."""
+
+import json
+import time
+
+import pytest
+
+from scraper.frontier import Frontier
+from scraper.pipeline import StageStats
+from scraper.planner import RunHistory
+from scraper.progress import open_progress
+from scraper.scraper import DrupalizeScraper
+from scraper.vault import VaultManager
+
+GUIDE = "https://drupalize.me/guide/drupal-module-developer-guide"
+MANIFEST = {
+    "guides": [{
+        "url": GUIDE,
+        "title": "Drupal Module Developer Guide",
+        "tutorials": [
+            {"url": "https://drupalize.me/tutorial/audience-and-approach?p=3233", "title": "Audience and Approach"},
+            {"url": "https://drupalize.me/tutorial/guiding-scenario?p=3233", "title": "Guiding Scenario"},
+        ],
+    }],
+}
+
+
+def snapshot(root):
+    return {path: path.read_bytes() for path in root.rglob("*") if path.is_file()} if root.exists() else None
+
+
+@pytest.fixture
+def urls_file(tmp_path):
+    path = tmp_path / "urls.json"
+    path.write_text(json.dumps(MANIFEST), encoding="utf-8")
+    return path
+
+
+def test_plan_on_a_new_vault_creates_nothing(tmp_path, urls_file):
+    vault = tmp_path / "vault"
+
+    plan = DrupalizeScraper(vault_root=vault, urls_file=urls_file).plan()
+
+    assert plan.to_fetch == 2
+    assert [guide["name"] for guide in plan.guides] == ["Drupal Module Developer Guide"]
+    assert not vault.exists()
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_plan_leaves_an_existing_vault_untouched(tmp_path, urls_file, backend):
+    vault = tmp_path / "vault"
+    frontier = Frontier(vault / "_metadata" / "frontier.sqlite")
+    frontier.add_manifest(MANIFEST)
+    frontier.mark_done("https://drupalize.me/tutorial/guiding-scenario", "Guiding Scenario", "Guiding Scenario.md")
+    frontier.close()
+    progress = open_progress(vault / "_metadata", backend)
+    progress.mark_tutorial_completed("https://drupalize.me/tutorial/guiding-scenario")
+    if backend == "journal":
+        progress._journal.close()  # Leave the journal uncompacted, as a crashed run would
+    else:
+        progress.close()
+    before = snapshot(vault)
+
+    plan = DrupalizeScraper(vault_root=vault, urls_file=urls_file, rediscover=True).plan()
+
+    assert plan.to_fetch == 1
+    assert snapshot(vault) == before
+
+
+def test_plan_lists_every_guide_and_in_verbose_mode_every_url(tmp_path, capsys):
+    manifest = {"guides": [
+        {"url": f"{GUIDE}-{number}", "title": f"Guide {number}",
+         "tutorials": [{"url": f"https://drupalize.me/tutorial/t{number}", "title": f"Tutorial {number}"}]}
+        for number in range(8)
+    ]}
+    urls_file = tmp_path / "urls.json"
+    urls_file.write_text(json.dumps(manifest), encoding="utf-8")
+    metadata = tmp_path / "vault" / "_metadata"
+    metadata.mkdir(parents=True)
+    (metadata / "deferred_media.json").write_text(json.dumps({"media": [
+        {"url": "https://drupalize.me/files/intro.mp4", "media_type": "video"},
+    ]}), encoding="utf-8")
+    scraper = DrupalizeScraper(vault_root=tmp_path / "vault", urls_file=urls_file)
+
+    plan = scraper.plan()
+    output = capsys.readouterr().out
+
+    assert len(plan.guides) == 8
+    assert all(f"Guide {number}: 1 open" in output for number in range(8))
+    assert "tutorial/t0" not in output and plan.tutorials == {}
+
+    plan = scraper.plan(verbose=True)
+    output = capsys.readouterr().out
+
+    assert [tutorial["url"] for tutorial in plan.tutorials[f"{GUIDE}-7"]] == ["https://drupalize.me/tutorial/t7"]
+    assert all(f"https://drupalize.me/tutorial/t{number}" in output for number in range(8))
+    assert "https://drupalize.me/files/intro.mp4" in output
+
+
+def test_run_history_counts_only_fetched_tutorials(tmp_path):
+    vault = VaultManager(tmp_path / "vault")
+    vault.initialize()
+    history = RunHistory(vault)
+
+    # A refresh run: 6 tutorials were answered 304 and dropped, 3 fetched, 1 failed
+    history.record(StageStats(processed=3, dropped=6, failed=1, started_at=time.monotonic() - 20), 4_000_000, 8)
+    # Nothing fetched: nothing to learn a rate from
+    history.record(StageStats(dropped=5), 0, 0)
+
+    assert [run["tutorials"] for run in history.runs()] == [4]
+    rates = history.rates()
+    assert rates["seconds_per_tutorial"] == pytest.approx(5, abs=0.1)
+    assert rates["bytes_per_tutorial"] == 1_000_000
+    assert rates["media_per_tutorial"] == 2
@@ -0,0 +1,251 @@
+"""Tests for the progress backends."""
+
+import json
+import sqlite3
+import time
+
+import pytest
+from click.testing import CliRunner
+
+import import_progress
+from scraper.progress import (
+    PROGRESS_BACKENDS,
+    JournalProgress,
+    ProgressStore,
+    ProgressTracker,
+    SQLiteProgress,
+    open_progress,
+)
+
+GUIDE = "https://drupalize.me/guide/drupal-module-developer-guide"
+A = "https://drupalize.me/tutorial/a"
+B = "https://drupalize.me/tutorial/b"
+
+
+def read_json(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_json_marks_are_written_behind(tmp_path):
+    progress = ProgressTracker(tmp_path, flush_interval=3600, flush_every=3)
+    progress.mark_tutorial_completed(A)
+    progress.mark_tutorial_completed(A)  # Already completed: not a change
+    progress.mark_guide_completed(GUIDE)
+
+    assert not (tmp_path / "progress.json").exists()
+
+    progress.mark_tutorial_completed(B)
+
+    assert progress.flushes == 1
+    assert read_json(tmp_path / "progress.json")["completed_tutorials"] == [A, B]
+    progress.mark_tutorial_failed(A, "boom")
+    progress.close()
+    assert progress.flushes == 2
+    assert read_json(tmp_path / "progress.json")["failed_tutorials"][0]["url"] == A
+
+
+def test_json_flushes_in_the_background(tmp_path):
+    progress = ProgressTracker(tmp_path, flush_interval=0.01)
+    progress.mark_tutorial_completed(A)
+
+    deadline = time.monotonic() + 5
+    while not (tmp_path / "progress.json").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert read_json(tmp_path / "progress.json")["completed_tutorials"] == [A]
+    progress.close()
+
+
+def test_json_keeps_keys_it_does_not_manage(tmp_path):
+    (tmp_path / "progress.json").write_text(json.dumps({"completed_tutorials": [A], "last_run": "2026-01-01"}))
+    progress = ProgressTracker(tmp_path, flush_interval=0)
+
+    progress.mark_tutorial_completed(B)
+
+    assert read_json(tmp_path / "progress.json") == {
+        "completed_guides": [],
+        "completed_tutorials": [A, B],
+        "failed_tutorials": [],
+        "last_run": "2026-01-01",
+    }
+    progress.close()
+
+
+def test_readonly_json_progress_refuses_marks(tmp_path):
+    progress = ProgressTracker(tmp_path / "_metadata", readonly=True)
+
+    assert progress.load()["completed_tutorials"] == []
+    with pytest.raises(RuntimeError):
+        progress.mark_tutorial_completed(A)
+    progress.close()
+    assert not (tmp_path / "_metadata").exists()
+
+
+def test_open_progress_rejects_unknown_backends(tmp_path):
+    with pytest.raises(ValueError):
+        open_progress(tmp_path, "yaml")
+
+
+def test_backends_must_implement_the_whole_interface():
+    class Partial(ProgressStore):
+        def load(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_sqlite_imports_progress_json_once_when_created(tmp_path):
+    (tmp_path / "progress.json").write_text(json.dumps({
+        "completed_guides": [GUIDE],
+        "completed_tutorials": [A],
+        "failed_tutorials": [{"url": A, "error": "stale"}, {"url": B, "error": "boom", "attempts": 2}],
+    }))
+
+    progress = open_progress(tmp_path, "sqlite")
+    progress.mark_tutorial_completed(B)
+    progress.close()
+    (tmp_path / "progress.json").write_text(json.dumps({"completed_tutorials": ["https://drupalize.me/tutorial/c"]}))
+    reopened = open_progress(tmp_path)
+
+    assert isinstance(reopened, SQLiteProgress)
+    assert reopened.load() == {"completed_guides": [GUIDE], "completed_tutorials": [A, B], "failed_tutorials": []}
+    reopened.close()
+
+
+def test_sqlite_import_json_is_idempotent(tmp_path):
+    (tmp_path / "progress.json").write_text(json.dumps({"completed_tutorials": [A, B]}))
+    progress = SQLiteProgress(tmp_path)
+
+    assert progress.import_json(tmp_path / "progress.json") == 2
+    assert progress.import_json(tmp_path / "progress.json") == 0
+    progress.close()
+
+
+def test_sqlite_shared_between_connections(tmp_path):
+    first = SQLiteProgress(tmp_path)
+    second = SQLiteProgress(tmp_path)
+
+    first.mark_tutorial_failed(A, "boom", "network")
+    second.mark_tutorial_failed(A, "boom again", "network", attempts=2)
+    first.mark_tutorial_completed(B)
+
+    assert second.is_tutorial_completed(B)
+    assert first.load()["failed_tutorials"] == [{"url": A, "error": "boom again", "category": "network", "attempts": 3}]
+    first.close()
+    second.close()
+
+
+def test_readonly_sqlite_progress(tmp_path):
+    progress = SQLiteProgress(tmp_path)
+    progress.mark_tutorial_completed(A)
+    progress.close()
+    files = sorted(path.name for path in tmp_path.iterdir())
+
+    readonly = open_progress(tmp_path, readonly=True)
+
+    assert readonly.is_tutorial_completed(A)
+    with pytest.raises(sqlite3.OperationalError):
+        readonly.mark_tutorial_completed(B)
+    readonly.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == files
+
+
+def test_import_progress_command(tmp_path):
+    metadata = tmp_path / "_metadata"
+    metadata.mkdir()
+    (metadata / "progress.json").write_text(json.dumps({"completed_tutorials": [A]}))
+
+    result = CliRunner().invoke(import_progress.main, ["--vault-dir", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert "Imported 1 completed tutorials" in result.output
+    progress = open_progress(metadata)
+    assert progress.load()["completed_tutorials"] == [A]
+    progress.close()
+
+
+@pytest.mark.parametrize("backend", PROGRESS_BACKENDS)
+def test_marks_survive_reopening(tmp_path, backend):
+    progress = open_progress(tmp_path, backend)
+    progress.mark_guide_completed(GUIDE)
+    progress.mark_tutorial_failed(A, "HTTP 503", "http_status", attempts=2)
+    progress.mark_tutorial_failed(B, "timed out", "timeout")
+    progress.mark_tutorial_failed(B, "timed out", "timeout", attempts=3)
+    progress.mark_tutorials_completed([A])
+    progress.close()
+
+    reopened = open_progress(tmp_path)
+
+    assert reopened.load() == {
+        "completed_guides": [GUIDE],
+        "completed_tutorials": [A],
+        "failed_tutorials": [{"url": B, "error": "timed out", "category": "timeout", "attempts": 4}],
+    }
+    assert reopened.is_guide_completed(GUIDE)
+    assert reopened.is_tutorial_completed(A) and not reopened.is_tutorial_completed(B)
+    assert reopened.get_completed_urls() == {GUIDE, A}
+    reopened.close()
+
+
+@pytest.mark.parametrize("backend", PROGRESS_BACKENDS)
+def test_save_replaces_everything(tmp_path, backend):
+    progress = open_progress(tmp_path, backend)
+    progress.mark_tutorial_completed(A)
+
+    progress.save({"completed_guides": [], "completed_tutorials": [B], "failed_tutorials": []})
+
+    assert progress.load() == {"completed_guides": [], "completed_tutorials": [B], "failed_tutorials": []}
+    progress.close()
+
+
+def test_journal_replays_marks_after_a_crash(tmp_path):
+    progress = JournalProgress(tmp_path)
+    progress.mark_tutorial_completed(A)
+    progress.mark_tutorial_failed(B, "boom")
+    progress._journal.close()  # Killed: no compaction
+    journal = tmp_path / "progress.journal.jsonl"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op": "tutorials_completed", "ur')  # Torn mid-append
+
+    reopened = JournalProgress(tmp_path)
+
+    assert reopened.load()["completed_tutorials"] == [A]
+    assert reopened.load()["failed_tutorials"][0]["url"] == B
+    assert reopened.compactions == 1  # The torn line is dropped
+    assert journal.read_text(encoding="utf-8") == ""
+    reopened.mark_tutorial_completed(B)
+    reopened._journal.close()
+    assert JournalProgress(tmp_path).load()["completed_tutorials"] == [A, B]
+
+
+def test_journal_compacts_into_the_snapshot(tmp_path):
+    progress = JournalProgress(tmp_path, compact_bytes=200)
+    journal = tmp_path / "progress.journal.jsonl"
+
+    progress.mark_tutorial_completed(A)
+    assert journal.stat().st_size and progress.compactions == 0
+    for i in range(5):
+        progress.mark_tutorial_completed(f"{B}{i}")
+
+    assert progress.compactions >= 1
+    assert journal.stat().st_size < 200
+    progress.close()
+    assert journal.stat().st_size == 0
+    assert len(read_json(tmp_path / "progress.json")["completed_tutorials"]) == 6
+
+
+def test_readonly_journal_replays_without_writing(tmp_path):
+    progress = JournalProgress(tmp_path)
+    progress.mark_tutorial_completed(A)
+    progress._journal.close()
+    journal = (tmp_path / "progress.journal.jsonl").read_bytes()
+
+    readonly = open_progress(tmp_path, readonly=True)
+
+    assert readonly.is_tutorial_completed(A)
+    with pytest.raises(RuntimeError):
+        readonly.mark_tutorial_completed(B)
+    readonly.close()
+    assert (tmp_path / "progress.journal.jsonl").read_bytes() == journal
+    assert not (tmp_path / "progress.json").exists()
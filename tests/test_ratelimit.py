@@ -0,0 +1,181 @@
+"""Tests for request-rate and concurrency limiting."""
+
+import asyncio
+
+import pytest
+
+from scraper.ratelimit import AIMDController, RequestOutcome, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the code under test sleeps (or the test advances it)."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(round(delay, 6))
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("scraper.ratelimit.time.monotonic", clock.monotonic)
+    monkeypatch.setattr("scraper.ratelimit.asyncio.sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_bursts_then_refills_at_the_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    async def acquire(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(acquire(3))
+    assert clock.sleeps == []  # The burst
+
+    asyncio.run(acquire(2))
+    assert clock.sleeps == [0.5, 0.5]
+
+    clock.now += 0.25  # Half a token accrues
+    asyncio.run(acquire(1))
+    assert clock.sleeps[-1] == 0.25
+
+
+def test_token_bucket_caps_idle_refill_at_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    clock.now += 3600
+
+    asyncio.run(bucket.acquire(2))
+    asyncio.run(bucket.acquire())
+
+    assert clock.sleeps == [1.0]
+
+
+def test_disabled_token_bucket_never_waits(clock):
+    bucket = TokenBucket.from_delay(0)
+
+    asyncio.run(bucket.acquire(100))
+
+    assert not bucket.enabled
+    assert clock.sleeps == []
+
+
+def test_token_bucket_from_delay():
+    assert TokenBucket.from_delay(2.5).rate == 0.4
+    assert TokenBucket.from_delay(2.5, max_rps=10).rate == 10
+
+
+def run_requests(controller, statuses):
+    """Run one request per status through the controller's slots, one after another."""
+
+    async def requests():
+        for status in statuses:
+            async with controller.slot() as outcome:
+                outcome.status = status
+
+    asyncio.run(requests())
+
+
+def test_aimd_increases_by_one_per_healthy_window_up_to_the_ceiling():
+    messages = []
+    controller = AIMDController("pages", ceiling=3, latency_factor=None, log=messages.append)
+
+    run_requests(controller, [200])
+    assert controller.limit == 2
+    run_requests(controller, [200])
+    assert controller.limit == 2  # A window is one request per slot
+    run_requests(controller, [200])
+    assert controller.limit == 3
+    run_requests(controller, [200] * 10)
+
+    assert controller.limit == 3
+    assert controller.increases == 2
+    assert messages == ["pages concurrency 1 -> 2 (healthy)", "pages concurrency 2 -> 3 (healthy)"]
+
+
+@pytest.mark.parametrize("status, reason", [(429, "429"), (503, "5xx"), (500, "5xx")])
+def test_aimd_cuts_the_limit_when_the_server_pushes_back(status, reason):
+    controller = AIMDController("pages", ceiling=8, initial=8, floor=2, latency_factor=None)
+
+    run_requests(controller, [status])
+    assert controller.limit == 4
+    run_requests(controller, [status, status])
+
+    assert controller.limit == 2  # The floor
+    assert controller.decreases == {reason: 3}
+    assert controller.peak == 8
+
+
+def test_aimd_counts_exceptions_and_ignores_empty_outcomes():
+    controller = AIMDController("media", ceiling=4, initial=4, latency_factor=None)
+
+    async def requests():
+        async with controller.slot():
+            pass  # Skipped (e.g. the file exists): nothing to record
+        with pytest.raises(OSError):
+            async with controller.slot():
+                raise OSError("connection reset")
+
+    asyncio.run(requests())
+
+    assert controller.limit == 2
+    assert controller.decreases == {"error": 1}
+
+
+def test_aimd_cuts_once_for_requests_already_in_flight():
+    controller = AIMDController("pages", ceiling=8, initial=8, latency_factor=None)
+
+    async def request():
+        async with controller.slot() as outcome:
+            await asyncio.sleep(0)
+            outcome.status = 429
+
+    async def burst():
+        await asyncio.gather(*(request() for _ in range(4)))
+
+    asyncio.run(burst())
+
+    assert controller.limit == 4
+    assert controller.decreases == {"429": 1}
+
+
+def test_aimd_holds_requests_beyond_the_limit():
+    controller = AIMDController.fixed("pages", 2)
+    running = []
+    peak = []
+
+    async def request():
+        async with controller.slot() as outcome:
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            outcome.status = 200
+
+    async def burst():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(burst())
+
+    assert max(peak) == 2
+    assert controller.limit == 2
+
+
+def test_aimd_treats_latency_spikes_as_pushback():
+    controller = AIMDController("pages", ceiling=4, initial=4, latency_factor=3.0)
+    for _ in range(5):
+        controller.record(0.1, RequestOutcome(status=200))
+
+    controller.record(0.25, RequestOutcome(status=200))
+    assert controller.limit == 4
+    controller.record(1.0, RequestOutcome(status=200))
+
+    assert controller.limit == 2
+    assert controller.decreases == {"latency": 1}
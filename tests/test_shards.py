@@ -0,0 +1,134 @@
+"""Tests for sharding a scrape and merging the staging vaults."""
+
+import pytest
+
+from scraper.frontier import DONE, PENDING, Frontier
+from scraper.progress import open_progress
+from scraper.shards import Shard, merge_shards
+
+GUIDE = "https://drupalize.me/guide/drupal-module-developer-guide"
+MANIFEST = {
+    "guides": [
+        {
+            "url": f"{GUIDE}-{number}",
+            "title": f"Guide {number}",
+            "tutorials": [{"url": f"https://drupalize.me/tutorial/g{number}-t{i}", "title": f"T{i}"}
+                          for i in range(size)],
+        }
+        for number, size in enumerate([6, 1, 4, 3])
+    ],
+    "tutorials": [
+        {"url": "https://drupalize.me/tutorial/standalone", "title": "Standalone"},
+        {"url": "https://drupalize.me/tutorial/g0-t0", "title": "T0", "guideUrl": f"{GUIDE}-0"},
+    ],
+}
+
+
+def tutorial_urls(manifest):
+    return [tutorial["url"] for guide in manifest["guides"] for tutorial in guide["tutorials"]]
+
+
+@pytest.mark.parametrize("spec, strategy", [("2/8", "hash"), ("1/1", "guide")])
+def test_parse(spec, strategy):
+    shard = Shard.parse(spec, strategy)
+
+    assert (shard.index, shard.count, shard.strategy) == (*map(int, spec.split("/")), strategy)
+
+
+@pytest.mark.parametrize("spec, strategy", [("0/4", "hash"), ("5/4", "hash"), ("1-4", "hash"), ("x/4", "hash"),
+                                            ("1/4", "random")])
+def test_parse_rejects_invalid_specs(spec, strategy):
+    with pytest.raises(ValueError):
+        Shard.parse(spec, strategy)
+
+
+def test_name():
+    assert Shard.parse("3/12").name == "shard-03-of-12"
+
+
+def test_every_url_is_owned_by_exactly_one_shard():
+    shards = [Shard(index, 3) for index in range(1, 4)]
+    urls = [f"https://drupalize.me/tutorial/t{i}" for i in range(50)]
+
+    for url in urls:
+        assert sum(shard.owns_url(url) for shard in shards) == 1
+        # Query variants of the same tutorial land in the same shard
+        assert [shard.owns_url(f"{url}?p=3233") for shard in shards] == [shard.owns_url(url) for shard in shards]
+
+
+@pytest.mark.parametrize("strategy", ["hash", "guide"])
+def test_filter_manifest_partitions_the_work(strategy):
+    parts = [Shard(index, 2, strategy).filter_manifest(MANIFEST) for index in (1, 2)]
+
+    assert sorted(url for part in parts for url in tutorial_urls(part)) == sorted(tutorial_urls(MANIFEST))
+    assert [url for part in parts for url in (tutorial["url"] for tutorial in part["tutorials"])] == [
+        "https://drupalize.me/tutorial/standalone"
+    ]
+    for part in parts:
+        for guide in part["guides"]:
+            original = MANIFEST["guides"][guide["position"]]
+            assert guide["url"] == original["url"]
+            for tutorial in guide["tutorials"]:
+                assert original["tutorials"][tutorial["position"]]["url"] == tutorial["url"]
+
+
+def test_guide_strategy_keeps_guides_whole_and_balanced():
+    parts = [Shard(index, 2, "guide").filter_manifest(MANIFEST) for index in (1, 2)]
+
+    assert [[guide["title"] for guide in part["guides"]] for part in parts] == [
+        ["Guide 0", "Guide 1"], ["Guide 2", "Guide 3"],
+    ]
+    assert all(len(guide["tutorials"]) == len(MANIFEST["guides"][guide["position"]]["tutorials"])
+               for part in parts for guide in part["guides"])
+
+
+def staging_vault(root, done, extra_files):
+    frontier = Frontier(root / "_metadata" / "frontier.sqlite")
+    frontier.add_manifest({"guides": MANIFEST["guides"][:1]})
+    progress = open_progress(root / "_metadata")
+    for url, note in done.items():
+        frontier.mark_done(url, url.rsplit("/", 1)[1], note)
+        progress.mark_tutorial_completed(url)
+        (root / note).parent.mkdir(parents=True, exist_ok=True)
+        (root / note).write_text(f"# {url} from {root.name}\n", encoding="utf-8")
+    frontier.close()
+    progress.close()
+    for relative, content in extra_files.items():
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_bytes(content)
+
+
+def test_merge_shards(tmp_path):
+    staging = tmp_path / "staging"
+    t0, t1, t2 = (f"https://drupalize.me/tutorial/g0-t{i}" for i in range(3))
+    staging_vault(staging / "shard-01-of-02", {t0: "Guides/Guide 0/T0.md", t1: "Guides/Guide 0/T1.md"}, {
+        "assets/images/logo.png": b"logo",
+        "assets/images/diagram.png": b"first",
+    })
+    staging_vault(staging / "shard-02-of-02", {t1: "Guides/Guide 0/T1 (2).md", t2: "Guides/Guide 0/T2.md"}, {
+        "assets/images/logo.png": b"logo",
+        "assets/images/diagram.png": b"second",
+        "assets/videos/intro.mp4.0123abcd.part": b"half",
+    })
+    target = tmp_path / "vault"
+
+    report = merge_shards(list(staging.iterdir()), target)
+
+    assert report.shards == 2
+    assert report.tutorials == 6
+    assert report.duplicate_notes == 1  # T1 was scraped by both; the first shard's note wins
+    assert report.files_shared == 1
+    assert report.conflicts == [(target / "assets/images/diagram.png").as_posix()]
+    assert (target / "assets/images/diagram.png").read_bytes() == b"first"
+    assert not (target / "Guides" / "Guide 0" / "T1 (2).md").exists()
+    assert not list((target / "assets" / "videos").glob("*.part"))
+    guide_dir = target / "Guides" / "Guide 0"
+    assert sorted(path.name for path in guide_dir.glob("*.md")) == ["T0.md", "T1.md", "T2.md", "_index.md"]
+    assert "shard-01-of-02" in (guide_dir / "T1.md").read_text(encoding="utf-8")
+
+    frontier = Frontier(target / "_metadata" / "frontier.sqlite")
+    assert frontier.counts() == {DONE: 3, PENDING: 3}
+    frontier.close()
+    progress = open_progress(target / "_metadata")
+    assert progress.get_completed_urls() == {t0, t1, t2}
+    progress.close()
@@ -0,0 +1,70 @@
+"""Tests for the vault's file layout and writes."""
+
+import pytest
+
+from scraper.vault import VaultManager
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = VaultManager(tmp_path / "vault")
+    vault.initialize()
+    return vault
+
+
+@pytest.fixture
+def atomic_writes(vault, monkeypatch):
+    written = []
+    write_atomic = vault.write_atomic
+
+    def recording(path, content):
+        written.append(path)
+        write_atomic(path, content)
+
+    monkeypatch.setattr(vault, "write_atomic", recording)
+    return written
+
+
+def test_indexes_are_written_atomically(vault, atomic_writes):
+    guide_path = vault.get_guide_path("Module Developer Guide")
+    guide_path.mkdir(parents=True)
+    tutorial = {
+        "title": "Implement hook_help()",
+        "filename": "Implement hook_help().md",
+        "guide": "Module Developer Guide",
+    }
+
+    guide_index = vault.create_guide_index(guide_path, "Module Developer Guide", [{**tutorial, "subfolder": "Hooks"}])
+    topic_index = vault.create_topic_index("Hooks", [tutorial])
+
+    assert atomic_writes == [guide_index, topic_index]
+    assert "### Hooks\n\n- [[Implement hook_help()]]" in guide_index.read_text(encoding="utf-8")
+    assert "- [[Implement hook_help()]] (Module Developer Guide)" in topic_index.read_text(encoding="utf-8")
+    assert list(vault.staging_dir.iterdir()) == []
+
+
+def test_quarantine_moves_staged_notes(vault):
+    (vault.staging_dir / "note.tmp").write_text("half", encoding="utf-8")
+    (vault.images_dir / "diagram.png").write_bytes(b"whole")
+
+    moved = vault.quarantine_partials()
+
+    assert [path.read_text(encoding="utf-8") for path in moved] == ["half"]
+    assert (vault.images_dir / "diagram.png").exists()
+
+
+def test_guide_index_is_written_from_plain_tutorials(vault):
+    tutorials = [
+        {
+            "url": "https://drupalize.me/tutorial/implement-hook-help",
+            "title": "Implement hook_help()",
+            "subfolder": "Hooks",
+            "position": 0,
+            "note_path": "Guides/Module Developer Guide/Hooks/Implement hook_help().md",
+        }
+    ]
+
+    index = vault.write_guide_index("Module Developer Guide", tutorials)
+
+    assert index.parent == vault.get_guide_path("Module Developer Guide")
+    assert "### Hooks\n\n- [[Implement hook_help()]]" in index.read_text(encoding="utf-8")